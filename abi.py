@@ -3,6 +3,8 @@ LEM v1.0 — Canonical ABIs
 ------------------------
 Minimal ABIs required for on-chain reads.
 No additional functions are permitted.
+
+Event topics are listed separately for raw log filters.
 """
 
 # =========================
@@ -66,4 +68,85 @@ ERC20_ABI = [
         "stateMutability": "view",
         "type": "function",
     },
-]
\ No newline at end of file
+    {
+        "constant": True,
+        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+# =========================
+# Multicall3 ABI (aggregate3 only)
+# =========================
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+
+# =========================
+# Event Topics
+# =========================
+
+# keccak256("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = (
+    "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+)
+
+# Zero address as a 32-byte indexed topic (mint source / burn target)
+ZERO_ADDRESS_TOPIC = "0x" + "00" * 32
+
+# keccak256("Sync(uint112,uint112)"), emitted by a pair on every
+# reserve update; data = (reserve0, reserve1)
+SYNC_TOPIC = (
+    "0x1c411e9a96e071241c2f21f7726b17ae89e3cab4c78be50e062b03a9fffbbad1"
+)
+
+# keccak256("Mint(address,uint256,uint256)"); indexed sender,
+# data = (amount0, amount1) added to the pool
+MINT_TOPIC = (
+    "0x4c209b5fc8ad50758f13e2e1088ba56a560dff690a1c6fef26394f4c03821c4f"
+)
+
+# keccak256("Burn(address,uint256,uint256,address)"); indexed sender
+# and to, data = (amount0, amount1) removed from the pool
+BURN_TOPIC = (
+    "0xdccd412f0b1252819cb1fd330b93224ca42612892bb3f4f789976e6d81936496"
+)
+
+# keccak256("Swap(address,uint256,uint256,uint256,uint256,address)");
+# indexed sender and to,
+# data = (amount0In, amount1In, amount0Out, amount1Out)
+SWAP_TOPIC = (
+    "0xd78ad95fa46c994b6551d0da85fc275fe613ce37657fb8d5e3d130840159d822"
+)
@@ -9,9 +9,10 @@ All rows written by this script are labeled:
 This script must NEVER be automated.
 """
 
-import requests
 from datetime import datetime
 from storage import append_observation
+from merge_observations import dedupe_log
+from governor import http_get
 
 
 # =========================
@@ -41,9 +42,7 @@ OHLCV_URL = (
 
 
 def fetch_json(url: str):
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    return r.json()
+    return http_get(url, timeout=20).json()
 
 
 def run_import():
@@ -60,11 +59,14 @@ def run_import():
     candles = fetch_json(OHLCV_URL)["data"]["attributes"]["ohlcv_list"]
     print(f"Fetched {len(candles)} daily candles")
 
+    written = 0
+    skipped = 0
+
     for candle in candles:
         ts, _, _, _, close_price, _ = candle
         candle_timestamp = datetime.utcfromtimestamp(ts).isoformat()
 
-        append_observation(
+        ok = append_observation(
             pair_address=POOL_ADDRESS,
             native_price_usd=None,
             native_reserve=None,
@@ -75,9 +77,21 @@ def run_import():
             lp_delta_usd=None,
             lp_delta_pct=None,
             data_source="reconstructed_gecko",
+            chain=NETWORK,
             timestamp_override=candle_timestamp,
         )
 
+        if ok:
+            written += 1
+        else:
+            skipped += 1
+
+    print(f"Wrote {written} rows, skipped {skipped} already present.")
+
+    # Re-imported candles were skipped above; overlaps with other
+    # sources in the same slot are resolved by source priority
+    stats = dedupe_log()
+    print(f"Deduplicated log: dropped {stats['dropped']} repeated rows.")
     print("Wiki Cat backdata import complete.")
 
 
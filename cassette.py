@@ -0,0 +1,196 @@
+"""
+LEM Phase D — RPC Record / Replay Cassettes
+-------------------------------------------
+Deterministic capture and replay of every external read made by a run.
+
+Modes (LEM_CASSETTE_MODE, default CASSETTE_MODE in config.py):
+- None:     pass-through, no recording
+- "record": forward to the network and append every JSON-RPC request /
+            response (and oracle HTTP GET) to a gzip JSON-lines cassette
+- "replay": serve all reads from the cassette at memory speed, with no
+            network access; unknown requests raise CassetteMiss
+
+Identical requests are replayed in the order they were recorded, so
+repeated "latest" reads across a run reproduce the original sequence.
+
+No calculations. Observation only.
+"""
+
+import os
+import gzip
+import json
+import atexit
+from collections import Counter
+
+from web3.providers.base import JSONBaseProvider
+
+from config import CASSETTE_MODE, CASSETTE_FILE
+from governor import http_get
+
+
+class CassetteMiss(LookupError):
+    """
+    Raised in replay mode for a request that was never recorded.
+    """
+
+
+# =========================
+# Cassette
+# =========================
+
+class Cassette:
+    """
+    Ordered store of request keys to recorded responses.
+    """
+
+    def __init__(self, path: str, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+
+        self.path = path
+        self.mode = mode
+        self.entries: dict[str, list] = {}
+        self.cursors: dict[str, int] = {}
+        self._pending: list[tuple[str, object]] = []
+
+        if mode == "replay":
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Cassette not found: {path}")
+            with gzip.open(path, mode="rt", encoding="utf-8") as f:
+                for line in f:
+                    key, response = json.loads(line)
+                    self.entries.setdefault(key, []).append(response)
+
+    @staticmethod
+    def key(kind: str, *parts) -> str:
+        return kind + " " + json.dumps(parts, sort_keys=True, separators=(",", ":"))
+
+    def lookup(self, key: str):
+        """
+        Next recorded response for a key; the last one repeats once the
+        recorded sequence is exhausted.
+        """
+        responses = self.entries.get(key)
+        if not responses:
+            raise CassetteMiss(f"No recorded response for {key[:200]}")
+
+        i = self.cursors.get(key, 0)
+        self.cursors[key] = i + 1
+        return responses[min(i, len(responses) - 1)]
+
+    def store(self, key: str, response):
+        self.entries.setdefault(key, []).append(response)
+        self._pending.append((key, response))
+
+    def save(self):
+        """
+        Append pending recordings to the cassette file.
+        """
+        if not self._pending:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with gzip.open(self.path, mode="at", encoding="utf-8") as f:
+            for key, response in self._pending:
+                f.write(json.dumps([key, response], separators=(",", ":")))
+                f.write("\n")
+        self._pending.clear()
+
+
+_ACTIVE: Cassette | None = None
+_LOADED = False
+
+
+def get_cassette() -> Cassette | None:
+    """
+    Return the process-wide cassette, or None in pass-through mode.
+    """
+    global _ACTIVE, _LOADED
+
+    if not _LOADED:
+        _LOADED = True
+        mode = os.environ.get("LEM_CASSETTE_MODE", CASSETTE_MODE)
+        if mode:
+            path = os.environ.get("LEM_CASSETTE_FILE", CASSETTE_FILE)
+            _ACTIVE = Cassette(path, mode)
+            if mode == "record":
+                atexit.register(_ACTIVE.save)
+
+    return _ACTIVE
+
+
+# =========================
+# Provider & HTTP Wrappers
+# =========================
+
+class CassetteProvider(JSONBaseProvider):
+    """
+    web3 provider that records or replays JSON-RPC traffic.
+    """
+
+    def __init__(self, cassette: Cassette, inner=None, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self.inner = inner
+
+    def make_request(self, method, params):
+        key = Cassette.key("rpc", method, params)
+
+        if self.cassette.mode == "replay":
+            return self.cassette.lookup(key)
+
+        response = self.inner.make_request(method, params)
+        self.cassette.store(key, response)
+        return response
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        if self.cassette.mode == "replay":
+            return True
+        return self.inner.is_connected(show_traceback)
+
+
+def wrap_provider(provider):
+    """
+    Wrap a web3 provider with the active cassette (if any).
+    """
+    cassette = get_cassette()
+    if cassette is None:
+        return provider
+    return CassetteProvider(cassette, inner=provider)
+
+
+def http_get_json(url: str, timeout: float):
+    """
+    GET a JSON document, recorded / replayed through the active cassette.
+
+    Raises:
+        requests.RequestException on network or HTTP errors (live modes)
+    """
+    cassette = get_cassette()
+    key = Cassette.key("http", "GET", url)
+
+    if cassette is not None and cassette.mode == "replay":
+        return cassette.lookup(key)
+
+    data = http_get(url, timeout=timeout).json()
+
+    if cassette is not None:
+        cassette.store(key, data)
+    return data
+
+
+if __name__ == "__main__":
+    path = os.environ.get("LEM_CASSETTE_FILE", CASSETTE_FILE)
+    cassette = Cassette(path, "replay")
+
+    methods = Counter()
+    for key, responses in cassette.entries.items():
+        kind, payload = key.split(" ", 1)
+        methods[f"{kind}:{json.loads(payload)[0 if kind == 'rpc' else 1]}"] += len(responses)
+
+    print(f"{path}: {sum(methods.values())} recorded responses")
+    for name, n in methods.most_common():
+        print(f"  {n:>8}  {name}")
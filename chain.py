@@ -6,25 +6,46 @@ It contains NO financial logic and NO calculations.
 
 Responsibilities:
 - Connect to RPC
-- Instantiate contracts
+- Instantiate contracts (cached per address and ABI)
+- Serve hot-path reads through a raw eth_call fast path
 - Read raw on-chain values
 - Normalize decimals
 - Resolve base token and metadata (annotations only, best-effort)
+- Batch many token balance reads into few calls (Multicall3)
+- Fetch raw event logs over block ranges
 
 All values returned are Python-native types.
 """
 
+import os
+from functools import lru_cache
+
 from web3 import Web3
-from web3.exceptions import BadFunctionCallOutput
-from config import RPC_URL, NATIVE_ASSET_ADDRESS
-from abi import PAIR_ABI, ERC20_ABI
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError, Web3RPCError
+from config import (
+    RPC_URL,
+    NATIVE_ASSET_ADDRESS,
+    MULTICALL3_ADDRESS,
+    MULTICALL_BATCH_SIZE,
+)
+from abi import ERC20_ABI, MULTICALL3_ABI
+from cassette import wrap_provider
+from errors import InvalidPairError
+from governor import govern_provider
 
 
 # =========================
 # Web3 Initialization
 # =========================
 
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+# Every request is paced and retried by the shared rate governor (so
+# web3's own retry loop is disabled); the record / replay wrapper is a
+# pass-through unless a cassette mode is set
+# (LEM_RPC_URL overrides the endpoint, e.g. for the local stand-in node)
+w3 = Web3(wrap_provider(govern_provider(Web3.HTTPProvider(
+    os.environ.get("LEM_RPC_URL", RPC_URL),
+    exception_retry_configuration=None,
+))))
 
 if not w3.is_connected():
     raise ConnectionError("Failed to connect to RPC endpoint")
@@ -34,15 +55,101 @@ if not w3.is_connected():
 # Contract Helpers
 # =========================
 
+# Contract objects by (lowercased address, ABI identity)
+_contracts = {}
+
+
+@lru_cache(maxsize=65536)
+def to_checksum(address: str) -> str:
+    """
+    Checksum an address once; repeated addresses are served from cache.
+    """
+    return Web3.to_checksum_address(address)
+
+
 def get_contract(address: str, abi: list):
     """
-    Instantiate a contract object.
+    Instantiate a contract object, or reuse the one already built for
+    this address and ABI.
     """
-    return w3.eth.contract(
-        address=Web3.to_checksum_address(address),
-        abi=abi
+    key = (address.lower(), id(abi))
+    contract = _contracts.get(key)
+    if contract is None:
+        contract = w3.eth.contract(address=to_checksum(address), abi=abi)
+        _contracts[key] = contract
+    return contract
+
+
+# =========================
+# Raw eth_call Fast Path
+# =========================
+
+# Hot-path reads skip contract objects, ABI encoding / decoding and the
+# request middleware (which adds an eth_chainId round trip per call):
+# calldata is a precomputed selector and the fixed-layout return data
+# is sliced directly. Requests still pass through the cassette and
+# rate-governor provider wrappers.
+
+# keccak256(signature)[:4] of the fast-path functions
+GET_RESERVES_SELECTOR = "0x0902f1ac"
+TOKEN0_SELECTOR = "0x0dfe1681"
+TOKEN1_SELECTOR = "0xd21220a7"
+TOTAL_SUPPLY_SELECTOR = "0x18160ddd"
+DECIMALS_SELECTOR = "0x313ce567"
+
+
+def eth_call_raw(
+    address: str,
+    calldata: str,
+    words: int,
+    block_identifier: int | str = "latest",
+) -> bytes:
+    """
+    Send one eth_call and return its raw output.
+
+    Args:
+        calldata: 0x-prefixed hex
+        words: 32-byte words the caller is going to decode
+        block_identifier: block number or tag to read at
+
+    Raises:
+        ContractLogicError if the call reverted
+        BadFunctionCallOutput if fewer than `words` words came back
+            (no contract at the address, or a different interface)
+        Web3RPCError on any other RPC error
+    """
+    response = w3.provider.make_request(
+        "eth_call",
+        [
+            {"to": address, "data": calldata},
+            hex(block_identifier) if isinstance(block_identifier, int) else block_identifier,
+        ],
     )
 
+    error = response.get("error")
+    if error:
+        if isinstance(error, dict):
+            message = error.get("message", "")
+            if error.get("code") == 3 or "revert" in message.lower():
+                raise ContractLogicError(message, data=error.get("data"))
+        raise Web3RPCError(str(error), rpc_response=response)
+
+    output = bytes.fromhex(response["result"][2:])
+    if len(output) < 32 * words:
+        raise BadFunctionCallOutput(
+            f"Could not decode output of call to {address}: "
+            f"expected {32 * words} bytes, got {len(output)}"
+        )
+    return output
+
+
+def _word(output: bytes, index: int) -> int:
+    return int.from_bytes(output[32 * index:32 * (index + 1)], "big")
+
+
+def _address_word(output: bytes) -> str:
+    return to_checksum("0x" + output[12:32].hex())
+
 
 # =========================
 # Pair-Level Reads
@@ -59,17 +166,15 @@ def get_pair_reserves(pair_address: str) -> dict:
             "timestamp": int
         }
     """
-    pair = get_contract(pair_address, PAIR_ABI)
-
     try:
-        reserve0, reserve1, timestamp = pair.functions.getReserves().call()
+        output = eth_call_raw(pair_address, GET_RESERVES_SELECTOR, 3)
     except BadFunctionCallOutput:
-        raise ValueError("Invalid pair address or ABI mismatch")
+        raise InvalidPairError("Invalid pair address or ABI mismatch")
 
     return {
-        "reserve0": reserve0,
-        "reserve1": reserve1,
-        "timestamp": timestamp
+        "reserve0": _word(output, 0),
+        "reserve1": _word(output, 1),
+        "timestamp": _word(output, 2)
     }
 
 
@@ -80,14 +185,9 @@ def get_pair_tokens(pair_address: str) -> tuple[str, str]:
     Returns:
         (token0, token1)
     """
-    pair = get_contract(pair_address, PAIR_ABI)
-
-    token0 = pair.functions.token0().call()
-    token1 = pair.functions.token1().call()
-
     return (
-        Web3.to_checksum_address(token0),
-        Web3.to_checksum_address(token1)
+        _address_word(eth_call_raw(pair_address, TOKEN0_SELECTOR, 1)),
+        _address_word(eth_call_raw(pair_address, TOKEN1_SELECTOR, 1))
     )
 
 
@@ -107,26 +207,72 @@ def get_token_decimals(token_address: str) -> int:
     """
     Fetch decimals for an ERC-20 token.
     """
-    token = get_contract(token_address, ERC20_ABI)
-
     try:
-        return token.functions.decimals().call()
+        decimals = _word(eth_call_raw(token_address, DECIMALS_SELECTOR, 1), 0)
     except BadFunctionCallOutput:
-        raise ValueError("Invalid token address or ABI mismatch")
+        raise InvalidPairError("Invalid token address or ABI mismatch")
+
+    # uint8 return value
+    if decimals > 255:
+        raise InvalidPairError("Invalid token address or ABI mismatch")
+    return decimals
+
+
+def get_raw_total_supply(token_address: str, block_identifier: int | str = "latest") -> int:
+    """
+    Fetch raw (un-normalized) total token supply, optionally at a past
+    block.
+    """
+    return _word(
+        eth_call_raw(token_address, TOTAL_SUPPLY_SELECTOR, 1, block_identifier), 0
+    )
 
 
 def get_total_supply(token_address: str) -> float:
     """
     Fetch and normalize total token supply.
     """
-    token = get_contract(token_address, ERC20_ABI)
-
-    raw_supply = token.functions.totalSupply().call()
+    raw_supply = get_raw_total_supply(token_address)
     decimals = get_token_decimals(token_address)
 
     return raw_supply / (10 ** decimals)
 
 
+# keccak256("balanceOf(address)")[:4]
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+
+
+def get_token_balances(queries: list[tuple[str, str]]) -> list[int | None]:
+    """
+    Fetch raw balanceOf(holder) for many (token, holder) pairs through
+    Multicall3, MULTICALL_BATCH_SIZE sub-calls per eth_call.
+
+    Returns:
+        list of raw balances in query order (None where the sub-call
+        reverted or returned malformed data)
+    """
+    multicall = get_contract(MULTICALL3_ADDRESS, MULTICALL3_ABI)
+    balances = []
+
+    for start in range(0, len(queries), MULTICALL_BATCH_SIZE):
+        batch = queries[start:start + MULTICALL_BATCH_SIZE]
+        calls = [
+            (
+                to_checksum(token),
+                True,
+                BALANCE_OF_SELECTOR + bytes(12) + bytes.fromhex(holder[2:]),
+            )
+            for token, holder in batch
+        ]
+
+        for success, data in multicall.functions.aggregate3(calls).call():
+            balances.append(
+                int.from_bytes(data, "big") if success and len(data) == 32 else None
+            )
+
+    return balances
+
+
 def get_token_metadata(token_address: str) -> dict:
     """
     Fetch ERC-20 token metadata (annotations only).
@@ -167,6 +313,122 @@ def get_token_metadata(token_address: str) -> dict:
     }
 
 
+# =========================
+# Block & Log Reads
+# =========================
+
+def get_block_number() -> int:
+    """
+    Fetch the latest block number.
+    """
+    return w3.eth.block_number
+
+
+def get_block_timestamp(block_number: int) -> int:
+    """
+    Fetch the Unix timestamp of a block.
+    """
+    return w3.eth.get_block(block_number)["timestamp"]
+
+
+def get_logs(
+    addresses: list[str],
+    topics: list,
+    from_block: int,
+    to_block: int,
+) -> list[dict]:
+    """
+    Fetch raw event logs emitted by any of `addresses` in a block range.
+
+    Returns:
+        [
+            {
+                "address": str (lowercase),
+                "block_number": int,
+                "topics": list[str] (0x-prefixed hex),
+                "data": str (0x-prefixed hex)
+            },
+            ...
+        ]
+    """
+    logs = w3.eth.get_logs({
+        "address": [to_checksum(a) for a in addresses],
+        "topics": topics,
+        "fromBlock": from_block,
+        "toBlock": to_block,
+    })
+
+    return [
+        {
+            "address": log["address"].lower(),
+            "block_number": log["blockNumber"],
+            "topics": ["0x" + bytes(t).hex() for t in log["topics"]],
+            "data": "0x" + bytes(log["data"]).hex(),
+        }
+        for log in logs
+    ]
+
+
+# Substrings of eth_getLogs errors that mean "narrow the query"
+# (result count or block span over the provider's limit)
+LOG_RANGE_ERROR_MARKERS = (
+    "more than",
+    "too many",
+    "range too large",
+    "range is too large",
+    "block range is too",
+    "too wide",
+    "response size",
+    "is limited to",
+    "exceed maximum",
+)
+
+
+class LogRangeTooLarge(ValueError):
+    """
+    eth_getLogs rejected because the range or result set is too large.
+    """
+
+
+def _is_log_range_error(error) -> bool:
+    message = error.get("message", "") if isinstance(error, dict) else str(error)
+    message = message.lower()
+    return any(marker in message for marker in LOG_RANGE_ERROR_MARKERS)
+
+
+def get_raw_logs(
+    addresses: list[str],
+    topics: list,
+    from_block: int,
+    to_block: int,
+) -> list[dict]:
+    """
+    Fetch event logs as the unformatted JSON-RPC objects.
+
+    Skips web3's per-log result formatting for bulk reads; callers decode
+    the hex fields themselves ("address", "blockNumber", "logIndex",
+    "topics", "data", and "blockTimestamp" where the node provides it).
+
+    Raises:
+        LogRangeTooLarge if the node rejects the query as too large
+        (too many results or too wide a block range)
+        ValueError with the RPC error on any other rejection
+    """
+    response = w3.provider.make_request("eth_getLogs", [{
+        "address": [to_checksum(a) for a in addresses],
+        "topics": topics,
+        "fromBlock": hex(from_block),
+        "toBlock": hex(to_block),
+    }])
+
+    error = response.get("error")
+    if error:
+        if _is_log_range_error(error):
+            raise LogRangeTooLarge(error)
+        raise ValueError(error)
+    return response["result"]
+
+
 # =========================
 # Normalization Utilities
 # =========================
@@ -7,47 +7,135 @@ Charts:
 1) Token Price vs Liquidity Elasticity (LEM)
 2) Market Cap vs Native Liquidity (LPₙ)
 
+Modes:
+- Interactive: one pair, plt.show()
+- Batch (--all): headless PNG/SVG for every pair, rendered in a process
+  pool, downsampled with LTTB, and skipped when a pair has no new rows
+
 No signals. No thresholds. No interpretation.
 """
 
-import pandas as pd
+import os
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import matplotlib.pyplot as plt
 
+from storage import read_observations, pair_row_signatures
+
 CSV_FILE = "data/lem_observations.csv"
 
 # Select the pair you want to visualize
 PAIR_ADDRESS = "0x933477eba23726ca95a957cb85dbb1957267ef85"
 
+# Batch rendering output
+CHART_DIR = "charts"
+CHART_MANIFEST = os.path.join(CHART_DIR, "manifest.json")
 
-def load_data():
-    df = pd.read_csv(CSV_FILE)
+# Maximum points drawn per series (LTTB downsampling)
+MAX_POINTS = 1500
 
-    # Parse timestamp safely
-    df["timestamp_utc"] = pd.to_datetime(df["timestamp_utc"], errors="coerce")
+CORE_COLUMNS = [
+    "timestamp_utc",
+    "token_price_usd",
+    "lem",
+    "market_cap_usd",
+    "lp_native_usd",
+]
 
-    # Ensure data_source column exists (legacy compatibility)
-    if "data_source" not in df.columns:
-        df["data_source"] = None
-
-    # Filter by pair
-    df = df[df["pair_address"] == PAIR_ADDRESS]
 
+def clean_data(df):
     # Drop rows with invalid timestamps or missing core values
-    df = df.dropna(subset=[
-        "timestamp_utc",
-        "token_price_usd",
-        "lem",
-        "market_cap_usd",
-        "lp_native_usd",
-    ])
+    df = df.dropna(subset=CORE_COLUMNS)
 
     # Sort chronologically
-    df = df.sort_values("timestamp_utc")
+    return df.sort_values("timestamp_utc")
+
+
+def load_data(pair_address: str = PAIR_ADDRESS):
+    # Streams only this pair's rows and the plotted columns; legacy
+    # schema versions are mapped to the current columns on read
+    df = read_observations(
+        columns=CORE_COLUMNS + ["data_source"],
+        pairs=[pair_address],
+        log_file=CSV_FILE,
+    )
+
+    return clean_data(df)
+
+
+# =========================
+# Downsampling
+# =========================
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of at most `threshold` points that preserve the
+    visual shape of the series (first and last points always kept).
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    # Bucket boundaries over the interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (or the last point)
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Point in this bucket forming the largest triangle
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+
+def downsample(df, column: str, threshold: int = MAX_POINTS):
+    """
+    Downsample one series of a chronologically sorted frame.
+
+    Returns:
+        (timestamps, values)
+    """
+    x = df["timestamp_utc"].astype("int64").to_numpy(dtype=np.float64)
+    y = df[column].to_numpy(dtype=np.float64)
+    idx = lttb_indices(x, y, threshold)
+    return df["timestamp_utc"].iloc[idx], y[idx]
+
+
+# =========================
+# Charts
+# =========================
 
-    return df
+def finish(fig, output_path: str | None):
+    fig.tight_layout()
+    if output_path:
+        fig.savefig(output_path)
+        plt.close(fig)
+    else:
+        plt.show()
 
 
-def plot_price_vs_lem(df):
+def plot_price_vs_lem(df, output_path: str | None = None):
     fig, ax_price = plt.subplots(figsize=(12, 6))
 
     ax_price.set_title("Token Price vs Liquidity Elasticity (LEM)")
@@ -56,8 +144,7 @@ def plot_price_vs_lem(df):
     ax_price.set_yscale("log")
 
     ax_price.plot(
-        df["timestamp_utc"],
-        df["token_price_usd"],
+        *downsample(df, "token_price_usd"),
         label="Token Price (USD)",
     )
 
@@ -65,48 +152,157 @@ def plot_price_vs_lem(df):
     ax_lem.set_ylabel("LEM")
 
     ax_lem.plot(
-        df["timestamp_utc"],
-        df["lem"],
+        *downsample(df, "lem"),
         label="LEM",
         linestyle="--",
     )
 
     fig.legend(loc="upper left")
-    plt.tight_layout()
-    plt.show()
+    finish(fig, output_path)
 
 
-def plot_mc_lp(df):
-    plt.figure(figsize=(12, 6))
-    plt.title("Market Cap vs Native Liquidity (LPₙ)")
-    plt.xlabel("Date (UTC)")
-    plt.ylabel("USD")
+def plot_mc_lp(df, output_path: str | None = None):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.set_title("Market Cap vs Native Liquidity (LPₙ)")
+    ax.set_xlabel("Date (UTC)")
+    ax.set_ylabel("USD")
 
-    plt.plot(
-        df["timestamp_utc"],
-        df["market_cap_usd"],
+    ax.plot(
+        *downsample(df, "market_cap_usd"),
         label="Market Cap (USD)",
     )
 
-    plt.plot(
-        df["timestamp_utc"],
-        df["lp_native_usd"],
+    ax.plot(
+        *downsample(df, "lp_native_usd"),
         label="Native Liquidity LPₙ (USD)",
     )
 
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    ax.legend()
+    finish(fig, output_path)
+
+
+# =========================
+# Batch Rendering
+# =========================
+
+def _init_worker():
+    plt.switch_backend("Agg")
+
+
+def render_pair(pair_address: str, df, out_dir: str, fmt: str) -> str:
+    """
+    Render both charts for one pair to files. Runs inside a worker process.
+    """
+    plot_price_vs_lem(
+        df, os.path.join(out_dir, f"{pair_address}_price_lem.{fmt}")
+    )
+    plot_mc_lp(
+        df, os.path.join(out_dir, f"{pair_address}_mc_lp.{fmt}")
+    )
+    return pair_address
+
+
+def render_all(
+    out_dir: str = CHART_DIR,
+    fmt: str = "png",
+    workers: int | None = None,
+    force: bool = False,
+) -> list[str]:
+    """
+    Render charts for every pair in the log that has new rows.
+
+    A manifest of (row count, last row offset) per pair, taken from the
+    log's per-pair offset index, is kept in the output directory. Pairs
+    whose entry is unchanged are skipped before any row is read, and
+    only the rows of the remaining pairs are loaded.
+
+    Returns:
+        list of re-rendered pair addresses
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, os.path.basename(CHART_MANIFEST))
+
+    manifest = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    states = {
+        pair_address: {"rows": rows, "last_offset": last, "format": fmt}
+        for pair_address, (rows, last) in pair_row_signatures(CSV_FILE).items()
+    }
+    changed = [p for p, state in states.items() if manifest.get(p) != state]
+    if not changed:
+        return []
+
+    df = clean_data(read_observations(
+        columns=CORE_COLUMNS + ["pair_address"], pairs=changed, log_file=CSV_FILE
+    ))
+
+    jobs = {
+        pair_address: (group, states[pair_address])
+        for pair_address, group in df.groupby(df["pair_address"].str.lower(), sort=False)
+        if pair_address in states
+    }
+
+    # Pairs without a plottable row are recorded so they are not re-read
+    for pair_address in changed:
+        if pair_address not in jobs:
+            manifest[pair_address] = states[pair_address]
+
+    rendered = []
+    if jobs:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker
+        ) as pool:
+            futures = [
+                pool.submit(render_pair, pair, group, out_dir, fmt)
+                for pair, (group, _) in jobs.items()
+            ]
+            for future in futures:
+                try:
+                    pair_address = future.result()
+                except Exception as e:
+                    print(f"[WARN] Chart rendering failed: {e}")
+                    continue
+                manifest[pair_address] = jobs[pair_address][1]
+                rendered.append(pair_address)
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+    return rendered
 
 
 if __name__ == "__main__":
-    data = load_data()
+    parser = argparse.ArgumentParser(description="Plot LEM observations.")
+    parser.add_argument(
+        "--all", action="store_true",
+        help="render every pair headlessly instead of showing one pair",
+    )
+    parser.add_argument("--out", default=CHART_DIR, help="output directory")
+    parser.add_argument("--format", default="png", choices=["png", "svg"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--force", action="store_true",
+        help="re-render pairs even without new rows",
+    )
+    args = parser.parse_args()
 
-    if data.empty:
-        raise ValueError(
-            f"No valid data found for pair {PAIR_ADDRESS}. "
-            "Check that the pair_address exists in the CSV."
-        )
+    if args.all:
+        plt.switch_backend("Agg")
+        rendered = render_all(args.out, args.format, args.workers, args.force)
+        print(f"Rendered {len(rendered)} pairs into {args.out}/")
+    else:
+        data = load_data()
+
+        if data.empty:
+            raise ValueError(
+                f"No valid data found for pair {PAIR_ADDRESS}. "
+                "Check that the pair_address exists in the CSV."
+            )
 
-    plot_price_vs_lem(data)
-    plot_mc_lp(data)
\ No newline at end of file
+        plot_price_vs_lem(data)
+        plot_mc_lp(data)
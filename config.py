@@ -15,6 +15,9 @@ CHAIN = "bsc"
 # BNB Chain public RPC (replace with private node later if desired)
 RPC_URL = "https://bsc-dataseed.binance.org/"
 
+# WebSocket RPC for the per-block live mode (live.py)
+RPC_WS_URL = "wss://bsc-rpc.publicnode.com"
+
 # Native wrapped asset (WBNB)
 NATIVE_ASSET_ADDRESS = "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c"
 
@@ -29,6 +32,21 @@ FACTORY_ADDRESS = "0xca143Ce32Fe78f1f7019d7d551a6402fC5350c73"
 # (e.g. 300 = 5 min, 900 = 15 min, 3600 = 1 hr)
 OBSERVATION_INTERVAL = 900
 
+# =========================
+# Pair Registry (registry.py)
+# =========================
+
+# Tracked pairs with per-pair interval, labels and enabled flag
+PAIR_REGISTRY_FILE = "pair_registry.json"
+
+# Seconds between registry change checks in the long-running engine
+REGISTRY_POLL_INTERVAL = 5
+
+# Scheduled runs observe a pair once at least (interval - slack)
+# seconds have passed, so cron jitter never skips a whole cycle
+# (about half the cron cadence)
+REGISTRY_DUE_SLACK = 450
+
 # =========================
 # Data Storage
 # =========================
@@ -39,6 +57,234 @@ DATA_DIR = "data"
 # CSV log file (single-asset initially)
 LEM_LOG_FILE = "data/lem_observations.csv"
 
+# Per-shard output segments (engine_once.py --shard i/N)
+SHARD_DIR = "data/shards"
+
+# Depth curve side table (engine_once.py)
+DEPTH_LOG_FILE = "data/lem_depth.csv"
+
+# Per-pair health records (quarantine state, engine_once.py)
+HEALTH_FILE = "data/pair_health.json"
+
+# Last-known reserves and derived state per pair (change detection)
+PAIR_STATE_FILE = "data/pair_state.json"
+
+# Cached token supply, updated from mint / burn Transfer logs
+SUPPLY_CACHE_FILE = "data/supply_cache.json"
+
+# Cross-pair LEM index series (one row per cycle)
+LEM_INDEX_FILE = "data/lem_index.csv"
+
+# Rolling statistics side file (engine.py)
+ROLLING_LOG_FILE = "data/lem_rolling.csv"
+
+# Per-block observations from the live mode (live.py)
+LIVE_LOG_FILE = "data/lem_live.csv"
+
+# Latest value per pair for dashboards (JSON + Arrow + hash manifest)
+LATEST_JSON_FILE = "data/latest/lem_latest.json"
+LATEST_ARROW_FILE = "data/latest/lem_latest.arrow"
+LATEST_MANIFEST_FILE = "data/latest/manifest.json"
+
+# Per-window ΔLPₙ split into adds / removals / trades (lp_attribution.py)
+LP_ATTRIBUTION_FILE = "data/lem_lp_attribution.csv"
+
+# =========================
+# Pair Quarantine
+# =========================
+
+# Consecutive transient failures before a pair is quarantined
+# (permanent failures quarantine immediately)
+QUARANTINE_AFTER_FAILURES = 3
+
+# First re-probe delay in seconds; doubles on every further failure
+QUARANTINE_BASE_DELAY = 3600
+
+# Upper bound on the re-probe delay (7 days)
+QUARANTINE_MAX_DELAY = 604800
+
+# =========================
+# Change Detection
+# =========================
+
+# What engine_once writes for a pair whose reserves did not change
+# since the previous run:
+# - "carry_forward": full row recomputed from cached state (no extra RPC)
+# - "skip": no row (an absent slot means "unchanged")
+UNCHANGED_PAIR_MODE = "carry_forward"
+
+# =========================
+# Supply Tracking
+# =========================
+
+# Block span per eth_getLogs request (public RPCs cap this)
+SUPPLY_LOG_BLOCK_RANGE = 5000
+
+# Beyond this many blocks behind, re-read totalSupply() instead of
+# replaying logs
+SUPPLY_MAX_CATCHUP_BLOCKS = 50000
+
+# Seconds between direct totalSupply() verification reads per token
+SUPPLY_VERIFY_INTERVAL = 21600
+
+# Tokens per eth_getLogs address filter
+SUPPLY_LOG_ADDRESS_BATCH = 200
+
+# Supply used for market cap:
+# - "total": raw totalSupply()
+# - "circulating": totalSupply() minus balances of excluded holders
+# Stays "total" until rows record their supply mode: switching changes
+# every MC / LEM value against the existing history.
+SUPPLY_MODE = "total"
+
+# Holders whose balances are not circulating, per lowercased token
+# address; "*" applies to every token (burn / dead addresses)
+SUPPLY_EXCLUDED_HOLDERS = {
+    "*": [
+        "0x000000000000000000000000000000000000dead",
+        "0x0000000000000000000000000000000000000000",
+    ],
+}
+
+# Also exclude the tokens held by the observed pair (its token reserve)
+SUPPLY_EXCLUDE_PAIR_RESERVE = False
+
+# Consecutive unchanged reads after which an excluded balance is
+# treated as static, and the re-check interval for static balances
+EXCLUSION_STATIC_AFTER = 3
+EXCLUSION_STATIC_RECHECK = 86400
+
+# =========================
+# Batched Calls (Multicall3)
+# =========================
+
+# Multicall3, deployed at the same address on BNB Chain and most EVMs
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Sub-calls per aggregate3 eth_call
+MULTICALL_BATCH_SIZE = 500
+
+# =========================
+# Per-Block Live Mode (live.py)
+# =========================
+
+# Bounded queues between the newHeads reader, the block processor and
+# the storage writer; a full queue blocks the stage feeding it
+LIVE_HEAD_QUEUE_SIZE = 64
+LIVE_WRITE_QUEUE_SIZE = 2048
+
+# Maximum blocks covered by one catch-up eth_getLogs request
+LIVE_MAX_BLOCK_RANGE = 100
+
+# Seconds between native price refreshes (oracle rate limits apply)
+LIVE_PRICE_REFRESH = 60
+
+# Seconds between supply / excluded-balance refreshes
+LIVE_SUPPLY_REFRESH = 900
+
+# Local stand-in node for live-mode testing (standin_node.py)
+STANDIN_HOST = "127.0.0.1"
+STANDIN_HTTP_PORT = 8546
+STANDIN_WS_PORT = 8547
+STANDIN_BLOCK_TIME = 3.0
+
+# =========================
+# ΔLPₙ Attribution (lp_attribution.py)
+# =========================
+
+# Block span per eth_getLogs request; halved automatically when the
+# RPC rejects a range for returning too many logs
+LP_EVENT_BLOCK_RANGE = 2000
+
+# Pairs per eth_getLogs address filter
+LP_EVENT_ADDRESS_BATCH = 100
+
+# Blocks back from the head when no range is given
+LP_ATTRIBUTION_DEFAULT_BLOCKS = 28800
+
+# =========================
+# Multi-Hop Pricing (pricing.py)
+# =========================
+
+# Tokens with a known price, in order of preference as a pair's quote
+# side: "native" is priced by the oracle, "usd" at 1.0
+PRICING_ANCHORS = {
+    NATIVE_ASSET_ADDRESS: "native",
+    "0x55d398326f99059fF775485246999027B3197955": "usd",  # USDT
+    "0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56": "usd",  # BUSD
+    "0x8AC76a51cc950d9822D68b83fE1Ad97B32Cd580d": "usd",  # USDC
+}
+
+# Pools read every cycle for routing only (no observation rows), e.g.
+# intermediate hops of tracked non-anchor pairs. Read by every shard.
+PRICING_ROUTE_POOLS = []
+
+# Cached deepest path per token
+PRICING_PATH_FILE = "data/pricing_paths.json"
+
+# Seconds before cached paths are searched again with fresh depths
+PRICING_PATH_REFRESH = 21600
+
+# =========================
+# Local Read API (lem_api.py)
+# =========================
+
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+
+# =========================
+# Rolling Statistics
+# =========================
+
+# Window length in observations (96 × 15 min = 1 day)
+ROLLING_WINDOW = 96
+
+# Smoothing factor for the exponentially weighted moving average
+EWMA_ALPHA = 0.1
+
+# =========================
+# Depth Curves (Price Impact)
+# =========================
+
+# Swap fee of the AMM (PancakeSwap V2 = 0.25%)
+AMM_FEE = 0.0025
+
+# Trade sizes in native units (BNB) for the impact / slippage grid
+DEPTH_TRADE_SIZES = [0.1, 0.5, 1, 5, 10, 50]
+
+# Price moves (percent) for which the required native amount is solved
+DEPTH_PRICE_MOVES_PCT = [1, 5, 10]
+
+# =========================
+# Cross-Pair LEM Index
+# =========================
+
+# LEM distribution percentiles reported per cycle
+LEM_INDEX_PERCENTILES = [10, 25, 50, 75, 90]
+
+# Relative accuracy of the mergeable quantile sketch (1%)
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# =========================
+# Observation Identity (Deduplication)
+# =========================
+
+# Width of the time slot used in the canonical observation key
+# (chain, pair_address, slot, data_source). Two rows for the same pair
+# and source inside one slot are the same observation. Pairs with a
+# shorter registry interval use their interval instead
+# (storage.dedup_slot_seconds).
+DEDUP_SLOT_SECONDS = 900
+
+# Provenance priority used when merging overlapping rows for the same
+# (chain, pair_address, slot). Earlier entries win; carried-forward rows
+# (reserves unchanged, recomputed from stored state) rank below a full read.
+DATA_SOURCE_PRIORITY = [
+    "onchain_live",
+    "onchain_carry",
+    "reconstructed_gecko",
+]
+
 # =========================
 # External Price Source
 # =========================
@@ -49,6 +295,50 @@ COINGECKO_NATIVE_PRICE_URL = (
     "?ids=binancecoin&vs_currencies=usd"
 )
 
+# =========================
+# Request Rate Governor (governor.py)
+# =========================
+
+# Sustained JSON-RPC requests per second and burst size (bucket capacity)
+RPC_RATE_LIMIT_RPS = 8.0
+RPC_RATE_LIMIT_BURST = 16
+
+# Same for external HTTP APIs (one bucket per host; CoinGecko and
+# GeckoTerminal free tiers allow roughly 30 requests per minute)
+HTTP_RATE_LIMIT_RPS = 0.5
+HTTP_RATE_LIMIT_BURST = 5
+
+# Rate multiplier applied on every 429 / rate-limit response
+GOVERNOR_BACKOFF_FACTOR = 0.5
+
+# Requests-per-second regained per second of throttle-free traffic
+GOVERNOR_RECOVERY_STEP = 0.5
+
+# Floor for the adaptive rate
+GOVERNOR_MIN_RPS = 0.2
+
+# Retries per request after a 429 or a connection error / timeout
+GOVERNOR_MAX_RETRIES = 5
+
+# Fraction of the burst kept back for higher-priority requests
+# (getReserves is "high", metadata reads are "low")
+GOVERNOR_PRIORITY_RESERVE = {
+    "high": 0.0,
+    "normal": 0.25,
+    "low": 0.5,
+}
+
+# =========================
+# RPC Record / Replay (cassette.py)
+# =========================
+
+# None (pass-through), "record" or "replay";
+# overridden by the LEM_CASSETTE_MODE environment variable
+CASSETTE_MODE = None
+
+# Cassette path; overridden by LEM_CASSETTE_FILE
+CASSETTE_FILE = "data/cassettes/rpc.jsonl.gz"
+
 # =========================
 # Research Mode Flags
 # =========================
@@ -0,0 +1,91 @@
+"""
+LEM v1.3 — Depth Curves (Constant-Product Price Impact)
+------------------------------------------------------
+Computes how much native asset it takes to move a pair's price, and what
+a grid of trade sizes costs in impact and slippage.
+
+Responsibilities:
+- Price impact and slippage for a grid of native trade sizes (buy side)
+- Native amount required to move price by a set of percentages
+  (buy side: price up, sell side: price down, in native drained)
+- Vectorized across all pairs in a single NumPy pass
+
+Constant-product model with the AMM fee retained in the pool:
+    buy dx native:  Rₜ' = Rₜ · Rₙ / (Rₙ + γ·dx),  Rₙ' = Rₙ + dx
+    sell dy token:  Rₙ' = Rₙ · Rₜ / (Rₜ + γ·dy),  Rₜ' = Rₜ + dy
+    γ = 1 − fee
+
+This module contains NO I/O and NO trading logic.
+"""
+
+import numpy as np
+
+from config import AMM_FEE, DEPTH_TRADE_SIZES, DEPTH_PRICE_MOVES_PCT
+
+
+def _solve_move(moves: np.ndarray, gamma: float) -> np.ndarray:
+    """
+    Solve (1 + u)(1 + γu) = 1 + m for u >= 0 (u = trade / reserve).
+    """
+    b = 1.0 + gamma
+    return (-b + np.sqrt(b * b + 4.0 * gamma * moves)) / (2.0 * gamma)
+
+
+def compute_depth(
+    native_reserves,
+    token_reserves,
+    trade_sizes=DEPTH_TRADE_SIZES,
+    price_moves_pct=DEPTH_PRICE_MOVES_PCT,
+    fee: float = AMM_FEE,
+) -> dict:
+    """
+    Compute depth curves for many pairs at once.
+
+    Args:
+        native_reserves: normalized native reserves, shape (P,)
+        token_reserves: normalized token reserves, shape (P,)
+        trade_sizes: native trade sizes, shape (S,)
+        price_moves_pct: target price moves in percent, shape (M,)
+        fee: AMM swap fee
+
+    Returns:
+        {
+            "buy_native":   (P, M) native spent to raise price by m%,
+            "sell_native":  (P, M) native drained to lower price by m%,
+            "buy_impact":   (P, S) post-trade price change for size s,
+            "buy_slippage": (P, S) execution price vs. spot for size s
+        }
+
+    Pairs with non-positive reserves yield NaN rows.
+    """
+    rn = np.asarray(native_reserves, dtype=np.float64)[:, None]
+    rt = np.asarray(token_reserves, dtype=np.float64)[:, None]
+    sizes = np.asarray(trade_sizes, dtype=np.float64)[None, :]
+    moves = np.asarray(price_moves_pct, dtype=np.float64)[None, :] / 100.0
+    gamma = 1.0 - fee
+
+    valid = (rn > 0) & (rt > 0)
+    rn = np.where(valid, rn, np.nan)
+    rt = np.where(valid, rt, np.nan)
+
+    # --- Native required per price move ---
+    u = _solve_move(moves, gamma)
+    buy_native = rn * u
+
+    v = _solve_move(1.0 / (1.0 - moves) - 1.0, gamma)
+    sell_native = rn * (1.0 - 1.0 / (1.0 + gamma * v))
+
+    # --- Impact & slippage per trade size ---
+    spot = rn / rt
+    token_out = rt * gamma * sizes / (rn + gamma * sizes)
+    post_price = (rn + sizes) / (rt - token_out)
+
+    buy_impact = post_price / spot - 1.0
+    buy_slippage = (sizes / token_out) / spot - 1.0
+
+    return {
+        "buy_native": buy_native,
+        "sell_native": sell_native,
+        "buy_impact": buy_impact,
+        "buy_slippage": buy_slippage,
+    }
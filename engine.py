@@ -5,96 +5,200 @@ Canonical observation loop for the Liquidity Elasticity Model.
 
 Responsibilities:
 - Load configuration
+- Watch the pair registry and reload it without a restart
 - Pull on-chain data
 - Compute LPₙ, MC, LEM, ΔLPₙ
+- Maintain constant-memory rolling statistics per pair
+- Append the cross-pair LEM index per cycle
 - Persist observations
-- Sleep and repeat
+- Sleep until the next pair is due and repeat
 
 This engine is READ-ONLY and NON-TRADING by design.
 """
 
 import time
+import argparse
+from datetime import datetime
 
-from config import OBSERVATION_INTERVAL
+from config import CHAIN, PAIR_REGISTRY_FILE, REGISTRY_POLL_INTERVAL
 from price_oracle import get_native_asset_price_usd
 from liquidity import get_native_reserve, calculate_lp_native_usd
 from marketcap import calculate_token_price_usd, calculate_market_cap_usd
 from lem import calculate_lem, calculate_lp_delta
-from storage import append_observation
-
+from storage import append_observation, append_rolling_stats, dedup_slot_seconds
+from rolling import PairState
+from lem_index import record_index
+from registry import PairRegistry
+
+
+def observe_pair(
+    pair_address: str,
+    state: PairState,
+    native_price_usd: float,
+    timestamp: str,
+    slot_seconds: int,
+) -> tuple[float, float] | None:
+    """
+    Observe one pair and persist its observation and rolling statistics.
 
-def run_engine(pair_address: str):
+    Args:
+        pair_address: checksum address of the AMM pair
+        state: the pair's rolling state
+        timestamp: tick time (ISO-8601 UTC), so that a pair's rows are
+            at least one interval apart whatever the RPC latency
+        slot_seconds: the pair's deduplication slot width
+
+    Returns:
+        (market_cap_usd, lem) for the cycle index, or None if the slot
+        already held an observation (nothing is updated then)
     """
-    Run the LEM observation engine for a single AMM pair.
+    # --- Step 1: Native reserve & LPₙ ---
+    native_reserve = get_native_reserve(pair_address)
+    lp_native_usd = calculate_lp_native_usd(
+        pair_address, native_price_usd
+    )
+
+    # --- Step 2: Token price & Market Cap ---
+    token_price_usd = calculate_token_price_usd(
+        pair_address, native_price_usd
+    )
+    market_cap_usd = calculate_market_cap_usd(
+        pair_address, native_price_usd
+    )
+
+    # --- Step 3: LEM & ΔLPₙ ---
+    lem_value = calculate_lem(market_cap_usd, lp_native_usd)
+    lp_delta = calculate_lp_delta(
+        current_lp_native_usd=lp_native_usd,
+        previous_lp_native_usd=state.previous_lp_native_usd,
+    )
+
+    # --- Step 4: Persist observation ---
+    written = append_observation(
+        pair_address=pair_address.lower(),
+        native_price_usd=native_price_usd,
+        native_reserve=native_reserve,
+        lp_native_usd=lp_native_usd,
+        token_price_usd=token_price_usd,
+        market_cap_usd=market_cap_usd,
+        lem=lem_value,
+        lp_delta_usd=lp_delta["delta_usd"],
+        lp_delta_pct=lp_delta["delta_pct"],
+        data_source="onchain_live",
+        timestamp_override=timestamp,
+        slot_seconds=slot_seconds,
+    )
+    if not written:
+        print(f"[INFO] {pair_address} already observed in this slot")
+        return None
+
+    # --- Step 5: Update rolling state & side file ---
+    state.update(lem_value, lp_native_usd, lp_delta["delta_pct"])
+    append_rolling_stats(
+        pair_address=pair_address.lower(),
+        stats=state.snapshot(),
+        chain=CHAIN,
+        timestamp_override=timestamp,
+    )
+
+    print(
+        f"[OK] {pair_address} LEM={lem_value:.4f} | "
+        f"LPₙ=${lp_native_usd:,.2f} | "
+        f"MC=${market_cap_usd:,.2f}"
+    )
+    return market_cap_usd, lem_value
+
+
+def run_engine(
+    registry_path: str = PAIR_REGISTRY_FILE,
+    labels: list[str] | None = None,
+):
+    """
+    Run the LEM observation engine over the pair registry.
+
+    Each enabled pair is observed on its own interval. The registry file
+    is checked for changes every REGISTRY_POLL_INTERVAL seconds and
+    reloaded without a restart: new pairs start immediately, changed
+    intervals apply from the next observation, and disabled or removed
+    pairs stop (their rolling state is dropped).
 
     Args:
-        pair_address: AMM pair contract address
+        registry_path: pair registry file
+        labels: observe only entries carrying any of these labels
     """
-    previous_lp_native_usd = None
+    registry = PairRegistry(registry_path)
+    states: dict[str, PairState] = {}
+    next_due: dict[str, float] = {}
 
     print("LEM Engine started.")
-    print(f"Tracking pair: {pair_address}")
-    print(f"Observation interval: {OBSERVATION_INTERVAL} seconds")
+    print(f"Pair registry: {registry_path}")
     print("Press Ctrl+C to stop.\n")
 
     while True:
-        try:
-            # --- Step 1: Native asset USD price ---
-            native_price_usd = get_native_asset_price_usd()
-
-            # --- Step 2: Native reserve & LPₙ ---
-            native_reserve = get_native_reserve(pair_address)
-            lp_native_usd = calculate_lp_native_usd(
-                pair_address, native_price_usd
-            )
-
-            # --- Step 3: Token price & Market Cap ---
-            token_price_usd = calculate_token_price_usd(
-                pair_address, native_price_usd
-            )
-            market_cap_usd = calculate_market_cap_usd(
-                pair_address, native_price_usd
-            )
-
-            # --- Step 4: LEM & ΔLPₙ ---
-            lem_value = calculate_lem(market_cap_usd, lp_native_usd)
-            lp_delta = calculate_lp_delta(
-                current_lp_native_usd=lp_native_usd,
-                previous_lp_native_usd=previous_lp_native_usd,
-            )
-
-            # --- Step 5: Persist observation ---
-            append_observation(
-                pair_address=pair_address,
-                native_price_usd=native_price_usd,
-                native_reserve=native_reserve,
-                lp_native_usd=lp_native_usd,
-                token_price_usd=token_price_usd,
-                market_cap_usd=market_cap_usd,
-                lem=lem_value,
-                lp_delta_usd=lp_delta["delta_usd"],
-                lp_delta_pct=lp_delta["delta_pct"],
-                data_source="onchain_live",
-            )
-
-            # --- Update state ---
-            previous_lp_native_usd = lp_native_usd
-
-            print(
-                f"[OK] LEM={lem_value:.4f} | "
-                f"LPₙ=${lp_native_usd:,.2f} | "
-                f"MC=${market_cap_usd:,.2f}"
-            )
-
-        except Exception as e:
-            # Engine must never crash silently
-            print(f"[ERROR] {e}")
-
-        # --- Sleep until next observation ---
-        time.sleep(OBSERVATION_INTERVAL)
+        if registry.reload_if_changed():
+            entries = registry.select(labels)
+            active = {entry.address for entry in entries}
+            for address in list(states):
+                if address not in active:
+                    del states[address]
+                    next_due.pop(address, None)
+            print(f"[INFO] Registry loaded: {len(entries)} enabled pairs")
+
+        entries = registry.select(labels)
+        now = time.monotonic()
+        tick_timestamp = datetime.utcnow().isoformat()
+        due = [e for e in entries if next_due.get(e.address, now) <= now]
+
+        for entry in due:
+            next_due[entry.address] = now + entry.interval
+
+        if due:
+            try:
+                # --- Native asset USD price, once per tick ---
+                native_price_usd = get_native_asset_price_usd()
+
+                cycle_market_caps = []
+                cycle_lems = []
+                for entry in due:
+                    try:
+                        observed = observe_pair(
+                            entry.address,
+                            states.setdefault(entry.address, PairState()),
+                            native_price_usd,
+                            tick_timestamp,
+                            dedup_slot_seconds(entry.interval),
+                        )
+                        if observed is None:
+                            continue
+                        cycle_market_caps.append(observed[0])
+                        cycle_lems.append(observed[1])
+                    except Exception as e:
+                        # One bad pair never stops the others
+                        print(f"[ERROR] {entry.address}: {e}")
+
+                # --- Cycle index over the pairs observed this tick ---
+                record_index(cycle_market_caps, cycle_lems, chain=CHAIN)
+
+            except Exception as e:
+                # Engine must never crash silently
+                print(f"[ERROR] {e}")
+
+        # --- Sleep until the next pair is due or the next registry check ---
+        wake = min(
+            [next_due.get(e.address, now) for e in entries]
+            + [time.monotonic() + REGISTRY_POLL_INTERVAL]
+        )
+        time.sleep(max(0.0, wake - time.monotonic()))
 
 
 if __name__ == "__main__":
-    # Replace with the AMM pair you want to observe
-    TEST_PAIR = "0x58F876857a02D6762E0101bb5C46A8c1ED44Dc16"
-    run_engine(TEST_PAIR)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the LEM observation loop.")
+    parser.add_argument("--registry", default=PAIR_REGISTRY_FILE)
+    parser.add_argument(
+        "--label",
+        action="append",
+        help="observe only registry pairs with this label (repeatable)",
+    )
+    args = parser.parse_args()
+
+    run_engine(args.registry, args.label)
@@ -9,17 +9,76 @@ Phase D additions:
 - Isolates failures per asset (fault-tolerant)
 - Appends one atomic row per asset
 - Uses single canonical CSV, partitioned by pair_address
+- Optional "--shard i/N" mode writing a per-shard segment
+- Depth curve side table computed once per cycle
+- Quarantines failing pairs with exponentially spaced re-probes
+- Skips supply / metadata reads for pairs whose reserves did not change
+- Tracks supply from mint / burn logs instead of per-cycle reads
+- Circulating-supply market cap, excluded balances batched per cycle
+- Appends a cap-weighted cross-pair LEM index row per cycle
+- Observes non-native pairs via a multi-hop pricing graph
+- Maintains a compact latest-value-per-pair export for dashboards
+- Paces every RPC / HTTP read through a shared rate governor
+- Reads tracked pairs from the external registry, honouring per-pair
+  intervals, labels and enabled flags
 
 No trading logic. No alerts. Observation only.
 """
 
-from config import CHAIN
-from chain import get_base_token_address, get_token_metadata
+import os
+import time
+import argparse
+from datetime import datetime, timezone
+
+from config import (
+    CHAIN,
+    LEM_LOG_FILE,
+    DEPTH_LOG_FILE,
+    LEM_INDEX_FILE,
+    HEALTH_FILE,
+    PAIR_STATE_FILE,
+    SUPPLY_CACHE_FILE,
+    UNCHANGED_PAIR_MODE,
+    PRICING_PATH_FILE,
+    PRICING_ROUTE_POOLS,
+    LATEST_JSON_FILE,
+)
+from chain import get_pair_reserves, get_token_metadata
 from price_oracle import get_native_asset_price_usd
-from liquidity import calculate_lp_native_usd
-from marketcap import calculate_token_price_usd, calculate_market_cap_usd
-from lem import calculate_lem
-from storage import append_observation
+from liquidity import get_pool_snapshot
+from depth import compute_depth
+from lem_index import record_index
+from storage import append_observation, append_depth_rows, dedup_slot_seconds
+from health import (
+    load_health,
+    save_health,
+    should_probe,
+    record_success,
+    record_failure,
+)
+from supply import (
+    load_supply_cache,
+    save_supply_cache,
+    sync_supply,
+    sync_exclusions,
+)
+from pair_state import (
+    load_pair_state,
+    save_pair_state,
+    reserves_unchanged,
+    stored_pool,
+    record_pair_state,
+)
+from pricing import (
+    load_pricing_paths,
+    save_pricing_paths,
+    resolve_prices,
+)
+from observation import derive_observation
+from sharding import parse_shard_spec, select_shard_pairs, shard_log_file
+from governor import print_report as print_rate_report
+from latest import load_latest, save_latest, update_latest, export_latest
+from registry import load_registry, select_pairs, is_due, pair_slot_seconds
 
 
 # =========================
@@ -28,71 +87,307 @@ from storage import append_observation
 
 DATA_SOURCE = "onchain_live"
 
-# BNB Chain — Meme / Experimental Sample Set
-PAIRS = [
-    # Wiki Cat (mature reference asset)
-    "0x933477eba23726ca95a957cb85dbb1957267ef85",
+# Rows of pairs whose reserves did not change since the previous run,
+# recomputed from stored state rather than a fresh full read
+DATA_SOURCE_CARRY = "onchain_carry"
+
+
+def due_pairs(labels: list[str] | None = None, now: float | None = None) -> list[str]:
+    """
+    Enabled registry pairs whose interval has elapsed since their last
+    observation (the latest-value record).
+
+    Args:
+        labels: limit to entries carrying any of these labels
+    """
+    now = time.time() if now is None else now
+    entries = select_pairs(load_registry().values(), labels)
+    latest = load_latest()
+
+    due = [
+        entry.pair for entry in entries
+        if is_due(entry, latest.get(entry.pair, {}).get("updated"), now)
+    ]
+    if len(due) < len(entries):
+        print(f"[INFO] {len(entries) - len(due)} pairs not due this run")
+    return due
 
-    # Shisa (very early-stage meme)
-    "0x80d4150938dfac5313bb25eb4c121a40504617d0",
 
-    # Hachiko
-    "0xe6edc555061d1d9fe0145867b7ea7b07da840898",
+def run_once(
+    pairs: list[str] | None = None,
+    shard: tuple[int, int] | None = None,
+    labels: list[str] | None = None,
+    cycle_id: str | None = None,
+):
+    """
+    Run one observation cycle.
 
-    # Token called "4"
-    "0xf0a949d3d93b833c183a27ee067165b6f2c9625e",
+    Pass 1 reads every pool once (reserves; tokens and decimals only
+    when the reserves moved). Pass 2 prices all tokens through the
+    multi-hop pricing graph built from those reads and derives every
+    observation from it, so pairs quoted in stablecoins or other tracked
+    tokens are observed without extra RPC calls per hop. Pairs whose
+    getReserves() output matches the previous run are carried forward
+    from stored state with a single RPC call. Depth curves for all
+    successfully observed pairs are computed in one vectorized pass at
+    the end of the cycle.
 
-    # cBNB
-    "0x37e8d5a7c7c95d1adc905e680ebd0c321b64ab13",
-]
+    Args:
+        pairs: pairs to observe (defaults to the registry pairs that
+            are due, see due_pairs)
+        shard: (i, N) to observe only shard i of N and write every
+            output to that shard's segments
+        labels: registry labels to limit the default pair set to
+        cycle_id: run identifier shared by all shards of one scheduled
+            run, recorded with the index row so shard segments merge
+            into one cycle
+    """
+    pairs = due_pairs(labels) if pairs is None else pairs
 
+    log_file = None
+    depth_log_file = None
+    index_log_file = None
+    health_file = HEALTH_FILE
+    state_file = PAIR_STATE_FILE
+    supply_file = SUPPLY_CACHE_FILE
+    paths_file = PRICING_PATH_FILE
+    if shard is not None:
+        pairs = select_shard_pairs(pairs, *shard)
+        log_file = shard_log_file(*shard, LEM_LOG_FILE)
+        depth_log_file = shard_log_file(*shard, DEPTH_LOG_FILE)
+        index_log_file = shard_log_file(*shard, LEM_INDEX_FILE)
+        health_file = shard_log_file(*shard, HEALTH_FILE)
+        state_file = shard_log_file(*shard, PAIR_STATE_FILE)
+        supply_file = shard_log_file(*shard, SUPPLY_CACHE_FILE)
+        paths_file = shard_log_file(*shard, PRICING_PATH_FILE)
+
+    # Quarantined pairs wait for their next re-probe
+    health = load_health()
+    skipped = [p for p in pairs if not should_probe(health, p)]
+    pairs = [p for p in pairs if should_probe(health, p)]
+    if skipped:
+        print(f"[INFO] {len(skipped)} quarantined pairs skipped this run")
 
-def run_once():
     # 1. Fetch native asset price (USD) once per run
     native_price = get_native_asset_price_usd()
 
-    for pair_address in PAIRS:
+    states = load_pair_state()
+
+    # Advance cached supply for all known tokens in one batched pass
+    supply = load_supply_cache()
+    # Route-only pools are stored without a token address
+    known_tokens = [
+        states[p.lower()]["token_address"]
+        for p in pairs
+        if p.lower() in states and states[p.lower()]["token_address"]
+    ]
+    try:
+        sync_supply(supply, known_tokens)
+    except Exception as e:
+        print(f"[WARN] Supply sync failed: {e}")
+
+    # Excluded-holder balances for all known tokens in one batched read
+    try:
+        sync_exclusions(supply, known_tokens)
+    except Exception as e:
+        print(f"[WARN] Excluded balance sync failed: {e}")
+
+    # 2. Pass 1: one read per pool; idle pools reuse last run's state
+    pools = {}
+    reads = {}
+    unchanged = set()
+
+    for pair_address in dict.fromkeys(pairs + PRICING_ROUTE_POOLS):
+        observed = pair_address in pairs
         try:
-            # 2. Native Liquidity (LPₙ)
-            lp_native_usd = calculate_lp_native_usd(pair_address, native_price)
-
-            # 3. Token price (USD)
-            token_price = calculate_token_price_usd(pair_address, native_price)
-
-            # 4. Market cap (USD)
-            market_cap = calculate_market_cap_usd(pair_address, native_price)
-
-            # 5. LEM
-            lem_value = calculate_lem(market_cap, lp_native_usd)
-
-            # 6. Resolve base token metadata (annotations only)
-            base_token = get_base_token_address(pair_address)
-            meta = get_token_metadata(base_token)
-
-            token_symbol = meta.get("symbol", "")
-            token_name = meta.get("name", "")
-
-            # 7. Append observation (atomic per asset)
-            append_observation(
-                pair_address=pair_address,
-                native_price_usd=native_price,
-                native_reserve=None,
-                lp_native_usd=lp_native_usd,
-                token_price_usd=token_price,
-                market_cap_usd=market_cap,
-                lem=lem_value,
-                lp_delta_usd=None,
-                lp_delta_pct=None,
-                data_source=DATA_SOURCE,
-                chain=CHAIN,
-                token_symbol=token_symbol,
-                token_name=token_name,
+            reserves = get_pair_reserves(pair_address)
+            if reserves_unchanged(states, pair_address, reserves):
+                pools[pair_address] = stored_pool(states[pair_address.lower()])
+                unchanged.add(pair_address)
+            else:
+                pools[pair_address] = get_pool_snapshot(pair_address, reserves)
+                reads[pair_address] = reserves
+                if not observed:
+                    record_pair_state(
+                        states, pair_address, reserves,
+                        pools[pair_address], None, "", "",
+                    )
+        except Exception as e:
+            if not observed:
+                print(f"[WARN] Route pool {pair_address} unavailable: {e}")
+                continue
+            record = record_failure(health, pair_address, e)
+            print(
+                f"[WARN] Skipping pair {pair_address} "
+                f"({record['kind']}, {record['failures']} failures): {e}"
             )
 
+    # 3. Price every token through its deepest path from an anchor
+    path_cache = load_pricing_paths()
+    prices = resolve_prices(pools, native_price, path_cache)
+
+    snapshots = {}
+    cycle_market_caps = []
+    cycle_lems = []
+    idle = 0
+
+    latest = load_latest()
+    slot_seconds = pair_slot_seconds()
+    cycle_time = time.time()
+    cycle_timestamp = (
+        datetime.fromtimestamp(cycle_time, tz=timezone.utc)
+        .replace(tzinfo=None)
+        .isoformat()
+    )
+
+    # 4. Pass 2: derive observations (no RPC for idle pairs)
+    for pair_address in pairs:
+        if pair_address not in pools:
+            continue
+
+        try:
+            pool = pools[pair_address]
+
+            # 5. LPₙ, token price, market cap and LEM from the graph
+            obs = derive_observation(pool, prices, native_price, supply)
+
+            data_source = DATA_SOURCE
+            if pair_address in unchanged:
+                data_source = DATA_SOURCE_CARRY
+                state = states[pair_address.lower()]
+                token_symbol = state["token_symbol"]
+                token_name = state["token_name"]
+                idle += 1
+            else:
+                # Resolve base token metadata (annotations only)
+                meta = get_token_metadata(obs["token_address"])
+                token_symbol = meta.get("symbol", "")
+                token_name = meta.get("name", "")
+
+            record_success(health, pair_address)
+
+            if pair_address not in unchanged or UNCHANGED_PAIR_MODE != "skip":
+                # 6. Append observation (atomic per asset)
+                written = append_observation(
+                    pair_address=pair_address,
+                    native_price_usd=native_price,
+                    native_reserve=obs["native_reserve"],
+                    lp_native_usd=obs["lp_native_usd"],
+                    token_price_usd=obs["token_price_usd"],
+                    market_cap_usd=obs["market_cap_usd"],
+                    lem=obs["lem"],
+                    lp_delta_usd=None,
+                    lp_delta_pct=None,
+                    data_source=data_source,
+                    chain=CHAIN,
+                    token_symbol=token_symbol,
+                    token_name=token_name,
+                    log_file=log_file,
+                    slot_seconds=slot_seconds.get(pair_address.lower(), dedup_slot_seconds()),
+                )
+
+                # A retried run: the slot already holds this observation,
+                # so state, latest value and index keep the stored one
+                if not written:
+                    print(f"[INFO] {pair_address} already observed in this slot")
+                    continue
+
+                snapshots[pair_address] = obs
+
+            if pair_address in reads:
+                record_pair_state(
+                    states, pair_address, reads[pair_address], pool,
+                    obs["token_address"], token_symbol, token_name,
+                )
+
+            cycle_market_caps.append(obs["market_cap_usd"])
+            cycle_lems.append(obs["lem"])
+
+            update_latest(latest, {
+                "pair_address": pair_address,
+                "chain": CHAIN,
+                "timestamp_utc": cycle_timestamp,
+                "token_symbol": token_symbol,
+                "token_name": token_name,
+                "native_price_usd": native_price,
+                "native_reserve": obs["native_reserve"],
+                "lp_native_usd": obs["lp_native_usd"],
+                "token_price_usd": obs["token_price_usd"],
+                "market_cap_usd": obs["market_cap_usd"],
+                "lem": obs["lem"],
+                "data_source": data_source,
+            }, cycle_time)
+
         except Exception as e:
             # Fault isolation: one bad pair never kills the run
-            print(f"[WARN] Skipping pair {pair_address}: {e}")
+            record = record_failure(health, pair_address, e)
+            print(
+                f"[WARN] Skipping pair {pair_address} "
+                f"({record['kind']}, {record['failures']} failures): {e}"
+            )
+
+    save_health(health, health_file)
+    save_pair_state(states, state_file)
+    save_supply_cache(supply, supply_file)
+    save_pricing_paths(path_cache, paths_file)
+
+    # Latest-value export: shards write a record segment; the merged
+    # JSON is exported to Arrow / manifest after merging (latest.py)
+    if shard is not None:
+        save_latest(latest, shard_log_file(*shard, LATEST_JSON_FILE))
+    else:
+        export_latest(latest)
+
+    if idle:
+        print(f"[INFO] {idle} pairs unchanged since last run")
+
+    # 7. Depth curves for the whole cycle (side table)
+    if snapshots:
+        pair_addresses = list(snapshots)
+        native_reserves = [snapshots[p]["native_reserve"] for p in pair_addresses]
+        token_reserves = [snapshots[p]["token_reserve"] for p in pair_addresses]
+
+        append_depth_rows(
+            pair_addresses,
+            native_reserves,
+            token_reserves,
+            compute_depth(native_reserves, token_reserves),
+            chain=CHAIN,
+            log_file=depth_log_file,
+        )
+
+    # 8. Cross-pair LEM index (partial per shard, merged afterwards)
+    record_index(
+        cycle_market_caps, cycle_lems,
+        chain=CHAIN, log_file=index_log_file, cycle_id=cycle_id,
+    )
+
+    print_rate_report()
 
 
 if __name__ == "__main__":
-    run_once()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run one LEM observation cycle.")
+    parser.add_argument(
+        "--shard",
+        metavar="i/N",
+        help="observe only the pairs hashed to shard i of N "
+             "and write a per-shard segment",
+    )
+    parser.add_argument(
+        "--label",
+        action="append",
+        help="observe only registry pairs with this label (repeatable)",
+    )
+    parser.add_argument(
+        "--cycle-id",
+        default=os.environ.get("LEM_CYCLE_ID"),
+        help="identifier shared by all shards of one run "
+             "(default: the LEM_CYCLE_ID environment variable)",
+    )
+    args = parser.parse_args()
+
+    run_once(
+        shard=parse_shard_spec(args.shard) if args.shard else None,
+        labels=args.label,
+        cycle_id=args.cycle_id,
+    )
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""
+LEM Phase D — Pair Errors
+-------------------------
+Exceptions raised by the chain and liquidity layers for pairs that can
+never be observed as configured.
+
+Responsibilities:
+- Name permanent pair failures, so health.py can quarantine them
+  without the RPC layer importing the quarantine module
+
+No RPC calls. No calculations.
+"""
+
+
+class InvalidPairError(ValueError):
+    """
+    The pair (or one of its tokens) is not a readable AMM pool / ERC-20
+    contract. Raised by the chain layer; repeats until the contract
+    itself changes.
+    """
+
+
+class NonNativePairError(InvalidPairError):
+    """
+    The pair does not contain the native asset (native-only reads).
+    """
@@ -0,0 +1,364 @@
+"""
+LEM Phase D — Request Rate Governor
+-----------------------------------
+Central token-bucket budget shared by every RPC and external HTTP read.
+
+Responsibilities:
+- Pace requests to a configured rate and burst, per endpoint
+- Prioritize reads: getReserves ("high") before supply / log reads
+  ("normal") before token metadata ("low")
+- Adapt to the provider: cut the rate multiplicatively on 429 /
+  rate-limit errors, regain it additively while requests succeed
+- Retry throttled, dropped and timed-out requests
+- Govern async WebSocket reads through the same RPC budget
+
+The adaptive rate remembers where the provider last pushed back and
+climbs slowly near that ceiling, so throughput settles just below the
+limit instead of cycling between idle and throttled.
+
+No calculations. Observation only.
+"""
+
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from web3.exceptions import Web3RPCError
+from web3.providers.base import JSONBaseProvider
+
+from config import (
+    RPC_RATE_LIMIT_RPS,
+    RPC_RATE_LIMIT_BURST,
+    HTTP_RATE_LIMIT_RPS,
+    HTTP_RATE_LIMIT_BURST,
+    GOVERNOR_BACKOFF_FACTOR,
+    GOVERNOR_RECOVERY_STEP,
+    GOVERNOR_MIN_RPS,
+    GOVERNOR_MAX_RETRIES,
+    GOVERNOR_PRIORITY_RESERVE,
+)
+
+
+HIGH = "high"
+NORMAL = "normal"
+LOW = "low"
+
+# eth_call selectors with a non-default priority
+SELECTOR_PRIORITY = {
+    "0x0902f1ac": HIGH,  # getReserves()
+    "0x95d89b41": LOW,   # symbol()
+    "0x06fdde03": LOW,   # name()
+}
+
+# JSON-RPC error codes providers use only for rate limiting. The
+# generic "limit exceeded" code -32005 is left out: it also covers
+# oversized eth_getLogs queries, so it counts as throttling only with a
+# rate-limit message
+RATE_LIMIT_ERROR_CODES = (-32090, 429)
+
+RATE_LIMIT_MESSAGES = ("rate limit", "request rate", "too many requests")
+
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+class RateLimited(RuntimeError):
+    """
+    Raised when a request is still throttled after all retries.
+    """
+
+
+# =========================
+# Token Bucket
+# =========================
+
+class TokenBucket:
+    """
+    Token bucket with priority reserves and AIMD rate adaptation.
+    Thread-safe; waiting happens outside the lock.
+    """
+
+    __slots__ = (
+        "name", "max_rate", "rate", "burst", "tokens", "ceiling",
+        "_last", "_paused_until", "_hold_until", "_lock",
+        "requests", "throttled",
+    )
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.ceiling = None
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._hold_until = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, priority: str = NORMAL):
+        """
+        Block until a token is available for this priority. Lower
+        priorities leave part of the burst untouched for higher ones.
+        """
+        needed = 1 + self.burst * GOVERNOR_PRIORITY_RESERVE[priority]
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now >= self._paused_until and self.tokens >= needed:
+                    self.tokens -= 1
+                    self.requests += 1
+                    return
+
+                wait = max(
+                    self._paused_until - now,
+                    (needed - self.tokens) / self.rate,
+                )
+            time.sleep(wait)
+
+    def on_success(self):
+        """
+        Additive increase: about GOVERNOR_RECOVERY_STEP requests/s per
+        second of throttle-free traffic, ten times slower within 10% of
+        the last throttled rate.
+        """
+        with self._lock:
+            step = GOVERNOR_RECOVERY_STEP / self.rate
+            if self.ceiling is not None and self.rate >= 0.9 * self.ceiling:
+                step /= 10
+            self.rate = min(self.max_rate, self.rate + step)
+
+    def on_throttle(self, retry_after: float | None = None):
+        """
+        Multiplicative decrease. 429s within one bucket refill time of
+        the last cut (in-flight requests, retries) count as one event.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            self.tokens = 0.0
+
+            if now >= self._hold_until:
+                self.ceiling = self.rate
+                self.rate = max(GOVERNOR_MIN_RPS, self.rate * GOVERNOR_BACKOFF_FACTOR)
+                self._hold_until = now + self.burst / self.rate
+
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+        }
+
+
+_BUCKETS: dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_bucket(name: str) -> TokenBucket:
+    """
+    Process-wide bucket by name: "rpc" for JSON-RPC, the host name for
+    external HTTP APIs.
+    """
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(name)
+        if bucket is None:
+            if name == "rpc":
+                bucket = TokenBucket(name, RPC_RATE_LIMIT_RPS, RPC_RATE_LIMIT_BURST)
+            else:
+                bucket = TokenBucket(name, HTTP_RATE_LIMIT_RPS, HTTP_RATE_LIMIT_BURST)
+            _BUCKETS[name] = bucket
+        return bucket
+
+
+def print_report():
+    for bucket in _BUCKETS.values():
+        s = bucket.stats()
+        status = "[WARN]" if s["throttled"] else "[OK]"
+        print(
+            f"{status} {s['name']}: {s['requests']} requests, "
+            f"{s['throttled']} throttled, "
+            f"rate {s['rate']:.2f}/{s['max_rate']:.2f} req/s"
+        )
+
+
+# =========================
+# Throttle Detection
+# =========================
+
+def retry_after_seconds(response) -> float | None:
+    """
+    Parse a Retry-After header (seconds or HTTP date).
+    """
+    if response is None:
+        return None
+
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limit_response(response) -> bool:
+    """
+    True for a JSON-RPC error response signalling rate limiting.
+    """
+    if not isinstance(response, dict):
+        return False
+
+    error = response.get("error")
+    if not isinstance(error, dict):
+        return False
+
+    message = str(error.get("message", "")).lower()
+    return (
+        error.get("code") in RATE_LIMIT_ERROR_CODES
+        or any(marker in message for marker in RATE_LIMIT_MESSAGES)
+    )
+
+
+def request_priority(method: str, params) -> str:
+    """
+    Priority of a JSON-RPC request, from the eth_call selector.
+    """
+    if method == "eth_call" and params and isinstance(params[0], dict):
+        data = params[0].get("data") or params[0].get("input") or ""
+        if isinstance(data, bytes):
+            data = "0x" + data.hex()
+        return SELECTOR_PRIORITY.get(str(data)[:10].lower(), NORMAL)
+    return NORMAL
+
+
+# =========================
+# Governed Transports
+# =========================
+
+def _governed(bucket: TokenBucket, priority: str, send, throttled):
+    """
+    Run `send()` under the bucket, retrying throttled and transient
+    failures. `throttled(result)` flags in-band rate-limit responses.
+    """
+    for attempt in range(GOVERNOR_MAX_RETRIES + 1):
+        last = attempt == GOVERNOR_MAX_RETRIES
+        bucket.acquire(priority)
+
+        try:
+            result = send()
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 429 or last:
+                raise
+            bucket.on_throttle(retry_after_seconds(e.response))
+            continue
+        except RETRYABLE_ERRORS:
+            if last:
+                raise
+            continue
+
+        if throttled(result):
+            bucket.on_throttle()
+            if last:
+                raise RateLimited(f"{bucket.name}: still throttled after retries")
+            continue
+
+        bucket.on_success()
+        return result
+
+
+class GovernedProvider(JSONBaseProvider):
+    """
+    web3 provider that paces and retries requests through the "rpc"
+    bucket.
+    """
+
+    def __init__(self, inner, bucket: TokenBucket | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.inner = inner
+        self.bucket = bucket or get_bucket("rpc")
+
+    def make_request(self, method, params):
+        return _governed(
+            self.bucket,
+            request_priority(method, params),
+            lambda: self.inner.make_request(method, params),
+            is_rate_limit_response,
+        )
+
+
+async def governed_async(send, priority: str = NORMAL, bucket: TokenBucket | None = None):
+    """
+    Await `send()` (an async RPC call, e.g. over a WebSocket provider)
+    under the "rpc" bucket, retrying rate-limit errors. Waiting for a
+    token happens in a worker thread so the event loop keeps running.
+
+    Raises:
+        RateLimited if still throttled after all retries
+    """
+    bucket = bucket or get_bucket("rpc")
+
+    for attempt in range(GOVERNOR_MAX_RETRIES + 1):
+        await asyncio.to_thread(bucket.acquire, priority)
+
+        try:
+            result = await send()
+        except Web3RPCError as e:
+            if not is_rate_limit_response(e.rpc_response):
+                raise
+            bucket.on_throttle()
+            if attempt == GOVERNOR_MAX_RETRIES:
+                raise RateLimited(f"{bucket.name}: still throttled after retries") from e
+            continue
+
+        bucket.on_success()
+        return result
+
+
+def govern_provider(provider):
+    """
+    Wrap a web3 provider with the shared RPC bucket.
+    """
+    return GovernedProvider(provider)
+
+
+def http_get(url: str, timeout: float, priority: str = NORMAL) -> requests.Response:
+    """
+    GET through the bucket of the URL's host.
+
+    Raises:
+        requests.RequestException on network or HTTP errors
+    """
+    def send():
+        response = requests.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response
+
+    return _governed(
+        get_bucket(urlparse(url).netloc),
+        priority,
+        send,
+        lambda response: False,
+    )
@@ -0,0 +1,177 @@
+"""
+LEM Phase D — Pair Health & Adaptive Quarantine
+-----------------------------------------------
+Persisted per-pair health records that keep dead, rugged or unsupported
+pairs from consuming the RPC budget on every run.
+
+Responsibilities:
+- Classify failures as permanent (deterministic on chain state) or
+  transient (network / provider)
+- Quarantine failing pairs with exponentially spaced re-probes
+- Persist records atomically
+- Report quarantined pairs
+
+Observation only. No calculations.
+"""
+
+import time
+from datetime import datetime, timezone
+
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+
+from config import (
+    HEALTH_FILE,
+    QUARANTINE_AFTER_FAILURES,
+    QUARANTINE_BASE_DELAY,
+    QUARANTINE_MAX_DELAY,
+)
+from errors import InvalidPairError
+from storage import load_records, save_records
+
+
+PERMANENT = "permanent"
+TRANSIENT = "transient"
+
+# Failures that will repeat until the pair itself changes: non-pair or
+# non-token contracts, non-native pools, reverting calls. Everything
+# else (HTTP / JSON decoding errors, RPC errors, rate limiting, invalid
+# calculation inputs) is transient.
+PERMANENT_ERRORS = (InvalidPairError, BadFunctionCallOutput, ContractLogicError)
+
+
+# =========================
+# Persistence
+# =========================
+
+def load_health(path: str = HEALTH_FILE) -> dict:
+    """
+    Load health records keyed by lowercased pair address.
+    """
+    return load_records(path)
+
+
+def save_health(records: dict, path: str = HEALTH_FILE):
+    """
+    Atomically write health records.
+    """
+    save_records(records, path)
+
+
+# =========================
+# Classification & Scheduling
+# =========================
+
+def classify_failure(error: Exception) -> str:
+    """
+    Return PERMANENT or TRANSIENT for an exception raised while observing.
+    """
+    return PERMANENT if isinstance(error, PERMANENT_ERRORS) else TRANSIENT
+
+
+def should_probe(records: dict, pair_address: str, now: float | None = None) -> bool:
+    """
+    True if the pair is healthy or its next re-probe time has passed.
+    """
+    record = records.get(pair_address.lower())
+    if not record or not record.get("next_probe"):
+        return True
+
+    now = time.time() if now is None else now
+    return now >= record["next_probe"]
+
+
+def record_success(records: dict, pair_address: str, now: float | None = None):
+    """
+    Reset a pair's failure state after a successful observation.
+    """
+    now = time.time() if now is None else now
+    records[pair_address.lower()] = {
+        "failures": 0,
+        "kind": None,
+        "last_error": None,
+        "last_success": now,
+        "next_probe": None,
+        "updated": now,
+    }
+
+
+def record_failure(
+    records: dict,
+    pair_address: str,
+    error: Exception,
+    now: float | None = None,
+) -> dict:
+    """
+    Register a failed observation and schedule the next re-probe.
+
+    Permanent failures are quarantined immediately; transient failures
+    after QUARANTINE_AFTER_FAILURES consecutive attempts. Each further
+    failure doubles the delay, capped at QUARANTINE_MAX_DELAY.
+
+    Returns:
+        The updated record
+    """
+    now = time.time() if now is None else now
+    key = pair_address.lower()
+    previous = records.get(key) or {}
+
+    kind = classify_failure(error)
+    failures = previous.get("failures", 0) + 1
+    threshold = 1 if kind == PERMANENT else QUARANTINE_AFTER_FAILURES
+
+    next_probe = None
+    if failures >= threshold:
+        delay = min(
+            QUARANTINE_BASE_DELAY * 2 ** (failures - threshold),
+            QUARANTINE_MAX_DELAY,
+        )
+        next_probe = now + delay
+
+    record = {
+        "failures": failures,
+        "kind": kind,
+        "last_error": f"{type(error).__name__}: {error}"[:300],
+        "last_success": previous.get("last_success"),
+        "next_probe": next_probe,
+        "updated": now,
+    }
+    records[key] = record
+    return record
+
+
+def quarantined(records: dict, now: float | None = None) -> dict:
+    """
+    Records of pairs currently waiting for a re-probe.
+    """
+    now = time.time() if now is None else now
+    return {
+        pair: record for pair, record in records.items()
+        if record.get("next_probe") and record["next_probe"] > now
+    }
+
+
+# =========================
+# Report
+# =========================
+
+def _fmt_time(epoch: float | None) -> str:
+    if not epoch:
+        return "-"
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def print_report(records: dict):
+    held = quarantined(records)
+
+    print(f"{len(held)} of {len(records)} tracked pairs quarantined.\n")
+    for pair, record in sorted(held.items(), key=lambda kv: kv[1]["next_probe"]):
+        print(
+            f"{pair}  {record['kind']:<9}  failures={record['failures']:<3}  "
+            f"next_probe={_fmt_time(record['next_probe'])}  "
+            f"last_success={_fmt_time(record['last_success'])}"
+        )
+        print(f"    {record['last_error']}")
+
+
+if __name__ == "__main__":
+    print_report(load_health())
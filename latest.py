@@ -0,0 +1,180 @@
+"""
+LEM Phase D — Latest Snapshot Export
+------------------------------------
+Compact "current state" artifact for dashboards: one record per pair
+with its most recent LEM, LPₙ and market cap, so consumers never need
+the full observation history.
+
+Files (data/latest/):
+- lem_latest.json:  per-pair records (mergeable across shards)
+- lem_latest.arrow: the same records as an Arrow IPC file (optional,
+                    requires pyarrow)
+- manifest.json:    sha256 and size of each file; consumers compare
+                    hashes and skip downloads when nothing changed
+
+Records are updated in place for the pairs observed in a cycle; pairs
+that were not observed keep their last record. Files are written
+atomically and only when their content changes.
+
+No RPC calls, no calculations.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+
+from config import LATEST_JSON_FILE, LATEST_ARROW_FILE, LATEST_MANIFEST_FILE
+from storage import load_records, save_records
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # Arrow export is optional
+    pa = None
+
+
+# Fields kept per pair, in Arrow column order
+LATEST_FIELDS = [
+    "pair_address",
+    "chain",
+    "timestamp_utc",
+    "token_symbol",
+    "token_name",
+    "native_price_usd",
+    "native_reserve",
+    "lp_native_usd",
+    "token_price_usd",
+    "market_cap_usd",
+    "lem",
+    "data_source",
+]
+
+
+# =========================
+# Records
+# =========================
+
+def load_latest(path: str = LATEST_JSON_FILE) -> dict:
+    """
+    Load latest records keyed by lowercased pair address.
+    """
+    return load_records(path)
+
+
+def save_latest(records: dict, path: str = LATEST_JSON_FILE):
+    """
+    Atomically write latest records.
+    """
+    save_records(records, path)
+
+
+def update_latest(records: dict, row: dict, now: float):
+    """
+    Replace one pair's record with the values of this cycle.
+
+    Args:
+        row: observation values keyed by LATEST_FIELDS
+    """
+    record = {field: row.get(field) for field in LATEST_FIELDS}
+    record["pair_address"] = record["pair_address"].lower()
+    record["updated"] = now
+    records[record["pair_address"]] = record
+
+
+# =========================
+# Export
+# =========================
+
+def _file_digest(path: str) -> dict | None:
+    if not os.path.exists(path):
+        return None
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+
+    return {"sha256": digest.hexdigest(), "bytes": os.path.getsize(path)}
+
+
+def _write_if_changed(path: str, payload: bytes) -> bool:
+    """
+    Atomically replace `path` with `payload` unless it is identical.
+    """
+    current = _file_digest(path)
+    if current is not None and current["sha256"] == hashlib.sha256(payload).hexdigest():
+        return False
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _arrow_payload(records: dict) -> bytes:
+    rows = [records[pair] for pair in sorted(records)]
+    table = pa.Table.from_pydict({
+        field: [row.get(field) for row in rows] for field in LATEST_FIELDS
+    })
+
+    sink = pa.BufferOutputStream()
+    with pa_ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def export_latest(
+    records: dict,
+    json_path: str = LATEST_JSON_FILE,
+    arrow_path: str = LATEST_ARROW_FILE,
+    manifest_path: str = LATEST_MANIFEST_FILE,
+) -> dict:
+    """
+    Write the JSON and Arrow snapshots and the hash manifest.
+
+    Unchanged files are not rewritten, and the manifest only changes
+    when one of them did.
+
+    Returns:
+        manifest dict
+    """
+    payload = json.dumps(records, indent=2, sort_keys=True).encode("utf-8")
+    changed = _write_if_changed(json_path, payload)
+
+    if pa is not None:
+        changed |= _write_if_changed(arrow_path, _arrow_payload(records))
+    else:
+        print("[INFO] pyarrow not installed, Arrow snapshot skipped")
+
+    files = {}
+    for path in (json_path, arrow_path):
+        digest = _file_digest(path)
+        if digest is not None:
+            files[os.path.basename(path)] = digest
+
+    manifest = load_records(manifest_path)
+    if changed or manifest.get("files") != files:
+        manifest = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "pairs": len(records),
+            "files": files,
+        }
+        _write_if_changed(
+            manifest_path,
+            json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"),
+        )
+
+    return manifest
+
+
+if __name__ == "__main__":
+    manifest = export_latest(load_latest())
+    print(f"Latest snapshot: {manifest.get('pairs', 0)} pairs")
+    for name, digest in manifest.get("files", {}).items():
+        print(f"  {name}: {digest['bytes']} bytes, sha256 {digest['sha256'][:12]}")
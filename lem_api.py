@@ -0,0 +1,266 @@
+"""
+LEM v1.3 — Local Read API
+------------------------
+Small read-only HTTP service over the observation log.
+
+Responsibilities:
+- Load the log once into a per-pair in-memory index
+- Tail new appends incrementally (no full re-read)
+- Serve latest-per-pair and time-range queries as JSON or Arrow
+- Support conditional requests via ETag / If-None-Match
+
+Endpoints:
+    GET /pairs
+    GET /latest
+    GET /latest/<pair_address>
+    GET /range/<pair_address>?start=<iso>&end=<iso>&format=json|arrow
+
+No calculations, no writes. Observation only.
+"""
+
+import io
+import os
+import csv
+import json
+import bisect
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from config import LEM_LOG_FILE, API_HOST, API_PORT
+from schema import SCHEMAS, CURRENT_SCHEMA_VERSION, row_upgrader
+from storage import parse_value
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # Arrow output is optional
+    pa = None
+
+
+# =========================
+# In-Memory Index
+# =========================
+
+class ObservationIndex:
+    """
+    Per-pair, time-ordered index of the observation log.
+
+    The file is read once; later calls to refresh() only parse bytes
+    appended since the previous call. A rewritten or truncated file
+    (e.g. after deduplication) triggers a full reload.
+
+    ETags combine the log identity (inode and reload count) with the
+    global generation for whole-log endpoints, or with the pair's own
+    version for per-pair endpoints, so appends to one pair do not
+    invalidate cached responses of the others.
+    """
+
+    def __init__(self, log_file: str = LEM_LOG_FILE):
+        self.log_file = log_file
+        self.lock = threading.Lock()
+        self.reloads = 0
+        self._reset()
+
+    def _reset(self):
+        self.header = None
+        self.upgrade = None
+        self.offset = 0
+        self.inode = None
+        self.generation = 0
+        self.timestamps: dict[str, list[str]] = {}
+        self.rows: dict[str, list[dict]] = {}
+        self.versions: dict[str, int] = {}
+
+    def refresh(self):
+        """
+        Ingest any complete lines appended since the last refresh.
+        """
+        with self.lock:
+            try:
+                st = os.stat(self.log_file)
+            except FileNotFoundError:
+                return
+
+            if st.st_ino != self.inode or st.st_size < self.offset:
+                generation = self.generation
+                self._reset()
+                self.generation = generation + 1
+                self.reloads += 1
+                self.inode = st.st_ino
+
+            if st.st_size == self.offset:
+                return
+
+            with open(self.log_file, mode="rb") as f:
+                f.seek(self.offset)
+                chunk = f.read(st.st_size - self.offset)
+
+            # Only consume complete lines; a partial write is picked up later
+            end = chunk.rfind(b"\n")
+            if end < 0:
+                return
+            self.offset += end + 1
+
+            reader = csv.reader(io.StringIO(chunk[:end + 1].decode("utf-8")))
+            if self.header is None:
+                self.header = next(reader, None)
+                # Rows from older schema versions are served in the current one
+                self.upgrade = row_upgrader(self.header or [])
+
+            changed = False
+            for values in reader:
+                if values:
+                    self._insert(values)
+                    changed = True
+
+            if changed:
+                self.generation += 1
+
+    def _insert(self, values: list[str]):
+        row = {
+            col: parse_value(col, val)
+            for col, val in zip(
+                SCHEMAS[CURRENT_SCHEMA_VERSION], self.upgrade(values)
+            )
+        }
+        pair = (row.get("pair_address") or "").lower()
+        ts = row.get("timestamp_utc") or ""
+
+        timestamps = self.timestamps.setdefault(pair, [])
+        rows = self.rows.setdefault(pair, [])
+
+        # Appends are chronological; backfills are inserted in place
+        if not timestamps or ts >= timestamps[-1]:
+            timestamps.append(ts)
+            rows.append(row)
+        else:
+            pos = bisect.bisect_right(timestamps, ts)
+            timestamps.insert(pos, ts)
+            rows.insert(pos, row)
+
+        self.versions[pair] = self.versions.get(pair, 0) + 1
+
+    # --- Queries (call refresh() first) ---
+
+    def pairs(self) -> list[str]:
+        return sorted(self.rows)
+
+    def latest(self, pair: str | None = None):
+        if pair is not None:
+            rows = self.rows.get(pair.lower())
+            return rows[-1] if rows else None
+        return {p: rows[-1] for p, rows in self.rows.items() if rows}
+
+    def range(self, pair: str, start: str | None, end: str | None) -> list[dict]:
+        pair = pair.lower()
+        timestamps = self.timestamps.get(pair, [])
+        rows = self.rows.get(pair, [])
+
+        lo = bisect.bisect_left(timestamps, start) if start else 0
+        hi = bisect.bisect_right(timestamps, end) if end else len(timestamps)
+        return rows[lo:hi]
+
+    def etag(self, pair: str | None = None, extra: str = "") -> str:
+        log = f"i{self.inode or 0:x}-r{self.reloads}"
+        if pair is None:
+            return f'"{log}-g{self.generation}{extra}"'
+        return f'"{log}-v{self.versions.get(pair.lower(), 0)}{extra}"'
+
+
+# =========================
+# HTTP Handler
+# =========================
+
+def make_handler(index: ObservationIndex):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def do_GET(self):
+            index.refresh()
+
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            fmt = query.get("format", "json")
+
+            with index.lock:
+                if parts == ["pairs"]:
+                    etag = index.etag(extra=f"-{fmt}")
+                    body = index.pairs()
+                elif parts == ["latest"]:
+                    etag = index.etag(extra=f"-{fmt}")
+                    body = index.latest()
+                elif len(parts) == 2 and parts[0] == "latest":
+                    etag = index.etag(parts[1], f"-{fmt}")
+                    body = index.latest(parts[1])
+                    if body is None:
+                        return self.send_error(404, "Unknown pair")
+                elif len(parts) == 2 and parts[0] == "range":
+                    start, end = query.get("start"), query.get("end")
+                    etag = index.etag(parts[1], f"-{start}-{end}-{fmt}")
+                    body = index.range(parts[1], start, end)
+                else:
+                    return self.send_error(404, "Unknown endpoint")
+
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            if fmt == "arrow":
+                if pa is None:
+                    return self.send_error(406, "pyarrow is not installed")
+                if isinstance(body, dict) and "pair_address" in body:
+                    rows = [body]
+                elif isinstance(body, dict):
+                    rows = list(body.values())
+                elif body and not isinstance(body[0], dict):
+                    rows = [{"pair_address": p} for p in body]
+                else:
+                    rows = body
+                table = pa.Table.from_pylist(rows)
+                sink = io.BytesIO()
+                with pa_ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                payload = sink.getvalue()
+                content_type = "application/vnd.apache.arrow.stream"
+            else:
+                payload = json.dumps(body).encode("utf-8")
+                content_type = "application/json"
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def serve(host: str = API_HOST, port: int = API_PORT, log_file: str = LEM_LOG_FILE):
+    """
+    Load the index and serve until interrupted.
+    """
+    index = ObservationIndex(log_file)
+    index.refresh()
+
+    server = ThreadingHTTPServer((host, port), make_handler(index))
+    print(f"LEM read API on http://{host}:{port} ({len(index.pairs())} pairs)")
+    print("Press Ctrl+C to stop.\n")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,233 @@
+"""
+LEM v1.3 — Cross-Pair LEM Index
+------------------------------
+One aggregate record per observation cycle across all tracked pairs.
+
+Index:
+- Market-cap-weighted LEM = Σ(MCᵢ × LEMᵢ) / Σ MCᵢ
+- Median and distribution percentiles of LEM
+
+Percentiles come from a mergeable log-bucket sketch (relative-error
+quantiles), so per-shard partial indexes combine by adding bucket counts
+and sums, without revisiting any observation.
+
+This module contains NO RPC calls and NO trading logic.
+"""
+
+import os
+import csv
+import json
+import math
+import argparse
+from collections import defaultdict
+
+import numpy as np
+
+from config import (
+    CHAIN,
+    LEM_INDEX_FILE,
+    LEM_INDEX_PERCENTILES,
+    SKETCH_RELATIVE_ACCURACY,
+)
+from storage import append_index_row, observation_slot
+
+
+# =========================
+# Quantile Sketch
+# =========================
+
+class QuantileSketch:
+    """
+    Log-bucketed histogram with relative accuracy `alpha` for positive
+    values. Mergeable: merging two sketches adds their bucket counts.
+    """
+
+    __slots__ = ("alpha", "_log_gamma", "buckets", "count")
+
+    def __init__(self, alpha: float = SKETCH_RELATIVE_ACCURACY):
+        self.alpha = alpha
+        self._log_gamma = math.log((1 + alpha) / (1 - alpha))
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+
+    def add_many(self, values) -> "QuantileSketch":
+        """
+        Add an array of values in one vectorized pass (non-positive and
+        non-finite values are ignored).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values) & (values > 0)]
+        if values.size == 0:
+            return self
+
+        keys = np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+        uniq, counts = np.unique(keys, return_counts=True)
+        for key, n in zip(uniq.tolist(), counts.tolist()):
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.count += int(values.size)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.alpha != self.alpha:
+            raise ValueError("Cannot merge sketches with different accuracy")
+
+        for key, n in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.count += other.count
+        return self
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Value at quantile q (0..1), within relative error alpha.
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Bucket midpoint in relative terms
+                return 2 * math.exp(key * self._log_gamma) / (
+                    1 + math.exp(self._log_gamma)
+                )
+        return None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"alpha": self.alpha, "buckets": self.buckets},
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "QuantileSketch":
+        data = json.loads(payload)
+        sketch = cls(data["alpha"])
+        sketch.buckets = {int(k): int(v) for k, v in data["buckets"].items()}
+        sketch.count = sum(sketch.buckets.values())
+        return sketch
+
+
+# =========================
+# Index Computation
+# =========================
+
+def _finalize(pairs: int, sum_mc: float, sum_mc_lem: float, sketch: QuantileSketch) -> dict:
+    row = {
+        "pairs": pairs,
+        "total_market_cap_usd": sum_mc,
+        "sum_mc_lem": sum_mc_lem,
+        "cap_weighted_lem": sum_mc_lem / sum_mc if sum_mc > 0 else None,
+        "sketch": sketch.to_json(),
+    }
+    for p in LEM_INDEX_PERCENTILES:
+        row[f"lem_p{p}"] = sketch.quantile(p / 100)
+    return row
+
+
+def compute_index(market_caps, lems) -> dict:
+    """
+    Compute the cycle index from per-pair MC and LEM values.
+
+    Returns:
+        dict keyed by storage.INDEX_CSV_HEADER columns (without timestamp
+        and chain)
+    """
+    mc = np.asarray(market_caps, dtype=np.float64)
+    lem = np.asarray(lems, dtype=np.float64)
+
+    valid = np.isfinite(mc) & np.isfinite(lem) & (mc > 0) & (lem > 0)
+    mc, lem = mc[valid], lem[valid]
+
+    return _finalize(
+        int(mc.size),
+        float(mc.sum()),
+        float((mc * lem).sum()),
+        QuantileSketch().add_many(lem),
+    )
+
+
+def record_index(
+    market_caps,
+    lems,
+    chain: str | None = CHAIN,
+    log_file: str | None = None,
+    cycle_id: str | None = None,
+) -> dict | None:
+    """
+    Compute and append the cycle index. Returns the row, or None if the
+    cycle produced no observations.
+
+    Sharded runs pass the run's `cycle_id` so that their segments merge
+    into one row even when shards finish in different slots.
+    """
+    if len(market_caps) == 0:
+        return None
+
+    row = compute_index(market_caps, lems)
+    append_index_row(row, chain=chain, log_file=log_file, cycle_id=cycle_id)
+    return row
+
+
+# =========================
+# Sharded Runs
+# =========================
+
+def merge_index_segments(segment_paths: list[str], log_file: str = LEM_INDEX_FILE) -> int:
+    """
+    Combine per-shard partial index rows into one row per cycle.
+
+    Rows are grouped by (chain, cycle_id); rows without a cycle_id fall
+    back to their observation slot. Pair counts and sums are added and
+    sketches merged. Returns the number of rows appended.
+    """
+    groups = defaultdict(lambda: {
+        "timestamp_utc": None,
+        "cycle_id": None,
+        "pairs": 0,
+        "sum_mc": 0.0,
+        "sum_mc_lem": 0.0,
+        "sketch": QuantileSketch(),
+    })
+
+    for path in segment_paths:
+        with open(path, mode="r", newline="") as f:
+            for row in csv.DictReader(f):
+                cycle = row.get("cycle_id") or observation_slot(row["timestamp_utc"])
+                key = (row["chain"], cycle)
+                group = groups[key]
+                group["cycle_id"] = row.get("cycle_id") or None
+                group["timestamp_utc"] = max(
+                    group["timestamp_utc"] or "", row["timestamp_utc"]
+                )
+                group["pairs"] += int(row["pairs"])
+                group["sum_mc"] += float(row["total_market_cap_usd"])
+                group["sum_mc_lem"] += float(row["sum_mc_lem"])
+                group["sketch"].merge(QuantileSketch.from_json(row["sketch"]))
+
+    for (chain, _), group in sorted(groups.items(), key=lambda kv: kv[1]["timestamp_utc"]):
+        append_index_row(
+            _finalize(
+                group["pairs"], group["sum_mc"],
+                group["sum_mc_lem"], group["sketch"],
+            ),
+            chain=chain,
+            timestamp_override=group["timestamp_utc"],
+            log_file=log_file,
+            cycle_id=group["cycle_id"],
+        )
+
+    return len(groups)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge shard LEM index segments.")
+    parser.add_argument("segments", nargs="+", metavar="SEGMENT")
+    args = parser.parse_args()
+
+    paths = [p for p in args.segments if os.path.exists(p)]
+    n = merge_index_segments(paths)
+    for path in paths:
+        os.remove(path)
+    print(f"Merged {len(paths)} index segments into {n} cycle rows.")
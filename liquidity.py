@@ -7,12 +7,14 @@ Responsibilities:
 - Identify which reserve is the native asset
 - Normalize reserves using token decimals
 - Compute Native Liquidity (LPₙ) in USD
+- Provide a single-read reserve snapshot per pool
 
 No market cap, no ratios, no trading logic.
 """
 
 from web3 import Web3
 from config import NATIVE_ASSET_ADDRESS
+from errors import NonNativePairError
 from chain import (
     get_pair_tokens,
     get_pair_reserves,
@@ -37,7 +39,7 @@ def identify_native_side(pair_address: str) -> dict:
         }
 
     Raises:
-        ValueError if native asset is not part of the pair.
+        NonNativePairError if native asset is not part of the pair.
     """
     token0, token1 = get_pair_tokens(pair_address)
 
@@ -57,7 +59,7 @@ def identify_native_side(pair_address: str) -> dict:
             "token1": token1,
         }
 
-    raise ValueError(
+    raise NonNativePairError(
         "Native asset not found in this pair (not a token/native pool)."
     )
 
@@ -74,7 +76,7 @@ def get_native_reserve(pair_address: str) -> float:
         float: Native reserve amount (e.g., WBNB quantity, not USD)
 
     Raises:
-        ValueError if native asset is not part of the pair.
+        NonNativePairError if native asset is not part of the pair.
     """
     side = identify_native_side(pair_address)
     reserves = get_pair_reserves(pair_address)
@@ -92,10 +94,59 @@ def get_native_reserve(pair_address: str) -> float:
     return float(native_reserve)
 
 
+# =========================
+# Reserve Snapshot
+# =========================
+
+def get_pool_snapshot(pair_address: str, reserves: dict | None = None) -> dict:
+    """
+    Read any pool once (native or not) and return both normalized
+    reserves by token position. Used by the multi-hop pricing graph.
+
+    Args:
+        pair_address: AMM pair address
+        reserves: already-read get_pair_reserves() output (optional)
+
+    Returns:
+        {
+            "token0": str,
+            "token1": str,
+            "reserve0": float,
+            "reserve1": float,
+            "block_timestamp_last": int
+        }
+    """
+    token0, token1 = get_pair_tokens(pair_address)
+    if reserves is None:
+        reserves = get_pair_reserves(pair_address)
+
+    return {
+        "token0": token0,
+        "token1": token1,
+        "reserve0": float(
+            normalize_reserve(reserves["reserve0"], get_token_decimals(token0))
+        ),
+        "reserve1": float(
+            normalize_reserve(reserves["reserve1"], get_token_decimals(token1))
+        ),
+        "block_timestamp_last": reserves["timestamp"],
+    }
+
+
 # =========================
 # LPₙ Calculation
 # =========================
 
+def lp_native_usd_from_reserve(native_reserve: float, native_price_usd: float) -> float:
+    """
+    LPₙ = Reserveₙ × Priceₙ(USD), from an already-read native reserve.
+    """
+    if native_price_usd <= 0:
+        raise ValueError("native_price_usd must be > 0")
+
+    return float(native_reserve * float(native_price_usd))
+
+
 def calculate_lp_native_usd(pair_address: str, native_price_usd: float) -> float:
     """
     Calculate Native Liquidity (LPₙ) in USD.
@@ -113,6 +164,5 @@ def calculate_lp_native_usd(pair_address: str, native_price_usd: float) -> float
         raise ValueError("native_price_usd must be > 0")
 
     native_reserve = get_native_reserve(pair_address)
-    lp_native_usd = native_reserve * float(native_price_usd)
 
-    return float(lp_native_usd)
\ No newline at end of file
+    return lp_native_usd_from_reserve(native_reserve, native_price_usd)
\ No newline at end of file
@@ -0,0 +1,341 @@
+"""
+LEM Phase D — Per-Block Live Observation
+----------------------------------------
+Observes a watchlist on every block instead of every
+OBSERVATION_INTERVAL. Intended for fresh launches, where minutes
+between samples hide most of the liquidity story.
+
+Pipeline (asyncio, one WebSocket connection, bounded queues):
+1. heads:   newHeads subscription → (block number, timestamp)
+2. blocks:  one eth_getLogs for the Sync events of all watched pairs
+            over the new blocks, paced by the shared RPC budget
+            (governor.py); reserves come from the Sync data, and only
+            pairs with a Sync in a block are recomputed
+3. writer:  batched appends to LIVE_LOG_FILE (no slot deduplication)
+
+Every queue is bounded: a slow writer blocks the processor, a slow
+processor blocks the head reader, and heads queued meanwhile are
+coalesced into a single catch-up eth_getLogs range.
+
+Static inputs (tokens, decimals, supply, metadata) are read once at
+startup over HTTP (chain.py); native price and supply are refreshed on
+their own cadence between blocks.
+
+No trading logic. No alerts. Observation only.
+"""
+
+import asyncio
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+
+from web3 import AsyncWeb3, WebSocketProvider
+
+from abi import SYNC_TOPIC
+from config import (
+    CHAIN,
+    RPC_WS_URL,
+    LIVE_LOG_FILE,
+    LIVE_HEAD_QUEUE_SIZE,
+    LIVE_WRITE_QUEUE_SIZE,
+    LIVE_MAX_BLOCK_RANGE,
+    LIVE_PRICE_REFRESH,
+    LIVE_SUPPLY_REFRESH,
+)
+from chain import (
+    get_pair_tokens,
+    get_pair_reserves,
+    get_token_decimals,
+    get_token_metadata,
+)
+from governor import governed_async
+from price_oracle import get_native_asset_price_usd
+from lem import calculate_lp_delta
+from pricing import load_pricing_paths, resolve_prices
+from supply import load_supply_cache, sync_supply, sync_exclusions
+from storage import append_observation_rows
+from observation import derive_observation
+from registry import enabled_pairs
+
+
+DATA_SOURCE = "onchain_block"
+
+# Rows per storage write
+WRITE_BATCH_SIZE = 1000
+
+
+# =========================
+# Live State
+# =========================
+
+class LiveState:
+    """
+    In-memory pools, prices and caches for the watched pairs.
+    """
+
+    def __init__(self, pairs: list[str], native_price: float | None = None):
+        self.pairs = [p.lower() for p in pairs]
+        self.fixed_price = native_price is not None
+        self.native_price = native_price
+        self.decimals = {}
+        self.pools = {}
+        self.metadata = {}
+        self.supply = load_supply_cache()
+        self.path_cache = load_pricing_paths()
+        self.prices = {}
+        self.last_lp = {}
+        self.price_at = 0.0
+        self.supply_at = 0.0
+
+    # Startup (blocking, HTTP)
+
+    def bootstrap(self):
+        """
+        Read tokens, decimals and current reserves of every watched pair,
+        then prime prices, supply and metadata. Unreadable pairs are
+        dropped from the watchlist.
+        """
+        if not self.fixed_price:
+            self.native_price = get_native_asset_price_usd()
+            self.price_at = time.time()
+
+        for pair in list(self.pairs):
+            try:
+                token0, token1 = get_pair_tokens(pair)
+                for token in (token0, token1):
+                    if token not in self.decimals:
+                        self.decimals[token] = get_token_decimals(token)
+                pool = {"token0": token0, "token1": token1}
+                self.pools[pair] = pool
+                reserves = get_pair_reserves(pair)
+                self.apply_sync(pair, reserves["reserve0"], reserves["reserve1"])
+            except Exception as e:
+                print(f"[WARN] Dropping pair {pair} from live watchlist: {e}")
+                self.pairs.remove(pair)
+                self.pools.pop(pair, None)
+
+        self.prices = resolve_prices(self.pools, self.native_price, self.path_cache)
+        self.refresh_supply()
+
+        for pair in self.pairs:
+            try:
+                obs = derive_observation(self.pools[pair], self.prices, self.native_price, self.supply)
+            except Exception as e:
+                print(f"[WARN] Pair {pair} not observable yet: {e}")
+                continue
+            self.metadata[pair] = get_token_metadata(obs["token_address"])
+
+        print(f"[OK] Live watchlist ready: {len(self.pairs)} pairs")
+
+    # Periodic refreshes (blocking, run between blocks)
+
+    def refresh_supply(self):
+        tokens = {
+            pool[side] for pool in self.pools.values() for side in ("token0", "token1")
+        }
+        try:
+            sync_supply(self.supply, list(tokens))
+            sync_exclusions(self.supply, list(tokens))
+        except Exception as e:
+            print(f"[WARN] Supply refresh failed: {e}")
+        self.supply_at = time.time()
+
+    def refresh_due(self):
+        now = time.time()
+        if not self.fixed_price and now - self.price_at >= LIVE_PRICE_REFRESH:
+            try:
+                self.native_price = get_native_asset_price_usd()
+            except Exception as e:
+                print(f"[WARN] Native price refresh failed, keeping last: {e}")
+            self.price_at = now
+        if now - self.supply_at >= LIVE_SUPPLY_REFRESH:
+            self.refresh_supply()
+
+    # Per block
+
+    def apply_sync(self, pair: str, raw_reserve0: int, raw_reserve1: int):
+        pool = self.pools[pair]
+        pool["reserve0"] = raw_reserve0 / (10 ** self.decimals[pool["token0"]])
+        pool["reserve1"] = raw_reserve1 / (10 ** self.decimals[pool["token1"]])
+
+    def observe(self, pairs, timestamp: int) -> list[dict]:
+        """
+        Recompute the observation rows of `pairs` after their Sync.
+
+        No RPC once every token's supply is cached; a token missing from
+        the cache is read on the spot, so callers run this off the event
+        loop.
+        """
+        self.prices = resolve_prices(self.pools, self.native_price, self.path_cache)
+        timestamp_utc = (
+            datetime.fromtimestamp(timestamp, tz=timezone.utc)
+            .replace(tzinfo=None)
+            .isoformat()
+        )
+
+        rows = []
+        for pair in pairs:
+            try:
+                obs = derive_observation(self.pools[pair], self.prices, self.native_price, self.supply)
+            except Exception as e:
+                print(f"[WARN] Skipping pair {pair} at {timestamp_utc}: {e}")
+                continue
+
+            delta = calculate_lp_delta(obs["lp_native_usd"], self.last_lp.get(pair))
+            self.last_lp[pair] = obs["lp_native_usd"]
+            meta = self.metadata.get(pair, {})
+
+            rows.append({
+                "timestamp_utc": timestamp_utc,
+                "pair_address": pair,
+                "chain": CHAIN,
+                "native_price_usd": self.native_price,
+                "native_reserve": obs["native_reserve"],
+                "lp_native_usd": obs["lp_native_usd"],
+                "token_price_usd": obs["token_price_usd"],
+                "market_cap_usd": obs["market_cap_usd"],
+                "lem": obs["lem"],
+                "lp_delta_usd": delta["delta_usd"],
+                "lp_delta_pct": delta["delta_pct"],
+                "data_source": DATA_SOURCE,
+                "token_symbol": meta.get("symbol", ""),
+                "token_name": meta.get("name", ""),
+            })
+
+        return rows
+
+
+# =========================
+# Pipeline Stages
+# =========================
+
+async def read_heads(w3, heads: asyncio.Queue):
+    """
+    Stage 1: push every new head; blocks while the queue is full.
+    """
+    await w3.eth.subscribe("newHeads")
+    async for message in w3.socket.process_subscriptions():
+        header = message["result"]
+        await heads.put((header["number"], header["timestamp"]))
+
+
+async def process_blocks(w3, live: LiveState, heads: asyncio.Queue, rows: asyncio.Queue):
+    """
+    Stage 2: turn new blocks into observation rows.
+    """
+    last = None
+    addresses = [AsyncWeb3.to_checksum_address(p) for p in live.pairs]
+
+    while True:
+        number, timestamp = await heads.get()
+        timestamps = {number: timestamp}
+
+        # Coalesce heads that queued up while the last batch ran
+        while not heads.empty():
+            n, t = heads.get_nowait()
+            timestamps[n] = t
+
+        head = max(timestamps)
+        start = head if last is None else last + 1
+        if start > head:
+            continue
+
+        for from_block in range(start, head + 1, LIVE_MAX_BLOCK_RANGE):
+            to_block = min(from_block + LIVE_MAX_BLOCK_RANGE - 1, head)
+            logs = await governed_async(lambda: w3.eth.get_logs({
+                "address": addresses,
+                "topics": [SYNC_TOPIC],
+                "fromBlock": from_block,
+                "toBlock": to_block,
+            }))
+
+            # Last Sync per pair and block holds the final reserves
+            synced: dict[int, dict] = {}
+            for log in logs:
+                data = bytes(log["data"])
+                synced.setdefault(log["blockNumber"], {})[log["address"].lower()] = (
+                    int.from_bytes(data[:32], "big"),
+                    int.from_bytes(data[32:64], "big"),
+                )
+
+            for block in sorted(synced):
+                for pair, (reserve0, reserve1) in synced[block].items():
+                    live.apply_sync(pair, reserve0, reserve1)
+                block_time = timestamps.get(block, timestamps[head])
+                observed = await asyncio.to_thread(live.observe, synced[block], block_time)
+                for row in observed:
+                    await rows.put(row)
+
+        last = head
+        await asyncio.to_thread(live.refresh_due)
+
+
+async def write_rows(rows: asyncio.Queue, log_file: str):
+    """
+    Stage 3: append rows in batches off the event loop.
+    """
+    while True:
+        batch = [await rows.get()]
+        while not rows.empty() and len(batch) < WRITE_BATCH_SIZE:
+            batch.append(rows.get_nowait())
+        await asyncio.to_thread(append_observation_rows, batch, log_file)
+
+
+async def run_live(
+    pairs: list[str] | None = None,
+    ws_url: str | None = None,
+    native_price: float | None = None,
+    log_file: str = LIVE_LOG_FILE,
+):
+    """
+    Run the per-block pipeline until cancelled or a stage fails.
+
+    Args:
+        pairs: watchlist (defaults to the enabled registry pairs)
+        ws_url: WebSocket endpoint (defaults to LEM_RPC_WS_URL or
+            RPC_WS_URL)
+        native_price: pin the native price instead of polling the
+            oracle (offline / stand-in runs)
+    """
+    live = LiveState(enabled_pairs() if pairs is None else pairs, native_price)
+    await asyncio.to_thread(live.bootstrap)
+
+    heads = asyncio.Queue(maxsize=LIVE_HEAD_QUEUE_SIZE)
+    rows = asyncio.Queue(maxsize=LIVE_WRITE_QUEUE_SIZE)
+    ws_url = ws_url or os.environ.get("LEM_RPC_WS_URL", RPC_WS_URL)
+
+    async with AsyncWeb3(WebSocketProvider(ws_url)) as w3:
+        tasks = [
+            asyncio.create_task(read_heads(w3, heads)),
+            asyncio.create_task(process_blocks(w3, live, heads, rows)),
+            asyncio.create_task(write_rows(rows, log_file)),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Flush rows still queued for the writer
+            pending = []
+            while not rows.empty():
+                pending.append(rows.get_nowait())
+            append_observation_rows(pending, log_file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Observe pairs on every block.")
+    parser.add_argument("--pairs", nargs="+", help="watchlist (default: enabled registry pairs)")
+    parser.add_argument("--ws", help="WebSocket RPC URL")
+    parser.add_argument("--native-price", type=float, help="pin the native price (USD)")
+    parser.add_argument("--log-file", default=LIVE_LOG_FILE)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_live(args.pairs, args.ws, args.native_price, args.log_file))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,454 @@
+"""
+LEM Phase D — ΔLPₙ Attribution (Mint / Burn / Swap)
+---------------------------------------------------
+lem.calculate_lp_delta says that LPₙ moved; this module says why. Each
+change in LPₙ between two consecutive observations of a pair is split
+into:
+
+- added:        Mint events (liquidity added)
+- removed:      Burn events (liquidity pulled; rug-pull territory)
+- traded:       Swap events (net quote flow of buys and sells)
+- price effect: the remainder, i.e. revaluation of the quote reserve
+
+Fetching:
+- One eth_getLogs per block range and address batch for all tracked
+  pairs, with topic0 filtered on Mint | Burn | Swap | Sync
+- Logs stay raw JSON (no web3 result formatting or contract objects);
+  ranges the RPC rejects are halved until they fit
+
+Decoding:
+- Data words of every event type are stacked into one byte matrix and
+  converted with a single NumPy product, so the per-log Python work is
+  limited to reading the block number and address
+- Flows are taken on the quote side of the pair (the side LPₙ is
+  measured on); the last Sync of a window gives the quote reserve used
+  to convert them to USD at the window's closing LPₙ
+
+Windows are the intervals between consecutive observations in the
+observation log; only windows fully inside the fetched block range are
+written. Block times come from the logs' blockTimestamp field where the
+node provides it, otherwise they are interpolated between the range's
+first and last block.
+
+No trading logic. Observation only.
+"""
+
+import argparse
+from datetime import datetime, timezone
+
+import numpy as np
+
+from abi import MINT_TOPIC, BURN_TOPIC, SWAP_TOPIC, SYNC_TOPIC
+from config import (
+    CHAIN,
+    LEM_LOG_FILE,
+    LP_ATTRIBUTION_FILE,
+    LP_EVENT_BLOCK_RANGE,
+    LP_EVENT_ADDRESS_BATCH,
+    LP_ATTRIBUTION_DEFAULT_BLOCKS,
+)
+from chain import (
+    get_block_number,
+    get_block_timestamp,
+    get_pair_tokens,
+    get_raw_logs,
+    get_token_decimals,
+    LogRangeTooLarge,
+)
+from pair_state import load_pair_state
+from registry import enabled_pairs
+from pricing import ANCHOR_RANK
+from storage import iter_observations, append_attribution_rows
+
+
+# Event kinds and their data width in 32-byte words
+MINT, BURN, SWAP, SYNC = range(4)
+EVENT_TOPICS = {
+    MINT_TOPIC: (MINT, 2),
+    BURN_TOPIC: (BURN, 2),
+    SWAP_TOPIC: (SWAP, 4),
+    SYNC_TOPIC: (SYNC, 2),
+}
+
+# Big-endian byte weights of one 32-byte word (256**31 fits a float64)
+WORD_WEIGHTS = 256.0 ** np.arange(31, -1, -1)
+
+
+# =========================
+# Log Fetching
+# =========================
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _fetch_range(addresses: list[str], start: int, end: int, out: list):
+    try:
+        out.extend(get_raw_logs(addresses, [list(EVENT_TOPICS)], start, end))
+    except LogRangeTooLarge:
+        # Only an oversized query is worth splitting; other errors propagate
+        if start >= end:
+            raise
+        mid = (start + end) // 2
+        _fetch_range(addresses, start, mid, out)
+        _fetch_range(addresses, mid + 1, end, out)
+
+
+def fetch_pair_events(pairs: list[str], from_block: int, to_block: int) -> list[dict]:
+    """
+    Raw Mint / Burn / Swap / Sync logs of `pairs` in [from_block, to_block].
+    """
+    logs = []
+    for start in range(from_block, to_block + 1, LP_EVENT_BLOCK_RANGE):
+        end = min(start + LP_EVENT_BLOCK_RANGE - 1, to_block)
+        for batch in _chunks(pairs, LP_EVENT_ADDRESS_BATCH):
+            _fetch_range(batch, start, end, logs)
+    return logs
+
+
+# =========================
+# Bulk Decoding
+# =========================
+
+def decode_events(logs: list[dict]) -> dict:
+    """
+    Decode raw pair logs into column arrays.
+
+    Logs with an unknown topic or a data field of the wrong length (a
+    non-V2 contract reusing the signature) are dropped.
+
+    Returns:
+        {
+            "pair": np.ndarray[object] (lowercase addresses),
+            "kind": np.ndarray[int8] (MINT / BURN / SWAP / SYNC),
+            "block": np.ndarray[int64],
+            "order": np.ndarray[int64] (block and log index, sortable),
+            "timestamp": np.ndarray[float64] (NaN if not provided),
+            "words": np.ndarray[float64] of shape (n, 4), zero padded
+        }
+    """
+    groups = {kind: [] for kind, _ in EVENT_TOPICS.values()}
+    for log in logs:
+        spec = EVENT_TOPICS.get(log["topics"][0] if log["topics"] else None)
+        if spec is not None and len(log["data"]) == 2 + 64 * spec[1]:
+            groups[spec[0]].append(log)
+
+    kept = [log for kind in sorted(groups) for log in groups[kind]]
+    n = len(kept)
+    words = np.zeros((n, 4), dtype=np.float64)
+    kinds = np.empty(n, dtype=np.int8)
+
+    row = 0
+    for kind, width in sorted(EVENT_TOPICS.values()):
+        group = groups[kind]
+        if not group:
+            continue
+        raw = bytes.fromhex("".join(log["data"][2:] for log in group))
+        matrix = np.frombuffer(raw, dtype=np.uint8).reshape(len(group), width, 32)
+        words[row:row + len(group), :width] = matrix @ WORD_WEIGHTS
+        kinds[row:row + len(group)] = kind
+        row += len(group)
+
+    block = np.fromiter((int(log["blockNumber"], 16) for log in kept), dtype=np.int64, count=n)
+    log_index = np.fromiter((int(log["logIndex"], 16) for log in kept), dtype=np.int64, count=n)
+    timestamp = np.fromiter(
+        (int(log["blockTimestamp"], 16) if log.get("blockTimestamp") else np.nan for log in kept),
+        dtype=np.float64,
+        count=n,
+    )
+
+    return {
+        "pair": np.array([log["address"].lower() for log in kept], dtype=object),
+        "kind": kinds,
+        "block": block,
+        "order": (block << 20) + log_index,
+        "timestamp": timestamp,
+        "words": words,
+    }
+
+
+def quote_flows(events: dict, quote_index: np.ndarray) -> dict:
+    """
+    Raw quote-side amounts per event.
+
+    Args:
+        quote_index: 0 or 1 per event, the quote token's position
+
+    Returns:
+        {"added", "removed", "traded", "reserve"}: float arrays, zero
+        where the event is of another kind
+    """
+    kind, words = events["kind"], events["words"]
+    rows = np.arange(len(kind))
+    amount = words[rows, quote_index]
+
+    return {
+        "added": np.where(kind == MINT, amount, 0.0),
+        "removed": np.where(kind == BURN, amount, 0.0),
+        "traded": np.where(kind == SWAP, amount - words[rows, 2 + quote_index], 0.0),
+        "reserve": np.where(kind == SYNC, amount, np.nan),
+    }
+
+
+# =========================
+# Windows
+# =========================
+
+def _epoch(timestamp: str) -> float:
+    dt = datetime.fromisoformat(timestamp)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def load_windows(pairs: list[str], start_ts: float, end_ts: float, log_file: str) -> dict:
+    """
+    Observation times and LPₙ per pair around [start_ts, end_ts].
+
+    Returns:
+        {pair: {"timestamp_utc": list[str], "epoch": np.ndarray,
+                "lp_native_usd": np.ndarray}}, sorted by time
+    """
+    series = {p: {} for p in pairs}
+    for chunk in iter_observations(
+        ["timestamp_utc", "pair_address", "lp_native_usd"], pairs=pairs, log_file=log_file
+    ):
+        for ts, pair, lp in zip(chunk["timestamp_utc"], chunk["pair_address"], chunk["lp_native_usd"]):
+            try:
+                epoch = _epoch(ts)
+            except (TypeError, ValueError):
+                continue
+            if lp is None or not (start_ts <= epoch <= end_ts):
+                continue
+            series[pair.lower()][epoch] = (ts, lp)
+
+    windows = {}
+    for pair, points in series.items():
+        epochs = sorted(points)
+        windows[pair] = {
+            "timestamp_utc": [points[e][0] for e in epochs],
+            "epoch": np.array(epochs, dtype=np.float64),
+            "lp_native_usd": np.array([points[e][1] for e in epochs], dtype=np.float64),
+        }
+    return windows
+
+
+def resolve_quotes(pairs: list[str]) -> dict:
+    """
+    Quote token of each pair: the stored observation side where known,
+    otherwise the preferred anchor. Pairs without either are omitted.
+
+    Returns:
+        {pair: {"quote_address": str, "quote_index": int, "decimals": int}}
+    """
+    states = load_pair_state()
+    decimals = {}
+    quotes = {}
+
+    for pair in pairs:
+        state = states.get(pair)
+        try:
+            if state and "token0" in state:
+                token0, token1 = state["token0"].lower(), state["token1"].lower()
+                base = state["token_address"].lower()
+                quote = token1 if base == token0 else token0
+            else:
+                token0, token1 = (t.lower() for t in get_pair_tokens(pair))
+                ranked = [t for t in (token0, token1) if t in ANCHOR_RANK]
+                if not ranked:
+                    print(f"[WARN] No quote side known for pair {pair}, skipped")
+                    continue
+                quote = min(ranked, key=ANCHOR_RANK.get)
+
+            if quote not in decimals:
+                decimals[quote] = get_token_decimals(quote)
+        except Exception as e:
+            print(f"[WARN] Could not resolve quote side of pair {pair}: {e}")
+            continue
+
+        quotes[pair] = {
+            "quote_address": quote,
+            "quote_index": 0 if quote == token0 else 1,
+            "decimals": decimals[quote],
+        }
+
+    return quotes
+
+
+# =========================
+# Attribution
+# =========================
+
+def attribute_windows(
+    events: dict,
+    flows: dict,
+    times: np.ndarray,
+    quotes: dict,
+    windows: dict,
+) -> list[dict]:
+    """
+    Sum event flows into each pair's observation windows.
+
+    An event at time t belongs to the window (t_prev, t_next]. Windows
+    whose flows need a quote reserve but saw no Sync get empty USD
+    columns.
+
+    Args:
+        times: Unix time per event
+        quotes: resolve_quotes() output
+        windows: load_windows() output
+
+    Returns:
+        rows keyed by storage.LP_ATTRIBUTION_CSV_HEADER
+    """
+    rows = []
+    sort = np.argsort(events["order"], kind="stable")
+    pair_col = events["pair"][sort]
+    kind_col = events["kind"][sort]
+    time_col = times[sort]
+    flow_cols = {name: values[sort] for name, values in flows.items()}
+
+    for pair, quote in quotes.items():
+        window = windows.get(pair)
+        if window is None or len(window["epoch"]) < 2:
+            continue
+
+        epochs = window["epoch"]
+        size = len(epochs)
+        mask = pair_col == pair
+        idx = np.searchsorted(epochs, time_col[mask], side="left")
+        inside = (idx > 0) & (idx < size)
+        idx = idx[inside]
+        kinds = kind_col[mask][inside]
+
+        def total(name):
+            return np.bincount(idx, weights=flow_cols[name][mask][inside], minlength=size)
+
+        def count(kind):
+            return np.bincount(idx[kinds == kind], minlength=size)
+
+        scale = 10.0 ** quote["decimals"]
+        added, removed, traded = total("added") / scale, total("removed") / scale, total("traded") / scale
+        mints, burns, swaps = count(MINT), count(BURN), count(SWAP)
+
+        # Last Sync per window (events are in chain order)
+        reserve = np.full(size, np.nan)
+        synced = kinds == SYNC
+        sync_idx = idx[synced][::-1]
+        sync_reserve = flow_cols["reserve"][mask][inside][synced][::-1]
+        last_idx, first = np.unique(sync_idx, return_index=True)
+        reserve[last_idx] = sync_reserve[first] / scale
+
+        lp = window["lp_native_usd"]
+        for i in range(1, size):
+            lp_delta = lp[i] - lp[i - 1]
+            flowed = added[i] or removed[i] or traded[i]
+            usd_per_quote = lp[i] / reserve[i] if reserve[i] > 0 else None
+
+            if not flowed:
+                added_usd = removed_usd = traded_usd = 0.0
+            elif usd_per_quote is not None:
+                added_usd = added[i] * usd_per_quote
+                removed_usd = removed[i] * usd_per_quote
+                traded_usd = traded[i] * usd_per_quote
+            else:
+                added_usd = removed_usd = traded_usd = None
+
+            rows.append({
+                "window_start_utc": window["timestamp_utc"][i - 1],
+                "window_end_utc": window["timestamp_utc"][i],
+                "pair_address": pair,
+                "chain": CHAIN,
+                "quote_address": quote["quote_address"],
+                "mints": int(mints[i]),
+                "burns": int(burns[i]),
+                "swaps": int(swaps[i]),
+                "added_quote": added[i],
+                "removed_quote": removed[i],
+                "traded_quote": traded[i],
+                "lp_native_usd_start": lp[i - 1],
+                "lp_native_usd_end": lp[i],
+                "lp_delta_usd": lp_delta,
+                "added_usd": added_usd,
+                "removed_usd": removed_usd,
+                "traded_usd": traded_usd,
+                "price_effect_usd": (
+                    None if added_usd is None
+                    else lp_delta - added_usd + removed_usd - traded_usd
+                ),
+            })
+
+    return rows
+
+
+def run_attribution(
+    pairs: list[str],
+    from_block: int | None = None,
+    to_block: int | None = None,
+    log_file: str = LEM_LOG_FILE,
+    out_file: str = LP_ATTRIBUTION_FILE,
+) -> dict:
+    """
+    Attribute ΔLPₙ of `pairs` over a block range and append the windows
+    to the side table.
+
+    Args:
+        from_block / to_block: inclusive range (defaults to the last
+            LP_ATTRIBUTION_DEFAULT_BLOCKS blocks)
+        log_file: observation log that defines the windows
+
+    Returns:
+        {"logs": int, "windows": int, "written": int}
+    """
+    pairs = [p.lower() for p in pairs]
+    to_block = get_block_number() if to_block is None else to_block
+    if from_block is None:
+        from_block = max(0, to_block - LP_ATTRIBUTION_DEFAULT_BLOCKS + 1)
+
+    quotes = resolve_quotes(pairs)
+    start_ts = float(get_block_timestamp(from_block))
+    end_ts = float(get_block_timestamp(to_block))
+
+    logs = fetch_pair_events(list(quotes), from_block, to_block)
+    events = decode_events(logs)
+
+    # Node-provided block times, else linear interpolation over the range
+    span = max(to_block - from_block, 1)
+    times = np.where(
+        np.isnan(events["timestamp"]),
+        start_ts + (events["block"] - from_block) * (end_ts - start_ts) / span,
+        events["timestamp"],
+    )
+
+    quote_index = np.array(
+        [quotes[pair]["quote_index"] for pair in events["pair"]], dtype=np.int64
+    )
+    flows = quote_flows(events, quote_index)
+    windows = load_windows(list(quotes), start_ts, end_ts, log_file)
+    rows = attribute_windows(events, flows, times, quotes, windows)
+    written = append_attribution_rows(rows, out_file)
+
+    print(
+        f"[OK] ΔLPₙ attribution: {len(logs)} logs over blocks {from_block}-{to_block}, "
+        f"{len(rows)} windows, {written} new"
+    )
+    return {"logs": len(logs), "windows": len(rows), "written": written}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split ΔLPₙ into adds, removals and trades.")
+    parser.add_argument("--pairs", nargs="+", help="pairs to attribute (default: enabled registry pairs)")
+    parser.add_argument("--from-block", type=int)
+    parser.add_argument("--to-block", type=int)
+    parser.add_argument("--log-file", default=LEM_LOG_FILE, help="observation log defining the windows")
+    parser.add_argument("--out-file", default=LP_ATTRIBUTION_FILE)
+    args = parser.parse_args()
+
+    run_attribution(
+        args.pairs or enabled_pairs(),
+        args.from_block,
+        args.to_block,
+        args.log_file,
+        args.out_file,
+    )
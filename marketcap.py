@@ -13,11 +13,30 @@ No liquidity ratios, no LEM, no deltas.
 from chain import (
     get_pair_tokens,
     get_pair_reserves,
-    get_total_supply,
+    get_raw_total_supply,
     get_token_decimals,
     normalize_reserve,
 )
 from liquidity import identify_native_side
+from supply import read_excluded_raw_balance
+
+
+def token_price_usd_from_reserves(
+    native_reserve: float,
+    token_reserve: float,
+    native_price_usd: float,
+) -> float:
+    """
+    Price_token = (Reserve_native / Reserve_token) * Price_native(USD),
+    from already-normalized reserves.
+    """
+    if native_price_usd <= 0:
+        raise ValueError("native_price_usd must be > 0")
+
+    if token_reserve <= 0:
+        raise ValueError("Token reserve must be > 0")
+
+    return float((native_reserve / token_reserve) * float(native_price_usd))
 
 
 def calculate_token_price_usd(pair_address: str, native_price_usd: float) -> float:
@@ -60,12 +79,16 @@ def calculate_token_price_usd(pair_address: str, native_price_usd: float) -> flo
     native_reserve = normalize_reserve(raw_native, native_decimals)
     token_reserve = normalize_reserve(raw_token, token_decimals)
 
-    if token_reserve <= 0:
-        raise ValueError("Token reserve must be > 0")
+    return token_price_usd_from_reserves(
+        native_reserve, token_reserve, native_price_usd
+    )
 
-    token_price_usd = (native_reserve / token_reserve) * float(native_price_usd)
 
-    return float(token_price_usd)
+def market_cap_usd_from_supply(total_supply: float, token_price_usd: float) -> float:
+    """
+    MC = Total Circulating Supply × Token Price (USD), from already-read values.
+    """
+    return float(total_supply * token_price_usd)
 
 
 def calculate_market_cap_usd(pair_address: str, native_price_usd: float) -> float:
@@ -86,8 +109,9 @@ def calculate_market_cap_usd(pair_address: str, native_price_usd: float) -> floa
     side = identify_native_side(pair_address)
     token_address = side["token1"] if side["native_is_token0"] else side["token0"]
 
-    total_supply = get_total_supply(token_address)
-
-    market_cap = total_supply * token_price_usd
+    # In "circulating" mode (config.SUPPLY_MODE) excluded holder
+    # balances are subtracted, read in one batched call
+    raw_supply = get_raw_total_supply(token_address) - read_excluded_raw_balance(token_address)
+    total_supply = normalize_reserve(max(raw_supply, 0), get_token_decimals(token_address))
 
-    return float(market_cap)
\ No newline at end of file
+    return market_cap_usd_from_supply(total_supply, token_price_usd)
\ No newline at end of file
@@ -0,0 +1,284 @@
+"""
+LEM v1.3 — Observation Log Deduplication & Shard Merge
+------------------------------------------------------
+Maintenance tool that removes duplicate observations from an existing log
+and merges per-shard segments (engine_once.py --shard i/N) into it.
+
+Duplicates are resolved on the canonical observation key:
+- Identical keys (chain, pair_address, slot, data_source) keep the first row
+- Overlapping sources for the same (chain, pair_address, slot) keep the
+  highest-priority source (DATA_SOURCE_PRIORITY, onchain_live first)
+
+Slots are DEDUP_SLOT_SECONDS wide, or a registry pair's interval if it
+is observed more often (storage.dedup_slot_seconds).
+
+The log is processed in two streaming passes and published atomically.
+Shard segments are k-way merged in time order and appended to the log.
+Per-pair JSON record files from shards are merged newest-record-wins.
+No calculations, no interpretation.
+"""
+
+import os
+import csv
+import heapq
+import argparse
+import tempfile
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+from config import LEM_LOG_FILE, DATA_SOURCE_PRIORITY
+from registry import pair_slot_seconds
+from storage import (
+    dedup_slot_seconds,
+    ensure_storage,
+    load_key_index,
+    merge_records,
+    row_observation_key,
+    invalidate_key_index,
+)
+
+
+def source_rank(data_source: str) -> int:
+    """
+    Rank a data_source label; lower is better. Unknown labels rank last.
+    """
+    try:
+        return DATA_SOURCE_PRIORITY.index(data_source)
+    except ValueError:
+        return len(DATA_SOURCE_PRIORITY)
+
+
+def _row_key(row: dict, slot_seconds: dict[str, int]) -> tuple:
+    pair = (row.get("pair_address") or "").lower()
+    return row_observation_key(row, slot_seconds.get(pair, dedup_slot_seconds()))
+
+
+def dedupe_log(log_file: str = LEM_LOG_FILE, slot_seconds: dict | None = None) -> dict:
+    """
+    Deduplicate an observation log in place.
+
+    Pass 1 records the best source rank per (chain, pair_address, slot).
+    Pass 2 streams rows into a temporary file, keeping only the first row
+    of the best-ranked source per key, then atomically replaces the log.
+
+    Args:
+        slot_seconds: {pair: slot width} (defaults to pair_slot_seconds())
+
+    Returns:
+        {
+            "rows_in": int,
+            "rows_out": int,
+            "dropped": int
+        }
+    """
+    if not os.path.exists(log_file):
+        return {"rows_in": 0, "rows_out": 0, "dropped": 0}
+
+    slot_seconds = pair_slot_seconds() if slot_seconds is None else slot_seconds
+
+    # --- Pass 1: best source per observation slot ---
+    best_rank: dict[tuple, int] = {}
+
+    with open(log_file, mode="r", newline="") as f:
+        for row in csv.DictReader(f):
+            chain, pair, slot, source = _row_key(row, slot_seconds)
+            rank = source_rank(source)
+            slot_key = (chain, pair, slot)
+            if rank < best_rank.get(slot_key, len(DATA_SOURCE_PRIORITY) + 1):
+                best_rank[slot_key] = rank
+
+    # --- Pass 2: stream surviving rows into a temp file ---
+    rows_in = 0
+    rows_out = 0
+    written: set[tuple] = set()
+
+    directory = os.path.dirname(log_file) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+    try:
+        with open(log_file, mode="r", newline="") as src, \
+                os.fdopen(fd, mode="w", newline="") as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+
+            header = next(reader, None)
+            if header is None:
+                return {"rows_in": 0, "rows_out": 0, "dropped": 0}
+            writer.writerow(header)
+
+            for values in reader:
+                rows_in += 1
+                row = dict(zip(header, values))
+                key = _row_key(row, slot_seconds)
+                chain, pair, slot, source = key
+
+                if source_rank(source) != best_rank[(chain, pair, slot)]:
+                    continue
+                if key in written:
+                    continue
+
+                written.add(key)
+                writer.writerow(values)
+                rows_out += 1
+
+        os.replace(tmp_path, log_file)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    invalidate_key_index(log_file)
+
+    return {
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "dropped": rows_in - rows_out,
+    }
+
+
+def _time_order_key(row: dict) -> float:
+    """
+    Sort key for time-ordered merging; unparseable timestamps sort first.
+    """
+    try:
+        dt = datetime.fromisoformat(row.get("timestamp_utc") or "")
+    except ValueError:
+        return float("-inf")
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def merge_shards(
+    segment_paths: list[str],
+    log_file: str = LEM_LOG_FILE,
+    remove_segments: bool = True,
+    slot_seconds: dict | None = None,
+) -> dict:
+    """
+    Merge shard output segments into the canonical log in time order.
+
+    Works for the canonical log and for side tables keyed by
+    (timestamp_utc, pair_address, chain).
+
+    Each segment is already time-ordered (append-only), so a streaming
+    k-way merge is sufficient. Rows whose observation key already exists
+    in the canonical log (its persistent key index) are skipped.
+
+    Args:
+        slot_seconds: {pair: slot width} (defaults to pair_slot_seconds())
+
+    Returns:
+        {
+            "segments": int,
+            "rows_in": int,
+            "rows_out": int,
+            "dropped": int
+        }
+    """
+    segment_paths = [p for p in segment_paths if os.path.exists(p)]
+
+    if not segment_paths:
+        return {"segments": 0, "rows_in": 0, "rows_out": 0, "dropped": 0}
+
+    # A missing target inherits the header of the first segment
+    if not os.path.exists(log_file):
+        with open(segment_paths[0], mode="r", newline="") as f:
+            header = next(csv.reader(f))
+        ensure_storage(log_file, header)
+
+    slot_seconds = pair_slot_seconds() if slot_seconds is None else slot_seconds
+    index = load_key_index(log_file)
+
+    with open(log_file, mode="r", newline="") as f:
+        header = next(csv.reader(f))
+
+    rows_in = 0
+    rows_out = 0
+
+    with ExitStack() as stack, open(log_file, mode="a", newline="") as dst:
+        readers = [
+            csv.DictReader(stack.enter_context(open(p, mode="r", newline="")))
+            for p in segment_paths
+        ]
+        writer = csv.writer(dst)
+
+        for row in heapq.merge(*readers, key=_time_order_key):
+            rows_in += 1
+            key = (
+                row.get("chain"), row.get("pair_address"),
+                row.get("timestamp_utc"), row.get("data_source"),
+            )
+            pair = (row.get("pair_address") or "").lower()
+            if index.contains(*key, slot_seconds.get(pair, dedup_slot_seconds())):
+                continue
+
+            index.add(*key)
+            writer.writerow([row.get(col) or "" for col in header])
+            rows_out += 1
+
+    index.commit()
+
+    if remove_segments:
+        for path in segment_paths:
+            os.remove(path)
+
+    return {
+        "segments": len(segment_paths),
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "dropped": rows_in - rows_out,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Deduplicate the LEM log or merge shard segments into it."
+    )
+    parser.add_argument(
+        "--shards",
+        nargs="+",
+        metavar="SEGMENT",
+        help="shard segment files to merge into the canonical log",
+    )
+    parser.add_argument(
+        "--records",
+        nargs="+",
+        metavar="SHARD_FILE",
+        help="per-pair JSON record files to merge into --log-file",
+    )
+    parser.add_argument(
+        "--log-file",
+        default=LEM_LOG_FILE,
+        help="target file (canonical log, side table or record file)",
+    )
+    parser.add_argument(
+        "--keep-segments",
+        action="store_true",
+        help="do not delete shard segments after merging",
+    )
+    args = parser.parse_args()
+
+    if args.records:
+        paths = [p for p in args.records if os.path.exists(p)]
+        records = merge_records(paths, args.log_file)
+        print(f"Merged {len(paths)} record files into {args.log_file} "
+              f"({len(records)} pairs).")
+    elif args.shards:
+        stats = merge_shards(
+            args.shards,
+            log_file=args.log_file,
+            remove_segments=not args.keep_segments,
+        )
+        print(
+            f"Merged {stats['segments']} segments into {args.log_file}: "
+            f"{stats['rows_in']} rows in, {stats['rows_out']} rows out, "
+            f"{stats['dropped']} duplicates dropped."
+        )
+    else:
+        stats = dedupe_log(args.log_file)
+        print(
+            f"Deduplicated {args.log_file}: "
+            f"{stats['rows_in']} rows in, {stats['rows_out']} rows out, "
+            f"{stats['dropped']} dropped."
+        )
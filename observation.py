@@ -0,0 +1,76 @@
+"""
+LEM Phase D — Observation Derivation
+------------------------------------
+Turns one pool snapshot and the cycle's graph prices into an observation.
+Shared by the cron engine (engine_once.py) and the per-block live mode
+(live.py).
+
+Responsibilities:
+- Split a pool into observed token and quote side
+- Derive LPₙ, token price, market cap and LEM from reserves
+
+No RPC calls except supply reads for tokens missing from the cache.
+No storage.
+"""
+
+from liquidity import lp_native_usd_from_reserve
+from marketcap import token_price_usd_from_reserves, market_cap_usd_from_supply
+from lem import calculate_lem
+from supply import get_circulating_supply
+from pricing import split_pool
+
+
+def derive_observation(pool: dict, prices: dict, native_price: float, supply: dict) -> dict:
+    """
+    Derive one pair's observation from its pool snapshot and the graph
+    prices of the cycle.
+
+    Args:
+        pool: liquidity.get_pool_snapshot() output (or stored state)
+        prices: pricing.resolve_prices() output
+        supply: loaded supply cache
+
+    Returns:
+        {
+            "token_address": str,
+            "token_reserve": float,
+            "native_reserve": float,
+            "lp_native_usd": float,
+            "token_price_usd": float,
+            "market_cap_usd": float,
+            "lem": float
+        }
+
+    Raises:
+        ValueError if the pair cannot be priced or inputs are invalid
+    """
+    side = split_pool(pool, prices)
+
+    # Quote reserve as its native-asset equivalent
+    # (identical to the native reserve for WBNB pairs)
+    quote_price = prices[side["quote_address"].lower()]["price_usd"]
+    native_reserve = side["quote_reserve"] * quote_price / native_price
+
+    # Native Liquidity (LPₙ)
+    lp_native_usd = lp_native_usd_from_reserve(native_reserve, native_price)
+
+    # Token price (USD)
+    token_price = token_price_usd_from_reserves(
+        native_reserve, side["token_reserve"], native_price
+    )
+
+    # Market cap (USD), circulating supply from the event-driven cache
+    circulating_supply = get_circulating_supply(
+        supply, side["token_address"], side["token_reserve"]
+    )
+    market_cap = market_cap_usd_from_supply(circulating_supply, token_price)
+
+    return {
+        "token_address": side["token_address"],
+        "token_reserve": side["token_reserve"],
+        "native_reserve": native_reserve,
+        "lp_native_usd": lp_native_usd,
+        "token_price_usd": token_price,
+        "market_cap_usd": market_cap,
+        "lem": calculate_lem(market_cap, lp_native_usd),
+    }
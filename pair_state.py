@@ -0,0 +1,98 @@
+"""
+LEM Phase D — Last-Known Pair State (Change Detection)
+------------------------------------------------------
+Persisted per-pair state from the previous observation, used to detect
+pairs whose reserves have not moved since the last run.
+
+Responsibilities:
+- Load / save last-known state per pair
+- Compare fresh getReserves() output against the stored state
+- Record the inputs needed to carry an observation forward without
+  re-reading tokens, decimals or metadata (supply is tracked in supply.py)
+
+No RPC calls, no calculations.
+"""
+
+import time
+
+from config import PAIR_STATE_FILE
+from storage import load_records, save_records
+
+
+def load_pair_state(path: str = PAIR_STATE_FILE) -> dict:
+    """
+    Load last-known state keyed by lowercased pair address.
+    """
+    return load_records(path)
+
+
+def save_pair_state(states: dict, path: str = PAIR_STATE_FILE):
+    """
+    Atomically write last-known pair state.
+    """
+    save_records(states, path)
+
+
+def reserves_unchanged(states: dict, pair_address: str, reserves: dict) -> bool:
+    """
+    True if getReserves() returned exactly what was stored last run.
+
+    Args:
+        reserves: output of chain.get_pair_reserves
+    """
+    state = states.get(pair_address.lower())
+    if not state or "token0" not in state:
+        return False
+
+    return (
+        state.get("block_timestamp_last") == reserves["timestamp"]
+        and state.get("reserve0") == reserves["reserve0"]
+        and state.get("reserve1") == reserves["reserve1"]
+    )
+
+
+def stored_pool(state: dict) -> dict:
+    """
+    Rebuild a liquidity.get_pool_snapshot() result from stored state.
+    """
+    return {
+        "token0": state["token0"],
+        "token1": state["token1"],
+        "reserve0": state["normalized_reserve0"],
+        "reserve1": state["normalized_reserve1"],
+        "block_timestamp_last": state["block_timestamp_last"],
+    }
+
+
+def record_pair_state(
+    states: dict,
+    pair_address: str,
+    reserves: dict,
+    pool: dict,
+    token_address: str,
+    token_symbol: str,
+    token_name: str,
+    now: float | None = None,
+):
+    """
+    Store everything needed to reproduce this observation while the
+    reserves stay unchanged.
+
+    Args:
+        reserves: output of chain.get_pair_reserves
+        pool: output of liquidity.get_pool_snapshot
+        token_address: observed (non-quote) token of the pool
+    """
+    states[pair_address.lower()] = {
+        "reserve0": reserves["reserve0"],
+        "reserve1": reserves["reserve1"],
+        "block_timestamp_last": reserves["timestamp"],
+        "token0": pool["token0"],
+        "token1": pool["token1"],
+        "normalized_reserve0": pool["reserve0"],
+        "normalized_reserve1": pool["reserve1"],
+        "token_address": token_address,
+        "token_symbol": token_symbol,
+        "token_name": token_name,
+        "updated": time.time() if now is None else now,
+    }
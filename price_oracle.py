@@ -13,6 +13,7 @@ This module must NEVER fetch token prices.
 
 import requests
 from config import COINGECKO_NATIVE_PRICE_URL
+from cassette import http_get_json
 
 
 def get_native_asset_price_usd() -> float:
@@ -26,9 +27,7 @@ def get_native_asset_price_usd() -> float:
         RuntimeError if price cannot be retrieved
     """
     try:
-        response = requests.get(COINGECKO_NATIVE_PRICE_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = http_get_json(COINGECKO_NATIVE_PRICE_URL, timeout=10)
     except requests.RequestException as e:
         raise RuntimeError(f"Failed to fetch native asset price: {e}")
 
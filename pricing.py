@@ -0,0 +1,263 @@
+"""
+LEM Phase D — Multi-Hop Pricing Graph
+-------------------------------------
+Prices tokens that are not paired with the native asset by routing
+through the tracked pools.
+
+Graph:
+- Nodes are tokens, edges are pools, weighted by current reserves
+- Anchors have known prices: the native asset (oracle) and stablecoins
+  (1.0 USD), configured in PRICING_ANCHORS
+- Each token is priced along its deepest path from an anchor: the path
+  whose shallowest hop holds the most USD on its already-priced side
+
+Paths are searched only when a token is new, a hop disappeared, or the
+cached path is older than PRICING_PATH_REFRESH. Every other cycle walks
+the cached paths with that cycle's reserves, so pricing needs no RPC
+calls beyond the one getReserves() per pool.
+
+Responsibilities:
+- Load / save cached paths
+- Deepest-path search and per-cycle price resolution
+- Split a pool into its observed (base) and quote side
+
+No RPC calls. No trading logic.
+"""
+
+import heapq
+import math
+import time
+from collections import defaultdict
+
+from config import PRICING_ANCHORS, PRICING_PATH_FILE, PRICING_PATH_REFRESH
+from storage import load_records, save_records
+
+
+ANCHORS = {token.lower(): kind for token, kind in PRICING_ANCHORS.items()}
+ANCHOR_RANK = {token: rank for rank, token in enumerate(ANCHORS)}
+
+
+# =========================
+# Persistence
+# =========================
+
+def load_pricing_paths(path: str = PRICING_PATH_FILE) -> dict:
+    """
+    Load cached paths keyed by lowercased token address.
+    """
+    return load_records(path)
+
+
+def save_pricing_paths(paths: dict, path: str = PRICING_PATH_FILE):
+    """
+    Atomically write cached paths.
+    """
+    save_records(paths, path)
+
+
+# =========================
+# Graph Helpers
+# =========================
+
+def _sides(pool: dict, from_token: str) -> tuple[str, float, float]:
+    """
+    (other token, reserve of from_token, reserve of other) for a pool.
+    """
+    if pool["token0"].lower() == from_token:
+        return pool["token1"].lower(), pool["reserve0"], pool["reserve1"]
+    return pool["token0"].lower(), pool["reserve1"], pool["reserve0"]
+
+
+def anchor_price(token: str, native_price_usd: float) -> float:
+    return native_price_usd if ANCHORS[token] == "native" else 1.0
+
+
+def find_paths(pools: dict, native_price_usd: float) -> dict:
+    """
+    Deepest path from any anchor to every token in the graph.
+
+    Max-bottleneck search: a hop's depth is the USD value of the pool's
+    reserve on the side priced first, a path's depth is its shallowest
+    hop, and tokens are settled in order of decreasing depth.
+
+    Args:
+        pools: {pair_address: liquidity.get_pool_snapshot() output}
+
+    Returns:
+        {
+            token: {
+                "path": [[pair_address, from_token], ...] (anchor first),
+                "depth_usd": float
+            }
+        }
+        Anchors and unreachable tokens are omitted.
+    """
+    adjacency = defaultdict(list)
+    for pair_address, pool in pools.items():
+        token0, token1 = pool["token0"].lower(), pool["token1"].lower()
+        adjacency[token0].append(pair_address)
+        adjacency[token1].append(pair_address)
+
+    heap = []
+    tie = 0
+    for token in ANCHORS:
+        if token in adjacency:
+            heap.append((-math.inf, tie, token, anchor_price(token, native_price_usd), []))
+            tie += 1
+    heapq.heapify(heap)
+
+    settled = {}
+    while heap:
+        neg_depth, _, token, price, path = heapq.heappop(heap)
+        if token in settled:
+            continue
+        settled[token] = {"path": path, "depth_usd": -neg_depth}
+
+        for pair_address in adjacency[token]:
+            other, reserve_in, reserve_out = _sides(pools[pair_address], token)
+            if other in settled or reserve_in <= 0 or reserve_out <= 0:
+                continue
+
+            depth = min(-neg_depth, reserve_in * price)
+            heapq.heappush(heap, (
+                -depth, tie, other,
+                price * reserve_in / reserve_out,
+                path + [[pair_address, token]],
+            ))
+            tie += 1
+
+    return {t: rec for t, rec in settled.items() if t not in ANCHORS}
+
+
+def walk_path(pools: dict, path: list, native_price_usd: float) -> tuple[float, float] | None:
+    """
+    Price a token along a cached path with the current reserves.
+
+    Returns:
+        (price_usd, depth_usd), or None if a hop is missing or empty
+    """
+    pair_address, token = path[0]
+    price = anchor_price(token, native_price_usd)
+    depth = math.inf
+
+    for pair_address, token in path:
+        pool = pools.get(pair_address)
+        if pool is None:
+            return None
+        _, reserve_in, reserve_out = _sides(pool, token)
+        if reserve_in <= 0 or reserve_out <= 0:
+            return None
+        depth = min(depth, reserve_in * price)
+        price = price * reserve_in / reserve_out
+
+    return price, depth
+
+
+# =========================
+# Per-Cycle Resolution
+# =========================
+
+def resolve_prices(
+    pools: dict,
+    native_price_usd: float,
+    cache: dict,
+    now: float | None = None,
+) -> dict:
+    """
+    USD price and path depth of every token in the graph.
+
+    Cached paths are reused while they are fresh and every hop is in
+    `pools`; otherwise all paths are searched again and `cache` is
+    updated in place. Unreachable tokens are cached with path None and
+    count as stale, so they are searched again every cycle and priced as
+    soon as a route appears.
+
+    Args:
+        pools: {pair_address: liquidity.get_pool_snapshot() output}
+        cache: loaded pricing path records
+
+    Returns:
+        {token: {"price_usd": float, "depth_usd": float}}, anchors
+        included with infinite depth; unreachable tokens omitted
+    """
+    now = time.time() if now is None else now
+
+    tokens = set()
+    for pool in pools.values():
+        tokens.add(pool["token0"].lower())
+        tokens.add(pool["token1"].lower())
+
+    def fresh(token):
+        record = cache.get(token)
+        return (
+            record is not None
+            and record["path"] is not None
+            and now - record["updated"] < PRICING_PATH_REFRESH
+            and all(pair in pools for pair, _ in record["path"])
+        )
+
+    if not all(fresh(t) for t in tokens - ANCHORS.keys()):
+        found = find_paths(pools, native_price_usd)
+        for token in tokens - ANCHORS.keys():
+            cache[token] = {
+                "path": found[token]["path"] if token in found else None,
+                "updated": now,
+            }
+
+    prices = {
+        token: {"price_usd": anchor_price(token, native_price_usd), "depth_usd": math.inf}
+        for token in tokens & ANCHORS.keys()
+    }
+
+    for token in tokens - ANCHORS.keys():
+        path = cache[token]["path"]
+        walked = walk_path(pools, path, native_price_usd) if path else None
+        if walked is not None:
+            prices[token] = {"price_usd": walked[0], "depth_usd": walked[1]}
+
+    return prices
+
+
+def split_pool(pool: dict, prices: dict) -> dict:
+    """
+    Choose the quote side of a pool and return both sides.
+
+    The quote is the preferred anchor if the pool has one, otherwise the
+    token with the deeper pricing path; the other token is observed.
+
+    Returns:
+        {
+            "token_address": str,
+            "token_reserve": float,
+            "quote_address": str,
+            "quote_reserve": float
+        }
+
+    Raises:
+        ValueError if neither side can be priced
+    """
+    token0, token1 = pool["token0"].lower(), pool["token1"].lower()
+
+    def rank(token):
+        if token in ANCHOR_RANK:
+            return (0, ANCHOR_RANK[token])
+        if token in prices:
+            return (1, -prices[token]["depth_usd"])
+        return (2, 0)
+
+    if rank(token0) <= rank(token1):
+        quote, quote_reserve = pool["token0"], pool["reserve0"]
+        base, base_reserve = pool["token1"], pool["reserve1"]
+    else:
+        quote, quote_reserve = pool["token1"], pool["reserve1"]
+        base, base_reserve = pool["token0"], pool["reserve0"]
+
+    if quote.lower() not in prices:
+        raise ValueError("No pricing path from an anchor to this pair")
+
+    return {
+        "token_address": base,
+        "token_reserve": base_reserve,
+        "quote_address": quote,
+        "quote_reserve": quote_reserve,
+    }
@@ -0,0 +1,257 @@
+"""
+LEM Phase D — External Pair Registry
+------------------------------------
+Tracked pairs live in PAIR_REGISTRY_FILE instead of code, so adding,
+pausing or re-timing a pair is a data edit.
+
+File format (JSON object keyed by pair address, any case):
+
+    {
+      "0x933477eba23726ca95a957cb85dbb1957267ef85": {
+        "name": "Wiki Cat",
+        "interval": 900,
+        "labels": ["meme", "reference"],
+        "enabled": true
+      }
+    }
+
+- interval: seconds between observations (default OBSERVATION_INTERVAL);
+            intervals below DEDUP_SLOT_SECONDS narrow the pair's
+            deduplication slot to the interval, so no rows are dropped
+- labels:   free-form tags for selecting subsets
+- enabled:  false keeps the entry but stops observing it (default true)
+- other keys (e.g. name) are for readers only and are not loaded
+
+Entries are held as __slots__ records keyed by checksum address, with
+labels interned so that tens of thousands of entries share their label
+strings. Checksums are computed once per entry and reused across
+reloads. PairRegistry re-reads the file only when its mtime or size
+changes; a file that fails to parse leaves the previous entries active.
+
+Responsibilities:
+- Parse and validate registry entries
+- Hot reload on change
+- Select enabled pairs, by label, and pairs due for observation
+
+No RPC calls. No calculations.
+"""
+
+import os
+import re
+import sys
+import json
+
+from web3 import Web3
+
+from config import PAIR_REGISTRY_FILE, OBSERVATION_INTERVAL, REGISTRY_DUE_SLACK
+from storage import dedup_slot_seconds
+
+
+ADDRESS_PATTERN = re.compile(r"0x[0-9a-f]{40}")
+
+
+# =========================
+# Entries
+# =========================
+
+class PairEntry:
+    """
+    One registry entry.
+
+    address: checksum address (RPC reads)
+    pair:    lowercased address (storage and state keys)
+    """
+
+    __slots__ = ("address", "pair", "interval", "labels", "enabled")
+
+    def __init__(self, address: str, pair: str, interval: int, labels: tuple, enabled: bool):
+        self.address = address
+        self.pair = pair
+        self.interval = interval
+        self.labels = labels
+        self.enabled = enabled
+
+    def __repr__(self):
+        return (
+            f"PairEntry({self.address}, interval={self.interval}, "
+            f"labels={self.labels}, enabled={self.enabled})"
+        )
+
+
+def _parse_entry(key: str, raw: dict, checksums: dict) -> PairEntry:
+    """
+    Raises:
+        ValueError on an invalid address, interval or labels
+    """
+    pair = key.strip().lower()
+    address = checksums.get(pair)
+    if address is None:
+        if not ADDRESS_PATTERN.fullmatch(pair):
+            raise ValueError(f"Invalid pair address {key!r}")
+        address = Web3.to_checksum_address(pair)
+
+    raw = raw or {}
+    interval = raw.get("interval", OBSERVATION_INTERVAL)
+    # Whole seconds: the interval is also the pair's slot width when it
+    # is below DEDUP_SLOT_SECONDS (storage.dedup_slot_seconds)
+    if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval < 1:
+        raise ValueError(f"Invalid interval {interval!r} for {key}")
+
+    labels = raw.get("labels", [])
+    if isinstance(labels, str) or not all(isinstance(label, str) for label in labels):
+        raise ValueError(f"Labels of {key} must be a list of strings")
+
+    return PairEntry(
+        address=address,
+        pair=sys.intern(pair),
+        interval=int(interval),
+        labels=tuple(sys.intern(label) for label in labels),
+        enabled=bool(raw.get("enabled", True)),
+    )
+
+
+def parse_registry(records: dict, previous: dict | None = None) -> dict:
+    """
+    Build entries from the registry file's records.
+
+    Invalid entries are reported and skipped; the rest still load.
+
+    Args:
+        previous: entries of the last load, whose checksums are reused
+
+    Returns:
+        {checksum_address: PairEntry}
+    """
+    checksums = {entry.pair: address for address, entry in (previous or {}).items()}
+    entries = {}
+
+    for key, raw in records.items():
+        try:
+            entry = _parse_entry(key, raw, checksums)
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"[WARN] Skipping registry entry {key}: {e}")
+            continue
+        entries[entry.address] = entry
+
+    return entries
+
+
+def load_registry(path: str = PAIR_REGISTRY_FILE) -> dict:
+    """
+    Load registry entries keyed by checksum address.
+
+    Raises:
+        FileNotFoundError if the registry file does not exist
+        ValueError if it is not a JSON object
+    """
+    with open(path, "r") as f:
+        records = json.load(f)
+
+    if not isinstance(records, dict):
+        raise ValueError(f"Pair registry {path} must be a JSON object")
+
+    return parse_registry(records)
+
+
+# =========================
+# Selection
+# =========================
+
+def select_pairs(entries, labels: list[str] | None = None) -> list[PairEntry]:
+    """
+    Enabled entries, optionally limited to those carrying any of `labels`.
+    """
+    wanted = set(labels) if labels else None
+    return [
+        entry for entry in entries
+        if entry.enabled and (wanted is None or wanted.intersection(entry.labels))
+    ]
+
+
+def enabled_pairs(path: str = PAIR_REGISTRY_FILE, labels: list[str] | None = None) -> list[str]:
+    """
+    Lowercased addresses of the enabled pairs in registry order.
+    """
+    return [entry.pair for entry in select_pairs(load_registry(path).values(), labels)]
+
+
+def pair_slot_seconds(path: str = PAIR_REGISTRY_FILE) -> dict[str, int]:
+    """
+    {lowercased address: deduplication slot width} of every registry
+    entry (see storage.dedup_slot_seconds), or {} if the registry file
+    does not exist.
+    """
+    try:
+        entries = load_registry(path)
+    except FileNotFoundError:
+        return {}
+    return {
+        entry.pair: dedup_slot_seconds(entry.interval)
+        for entry in entries.values()
+    }
+
+
+def is_due(entry: PairEntry, last_observed: float | None, now: float) -> bool:
+    """
+    True if a scheduled run should observe this entry.
+
+    REGISTRY_DUE_SLACK absorbs scheduler jitter so that an entry whose
+    interval equals the run cadence is observed on every run. The slack
+    is capped at half the interval, so a short interval still needs most
+    of itself to elapse (scheduled runs cannot observe a pair more often
+    than the run cadence; engine.py honours short intervals exactly).
+    """
+    if last_observed is None:
+        return True
+    slack = min(REGISTRY_DUE_SLACK, entry.interval / 2)
+    return now - last_observed >= entry.interval - slack
+
+
+# =========================
+# Hot Reload
+# =========================
+
+class PairRegistry:
+    """
+    Registry file plus its loaded entries, refreshed on change.
+    """
+
+    def __init__(self, path: str = PAIR_REGISTRY_FILE):
+        self.path = path
+        self.entries = {}
+        self._signature = None
+
+    def reload_if_changed(self) -> bool:
+        """
+        Re-read the file if its mtime or size changed since the last load.
+
+        Returns:
+            True if new entries were loaded
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self._signature is not None:
+                print(f"[WARN] Pair registry {self.path} missing, keeping last entries")
+                self._signature = None
+            return False
+
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+
+        try:
+            with open(self.path, "r") as f:
+                records = json.load(f)
+            if not isinstance(records, dict):
+                raise ValueError("registry must be a JSON object")
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Pair registry {self.path} unreadable, keeping last entries: {e}")
+            return False
+
+        self.entries = parse_registry(records, self.entries)
+        return True
+
+    def select(self, labels: list[str] | None = None) -> list[PairEntry]:
+        return select_pairs(self.entries.values(), labels)
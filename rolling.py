@@ -0,0 +1,228 @@
+"""
+LEM v1.3 — Streaming Rolling Statistics
+--------------------------------------
+Constant-memory, per-pair rolling statistics for the observation engine.
+
+Responsibilities:
+- Hold the last N values of a series in a fixed-size ring buffer
+- Update EWMA, rolling mean / variance and min / max in O(1) per value
+- Bundle per-pair state for LEM and ΔLPₙ
+
+This module contains NO I/O and NO trading logic.
+"""
+
+import math
+from array import array
+from collections import deque
+from typing import Optional
+
+from config import ROLLING_WINDOW, EWMA_ALPHA
+
+
+# =========================
+# Ring Buffer
+# =========================
+
+class RingBuffer:
+    """
+    Fixed-size, array-backed ring buffer of floats.
+    """
+
+    __slots__ = ("_data", "_size", "_head", "_count")
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError("size must be > 0")
+
+        self._data = array("d", bytes(8 * size))
+        self._size = size
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        """
+        Values currently held, in storage (not insertion) order.
+        """
+        return iter(self._data[:self._count])
+
+    @property
+    def full(self) -> bool:
+        return self._count == self._size
+
+    def push(self, value: float) -> Optional[float]:
+        """
+        Append a value, returning the evicted value once the buffer is full.
+        """
+        evicted = self._data[self._head] if self.full else None
+
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self._size
+        if not self.full:
+            self._count += 1
+
+        return evicted
+
+
+# =========================
+# Rolling Statistics
+# =========================
+
+class RollingStats:
+    """
+    Streaming statistics over the last `window` values of one series.
+
+    - EWMA over the full history (alpha = EWMA_ALPHA)
+    - Rolling mean and population variance via windowed Welford updates
+      (add / replace in place), recomputed exactly from the buffer once
+      per window so rounding error cannot accumulate
+    - Rolling min / max via monotonic queues (amortized O(1))
+    """
+
+    __slots__ = (
+        "_buffer", "_alpha", "_mean", "_m2", "_ewma",
+        "_seq", "_min_q", "_max_q",
+    )
+
+    def __init__(self, window: int = ROLLING_WINDOW, alpha: float = EWMA_ALPHA):
+        self._buffer = RingBuffer(window)
+        self._alpha = alpha
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._ewma = None
+        self._seq = 0
+        self._min_q = deque()
+        self._max_q = deque()
+
+    def update(self, value: Optional[float]):
+        """
+        Add one observation. None and non-finite values are ignored.
+        """
+        if value is None or not math.isfinite(value):
+            return
+
+        value = float(value)
+
+        evicted = self._buffer.push(value)
+        n = len(self._buffer)
+        if evicted is None:
+            delta = value - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (value - self._mean)
+        else:
+            mean = self._mean + (value - evicted) / n
+            self._m2 += (value - evicted) * (value - mean + evicted - self._mean)
+            self._mean = mean
+
+        # Once per window, replace the running moments with a two-pass
+        # recompute over the buffer
+        if self._seq % n == n - 1 and self._buffer.full:
+            self._recompute()
+
+        self._ewma = (
+            value if self._ewma is None
+            else self._alpha * value + (1 - self._alpha) * self._ewma
+        )
+
+        # Monotonic queues hold (sequence, value) for the current window
+        oldest = self._seq - len(self._buffer) + 1
+
+        while self._min_q and self._min_q[-1][1] >= value:
+            self._min_q.pop()
+        self._min_q.append((self._seq, value))
+        while self._min_q[0][0] < oldest:
+            self._min_q.popleft()
+
+        while self._max_q and self._max_q[-1][1] <= value:
+            self._max_q.pop()
+        self._max_q.append((self._seq, value))
+        while self._max_q[0][0] < oldest:
+            self._max_q.popleft()
+
+        self._seq += 1
+
+    def _recompute(self):
+        values = list(self._buffer)
+        mean = math.fsum(values) / len(values)
+        self._mean = mean
+        self._m2 = math.fsum((v - mean) ** 2 for v in values)
+
+    @property
+    def count(self) -> int:
+        return len(self._buffer)
+
+    def snapshot(self) -> dict:
+        """
+        Current statistics for the window.
+
+        Returns:
+            {
+                "count": int,
+                "ewma": float | None,
+                "mean": float | None,
+                "std": float | None,
+                "min": float | None,
+                "max": float | None
+            }
+        """
+        n = len(self._buffer)
+        if n == 0:
+            return {
+                "count": 0,
+                "ewma": None,
+                "mean": None,
+                "std": None,
+                "min": None,
+                "max": None,
+            }
+
+        variance = max(self._m2 / n, 0.0)
+
+        return {
+            "count": n,
+            "ewma": self._ewma,
+            "mean": self._mean,
+            "std": math.sqrt(variance),
+            "min": self._min_q[0][1],
+            "max": self._max_q[0][1],
+        }
+
+
+# =========================
+# Per-Pair State
+# =========================
+
+class PairState:
+    """
+    In-memory state for one tracked pair.
+    """
+
+    __slots__ = ("previous_lp_native_usd", "lem", "lp_delta_pct")
+
+    def __init__(self, window: int = ROLLING_WINDOW, alpha: float = EWMA_ALPHA):
+        self.previous_lp_native_usd = None
+        self.lem = RollingStats(window, alpha)
+        self.lp_delta_pct = RollingStats(window, alpha)
+
+    def update(self, lem_value: float, lp_native_usd: float, lp_delta_pct):
+        """
+        Feed one completed observation into the rolling statistics.
+        """
+        self.lem.update(lem_value)
+        self.lp_delta_pct.update(lp_delta_pct)
+        self.previous_lp_native_usd = lp_native_usd
+
+    def snapshot(self) -> dict:
+        """
+        Flattened statistics, keyed by ROLLING_CSV_HEADER column names.
+        """
+        out = {}
+        for prefix, stats in (
+            ("lem", self.lem),
+            ("lp_delta_pct", self.lp_delta_pct),
+        ):
+            for name, value in stats.snapshot().items():
+                out[f"{prefix}_{name}"] = value
+        return out
@@ -0,0 +1,226 @@
+"""
+LEM v1.3 — Observation Log Schema Registry & Migration
+-----------------------------------------------------
+Versioned CSV schemas for the observation log.
+
+Responsibilities:
+- Register every historical CSV header by LEM version
+- Detect a file's schema version from its header line alone
+- Upgrade rows from any registered version to the current schema
+- Rewrite a log to the current schema in one streaming pass
+  (bounded memory, atomic publish)
+
+No calculations, no interpretation.
+"""
+
+import os
+import csv
+import tempfile
+
+from config import LEM_LOG_FILE
+
+
+# =========================
+# Schema Registry
+# =========================
+
+# Columns are only ever added; rows from older versions map by name.
+# Pre-1.3 headers follow from the v1.3 storage.CSV_HEADER and the
+# columns each version added (storage.py / chart_lem.py history):
+# v1.2 lacks the Phase C.1.1 annotations, v1.0 also lacks data_source.
+SCHEMAS = {
+    # LEM v1.0 — core observation
+    "1.0": [
+        "timestamp_utc",
+        "pair_address",
+        "native_price_usd",
+        "native_reserve",
+        "lp_native_usd",
+        "token_price_usd",
+        "market_cap_usd",
+        "lem",
+        "lp_delta_usd",
+        "lp_delta_pct",
+    ],
+    # LEM v1.2 — data provenance (Phase B)
+    "1.2": [
+        "timestamp_utc",
+        "pair_address",
+        "native_price_usd",
+        "native_reserve",
+        "lp_native_usd",
+        "token_price_usd",
+        "market_cap_usd",
+        "lem",
+        "lp_delta_usd",
+        "lp_delta_pct",
+        "data_source",
+    ],
+    # LEM v1.3 — chain and token metadata annotations (Phase C.1.1)
+    "1.3": [
+        "timestamp_utc",
+        "pair_address",
+        "chain",
+        "native_price_usd",
+        "native_reserve",
+        "lp_native_usd",
+        "token_price_usd",
+        "market_cap_usd",
+        "lem",
+        "lp_delta_usd",
+        "lp_delta_pct",
+        "data_source",
+        "token_symbol",
+        "token_name",
+    ],
+}
+
+CURRENT_SCHEMA_VERSION = "1.3"
+
+
+# =========================
+# Detection
+# =========================
+
+def detect_schema_version(header: list[str]) -> str | None:
+    """
+    Return the registered version matching a header, or None if unknown.
+    """
+    for version, columns in SCHEMAS.items():
+        if header == columns:
+            return version
+    return None
+
+
+def read_schema_version(path: str = LEM_LOG_FILE) -> str | None:
+    """
+    Detect a log file's schema version by reading only its header line.
+    Returns None for a missing, empty or unrecognized file.
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, mode="r", newline="") as f:
+        header = next(csv.reader(f), None)
+
+    return detect_schema_version(header) if header else None
+
+
+# =========================
+# Row Upgrade
+# =========================
+
+def row_upgrader(header: list[str], target: str = CURRENT_SCHEMA_VERSION):
+    """
+    Build a function mapping a row (list of values under `header`) to a
+    list of values under the target schema. Missing columns become "".
+    """
+    positions = {col: i for i, col in enumerate(header)}
+    plan = [positions.get(col) for col in SCHEMAS[target]]
+
+    def upgrade(values: list[str]) -> list[str]:
+        return [
+            values[i] if i is not None and i < len(values) else ""
+            for i in plan
+        ]
+
+    return upgrade
+
+
+def iter_rows(path: str = LEM_LOG_FILE):
+    """
+    Stream rows of a log file of any registered version as dicts in the
+    current schema.
+    """
+    if not os.path.exists(path):
+        return
+
+    columns = SCHEMAS[CURRENT_SCHEMA_VERSION]
+
+    with open(path, mode="r", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        upgrade = row_upgrader(header)
+        for values in reader:
+            if values:
+                yield dict(zip(columns, upgrade(values)))
+
+
+# =========================
+# Migration
+# =========================
+
+def migrate_log(path: str = LEM_LOG_FILE, target: str = CURRENT_SCHEMA_VERSION) -> dict:
+    """
+    Rewrite a log file to the target schema in a single streaming pass.
+
+    Rows are upgraded one at a time into a temporary file in the same
+    directory, which is fsynced and atomically swapped in. Files already
+    at the target version are left untouched.
+
+    Returns:
+        {
+            "from_version": str | None,
+            "to_version": str,
+            "rows": int,
+            "rewritten": bool
+        }
+
+    Raises:
+        ValueError if the file's header is not a registered schema
+    """
+    source_version = read_schema_version(path)
+    result = {
+        "from_version": source_version,
+        "to_version": target,
+        "rows": 0,
+        "rewritten": False,
+    }
+
+    if not os.path.exists(path) or source_version == target:
+        return result
+
+    if source_version is None:
+        raise ValueError(f"Unrecognized schema in {path}; refusing to migrate")
+
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+    try:
+        with open(path, mode="r", newline="") as src, \
+                os.fdopen(fd, mode="w", newline="") as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+
+            upgrade = row_upgrader(next(reader), target)
+            writer.writerow(SCHEMAS[target])
+
+            for values in reader:
+                if values:
+                    writer.writerow(upgrade(values))
+                    result["rows"] += 1
+
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        os.replace(tmp_path, path)
+        result["rewritten"] = True
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return result
+
+
+if __name__ == "__main__":
+    stats = migrate_log()
+    if stats["rewritten"]:
+        print(
+            f"Migrated {LEM_LOG_FILE} from v{stats['from_version']} "
+            f"to v{stats['to_version']} ({stats['rows']} rows)."
+        )
+    else:
+        print(f"{LEM_LOG_FILE} is already at v{stats['to_version']} (or missing).")
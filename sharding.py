@@ -0,0 +1,83 @@
+"""
+LEM Phase D — Deterministic Pair Sharding
+-----------------------------------------
+Splits the tracked pair set across independent observation runs.
+
+Responsibilities:
+- Parse "--shard i/N" specifications
+- Assign each pair to exactly one shard by a stable hash
+- Name the per-shard output segment
+
+Assignment depends only on the pair address and N, never on list order,
+so adding a pair never moves existing pairs between shards.
+"""
+
+import os
+import hashlib
+
+from config import SHARD_DIR, LEM_LOG_FILE
+
+
+def parse_shard_spec(spec: str) -> tuple[int, int]:
+    """
+    Parse a shard specification of the form "i/N" (0-based index).
+
+    Returns:
+        (shard_index, shard_count)
+
+    Raises:
+        ValueError if the specification is malformed or out of range
+    """
+    try:
+        index_str, count_str = spec.split("/")
+        index, count = int(index_str), int(count_str)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid shard spec {spec!r}, expected 'i/N'")
+
+    if count <= 0 or not 0 <= index < count:
+        raise ValueError(f"Shard index must satisfy 0 <= i < N, got {spec!r}")
+
+    return index, count
+
+
+def shard_for_pair(pair_address: str, shard_count: int) -> int:
+    """
+    Return the shard index owning a pair.
+
+    Uses blake2b over the lowercased address (Python's hash() is salted
+    per process and therefore unsuitable).
+    """
+    digest = hashlib.blake2b(
+        pair_address.lower().encode("ascii"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def select_shard_pairs(
+    pairs: list[str],
+    shard_index: int,
+    shard_count: int,
+) -> list[str]:
+    """
+    Filter a pair list down to the pairs owned by one shard.
+    """
+    return [
+        pair for pair in pairs
+        if shard_for_pair(pair, shard_count) == shard_index
+    ]
+
+
+def shard_log_file(
+    shard_index: int,
+    shard_count: int,
+    log_file: str = LEM_LOG_FILE,
+) -> str:
+    """
+    Path of the segment written by one shard for a given output file
+    (the canonical log or one of its side tables).
+    """
+    stem, ext = os.path.splitext(os.path.basename(log_file))
+    return os.path.join(
+        SHARD_DIR,
+        f"{stem}.shard-{shard_index}-of-{shard_count}{ext}",
+    )
@@ -0,0 +1,388 @@
+"""
+LEM Phase D — Local Stand-In Node
+---------------------------------
+Minimal local chain for exercising the observer without a real node.
+Synthetic pools random-walk their reserves every block and emit Sync
+events, so live mode sees the same traffic shape as BSC.
+
+Serves the JSON-RPC subset the observer uses:
+- HTTP (chain.py):     eth_call (pair, ERC-20 and Multicall3 reads),
+                       eth_blockNumber, eth_getLogs, eth_chainId
+- WebSocket (live.py): the same, plus eth_subscribe("newHeads")
+
+Usage:
+    python standin_node.py --pools 20
+    LEM_RPC_URL=http://127.0.0.1:8546 python live.py \\
+        --ws ws://127.0.0.1:8547 --native-price 600 --pairs <printed pairs>
+
+For local testing only. No real chain data.
+"""
+
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from eth_abi import encode, decode
+from eth_utils import keccak
+from websockets.asyncio.server import serve as ws_serve
+
+from abi import SYNC_TOPIC
+from config import (
+    NATIVE_ASSET_ADDRESS,
+    MULTICALL3_ADDRESS,
+    STANDIN_HOST,
+    STANDIN_HTTP_PORT,
+    STANDIN_WS_PORT,
+    STANDIN_BLOCK_TIME,
+)
+
+
+CHAIN_ID = 56
+USDT_ADDRESS = "0x55d398326f99059ff775485246999027b3197955"
+
+# Share of pools that trade in any given block
+SWAP_PROBABILITY = 0.3
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _selector(signature: str) -> str:
+    return "0x" + keccak(text=signature)[:4].hex()
+
+
+def _address(label: str) -> str:
+    return "0x" + hashlib.blake2b(label.encode(), digest_size=20).hexdigest()
+
+
+def _word(value: int) -> str:
+    return "0x" + value.to_bytes(32, "big").hex()
+
+
+# =========================
+# Chain State
+# =========================
+
+class StandInChain:
+    """
+    Synthetic tokens and constant-product pools with a block history of
+    Sync logs. Thread-safe (HTTP and WebSocket share one instance).
+    """
+
+    def __init__(self, n_pools: int, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens = {}
+        self.pools = {}
+        self.blocks = []
+        self.logs = []
+
+        native = NATIVE_ASSET_ADDRESS.lower()
+        self._add_token(native, "WBNB", "Wrapped BNB", 10 ** 26)
+        self._add_token(USDT_ADDRESS, "USDT", "Tether USD", 10 ** 30)
+
+        for i in range(n_pools):
+            token = _address(f"standin-token-{i}")
+            self._add_token(token, f"SIN{i}", f"Stand-In {i}", 10 ** 27)
+            self.tokens[token]["balances"]["0x000000000000000000000000000000000000dead"] = 10 ** 26
+
+            # Most pools quote WBNB; every fifth quotes USDT, and every
+            # seventh quotes the previous token (multi-hop pricing)
+            if i % 7 == 6:
+                quote, quote_reserve = _address(f"standin-token-{i - 1}"), 10 ** 24
+            elif i % 5 == 4:
+                quote, quote_reserve = USDT_ADDRESS, 300_000 * 10 ** 18
+            else:
+                quote, quote_reserve = native, 500 * 10 ** 18
+
+            token0, token1 = sorted([token, quote])
+            reserves = {token: 4 * 10 ** 24, quote: quote_reserve}
+            self.pools[_address(f"standin-pair-{i}")] = {
+                "token0": token0,
+                "token1": token1,
+                "reserve0": reserves[token0],
+                "reserve1": reserves[token1],
+            }
+
+        self.mine()
+
+    def _add_token(self, address: str, symbol: str, name: str, supply: int):
+        self.tokens[address] = {
+            "symbol": symbol,
+            "name": name,
+            "decimals": 18,
+            "supply": supply,
+            "balances": {},
+        }
+
+    @property
+    def head(self) -> dict:
+        return self.blocks[-1]
+
+    def mine(self) -> dict:
+        """
+        Produce a block: random swaps on a share of pools, one Sync log
+        per traded pool.
+        """
+        with self.lock:
+            number = len(self.blocks)
+            block_hash = "0x" + hashlib.sha256(f"block-{number}".encode()).hexdigest()
+
+            for i, (pair, pool) in enumerate(self.pools.items()):
+                if number and self.rng.random() > SWAP_PROBABILITY:
+                    continue
+                k = pool["reserve0"] * pool["reserve1"]
+                pool["reserve0"] = max(1, int(pool["reserve0"] * (1 + self.rng.gauss(0, 0.01))))
+                pool["reserve1"] = max(1, k // pool["reserve0"])
+                self.logs.append({
+                    "address": pair,
+                    "topics": [SYNC_TOPIC],
+                    "data": "0x" + encode(
+                        ["uint112", "uint112"], [pool["reserve0"], pool["reserve1"]]
+                    ).hex(),
+                    "blockNumber": hex(number),
+                    "blockHash": block_hash,
+                    "transactionHash": "0x" + hashlib.sha256(f"{number}-{i}".encode()).hexdigest(),
+                    "transactionIndex": hex(i),
+                    "logIndex": hex(len(self.logs)),
+                    "removed": False,
+                })
+
+            header = {
+                "number": hex(number),
+                "hash": block_hash,
+                "parentHash": self.blocks[-1]["hash"] if self.blocks else "0x" + "00" * 32,
+                "timestamp": hex(int(time.time())),
+                "miner": "0x" + "00" * 20,
+                "gasLimit": hex(140_000_000),
+                "gasUsed": "0x0",
+                "difficulty": "0x2",
+                "extraData": "0x",
+                "logsBloom": "0x" + "00" * 256,
+                "nonce": "0x" + "00" * 8,
+                "sha3Uncles": "0x" + "00" * 32,
+                "stateRoot": "0x" + "00" * 32,
+                "receiptsRoot": "0x" + "00" * 32,
+                "transactionsRoot": "0x" + "00" * 32,
+            }
+            self.blocks.append(header)
+            return header
+
+    # =========================
+    # Calls
+    # =========================
+
+    def call(self, to: str, data: str) -> str:
+        to = to.lower()
+        selector, args = data[:10], bytes.fromhex(data[10:])
+
+        if to == MULTICALL3_ADDRESS.lower() and selector == _selector("aggregate3((address,bool,bytes)[])"):
+            (calls,) = decode(["(address,bool,bytes)[]"], args)
+            results = []
+            for target, allow_failure, call_data in calls:
+                try:
+                    results.append((True, bytes.fromhex(self.call(target, "0x" + call_data.hex())[2:])))
+                except RpcError:
+                    if not allow_failure:
+                        raise
+                    results.append((False, b""))
+            return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
+
+        pool = self.pools.get(to)
+        if pool is not None:
+            if selector == _selector("getReserves()"):
+                return "0x" + encode(
+                    ["uint112", "uint112", "uint32"],
+                    [pool["reserve0"], pool["reserve1"], int(self.head["timestamp"], 16) % 2 ** 32],
+                ).hex()
+            if selector == _selector("token0()"):
+                return "0x" + encode(["address"], [pool["token0"]]).hex()
+            if selector == _selector("token1()"):
+                return "0x" + encode(["address"], [pool["token1"]]).hex()
+
+        token = self.tokens.get(to)
+        if token is not None:
+            if selector == _selector("totalSupply()"):
+                return _word(token["supply"])
+            if selector == _selector("decimals()"):
+                return _word(token["decimals"])
+            if selector == _selector("symbol()"):
+                return "0x" + encode(["string"], [token["symbol"]]).hex()
+            if selector == _selector("name()"):
+                return "0x" + encode(["string"], [token["name"]]).hex()
+            if selector == _selector("balanceOf(address)"):
+                (holder,) = decode(["address"], args)
+                return _word(token["balances"].get(holder.lower(), 0))
+
+        raise RpcError(3, "execution reverted")
+
+    def get_logs(self, query: dict) -> list[dict]:
+        addresses = query.get("address") or []
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {a.lower() for a in addresses}
+
+        head = len(self.blocks) - 1
+        from_block = self._block_number(query.get("fromBlock", "latest"), head)
+        to_block = self._block_number(query.get("toBlock", "latest"), head)
+        topic0 = (query.get("topics") or [None])[0]
+
+        return [
+            log for log in self.logs
+            if from_block <= int(log["blockNumber"], 16) <= to_block
+            and (not addresses or log["address"] in addresses)
+            and (topic0 is None or log["topics"][0] == topic0.lower())
+        ]
+
+    @staticmethod
+    def _block_number(tag, head: int) -> int:
+        if tag in ("latest", "safe", "finalized", "pending"):
+            return head
+        if tag == "earliest":
+            return 0
+        return int(tag, 16) if isinstance(tag, str) else int(tag)
+
+    def handle(self, method: str, params: list):
+        """
+        Execute one JSON-RPC method (subscriptions excluded).
+        """
+        with self.lock:
+            if method == "web3_clientVersion":
+                return "lem-standin/1.0"
+            if method == "eth_chainId":
+                return hex(CHAIN_ID)
+            if method == "net_version":
+                return str(CHAIN_ID)
+            if method == "eth_blockNumber":
+                return self.head["number"]
+            if method == "eth_call":
+                call = params[0]
+                return self.call(call["to"], call.get("data") or call.get("input") or "0x")
+            if method == "eth_getLogs":
+                return self.get_logs(params[0])
+            if method == "eth_getBlockByNumber":
+                number = self._block_number(params[0], len(self.blocks) - 1)
+                return self.blocks[number] if number < len(self.blocks) else None
+
+        raise RpcError(-32601, f"Method not found: {method}")
+
+
+def _respond(chain: StandInChain, request: dict) -> dict:
+    try:
+        result = chain.handle(request["method"], request.get("params") or [])
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+    except RpcError as e:
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get("id"),
+            "error": {"code": e.code, "message": str(e)},
+        }
+
+
+# =========================
+# Transports
+# =========================
+
+def _http_handler(chain: StandInChain):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if isinstance(body, list):
+                response = [_respond(chain, r) for r in body]
+            else:
+                response = _respond(chain, body)
+
+            payload = json.dumps(response).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+async def _serve_ws(chain: StandInChain, subscribers: dict, connection):
+    async for message in connection:
+        request = json.loads(message)
+        if request.get("method") == "eth_subscribe":
+            if request["params"][0] != "newHeads":
+                await connection.send(json.dumps({
+                    "jsonrpc": "2.0", "id": request["id"],
+                    "error": {"code": -32602, "message": "Only newHeads is supported"},
+                }))
+                continue
+            sub_id = "0x" + hashlib.sha256(f"{id(connection)}-{len(subscribers)}".encode()).hexdigest()[:32]
+            subscribers[sub_id] = connection
+            await connection.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": sub_id}))
+        elif request.get("method") == "eth_unsubscribe":
+            found = subscribers.pop(request["params"][0], None) is not None
+            await connection.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": found}))
+        else:
+            await connection.send(json.dumps(_respond(chain, request)))
+
+    for sub_id in [s for s, c in subscribers.items() if c is connection]:
+        del subscribers[sub_id]
+
+
+async def serve(
+    n_pools: int = 20,
+    block_time: float = STANDIN_BLOCK_TIME,
+    host: str = STANDIN_HOST,
+    http_port: int = STANDIN_HTTP_PORT,
+    ws_port: int = STANDIN_WS_PORT,
+    seed: int = 0,
+):
+    """
+    Run the stand-in node until cancelled, mining a block every
+    `block_time` seconds.
+    """
+    chain = StandInChain(n_pools, seed)
+    subscribers = {}
+
+    http_server = ThreadingHTTPServer((host, http_port), _http_handler(chain))
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+
+    print(f"[OK] Stand-in node: http://{host}:{http_port}  ws://{host}:{ws_port}")
+    print("[INFO] Pairs: " + " ".join(chain.pools))
+
+    async with ws_serve(lambda c: _serve_ws(chain, subscribers, c), host, ws_port):
+        try:
+            while True:
+                await asyncio.sleep(block_time)
+                header = chain.mine()
+                for sub_id, connection in list(subscribers.items()):
+                    try:
+                        await connection.send(json.dumps({
+                            "jsonrpc": "2.0",
+                            "method": "eth_subscription",
+                            "params": {"subscription": sub_id, "result": header},
+                        }))
+                    except Exception:
+                        subscribers.pop(sub_id, None)
+        finally:
+            http_server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in BSC node.")
+    parser.add_argument("--pools", type=int, default=20)
+    parser.add_argument("--block-time", type=float, default=STANDIN_BLOCK_TIME)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.pools, args.block_time, seed=args.seed))
+    except KeyboardInterrupt:
+        pass
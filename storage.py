@@ -11,54 +11,442 @@ Responsibilities:
 - Require data_source labeling for every row
 - Allow historical timestamp overrides (Phase B)
 - Support chain and token metadata annotations (Phase C.1.1)
+- Reject duplicate observations via a canonical observation key
+- Persist per-pair JSON state records (health, last-known state)
+- Upgrade older observation logs to the current schema before appending
+- Stream observations with column projection and filter pushdown
 
 No calculations, no aggregation, no interpretation.
 """
 
 import os
+import re
+import sys
 import csv
-from datetime import datetime
-from config import DATA_DIR, LEM_LOG_FILE
+import json
+import bisect
+import shutil
+import hashlib
+from array import array
+from datetime import datetime, timezone
+from config import (
+    CHAIN,
+    DATA_DIR,
+    LEM_LOG_FILE,
+    ROLLING_LOG_FILE,
+    DEPTH_LOG_FILE,
+    LEM_INDEX_FILE,
+    LEM_INDEX_PERCENTILES,
+    LP_ATTRIBUTION_FILE,
+    DEDUP_SLOT_SECONDS,
+    DEPTH_TRADE_SIZES,
+    DEPTH_PRICE_MOVES_PCT,
+)
+from schema import (
+    SCHEMAS,
+    CURRENT_SCHEMA_VERSION,
+    read_schema_version,
+    migrate_log,
+)
 
 
 # =========================
 # CSV Schema (Append-Only)
 # =========================
 
-CSV_HEADER = [
+# Current columns come from the versioned registry in schema.py
+CSV_HEADER = SCHEMAS[CURRENT_SCHEMA_VERSION]
+
+# Rolling statistics side file (one row per engine observation)
+ROLLING_CSV_HEADER = [
     "timestamp_utc",
     "pair_address",
     "chain",
-    "native_price_usd",
-    "native_reserve",
-    "lp_native_usd",
-    "token_price_usd",
-    "market_cap_usd",
-    "lem",
+    "lem_count",
+    "lem_ewma",
+    "lem_mean",
+    "lem_std",
+    "lem_min",
+    "lem_max",
+    "lp_delta_pct_count",
+    "lp_delta_pct_ewma",
+    "lp_delta_pct_mean",
+    "lp_delta_pct_std",
+    "lp_delta_pct_min",
+    "lp_delta_pct_max",
+]
+
+# Depth curve side table (one row per pair per cycle, see depth.py)
+DEPTH_CSV_HEADER = (
+    [
+        "timestamp_utc",
+        "pair_address",
+        "chain",
+        "native_reserve",
+        "token_reserve",
+    ]
+    + [f"buy_native_{m}pct" for m in DEPTH_PRICE_MOVES_PCT]
+    + [f"sell_native_{m}pct" for m in DEPTH_PRICE_MOVES_PCT]
+    + [f"buy_impact_{s:g}" for s in DEPTH_TRADE_SIZES]
+    + [f"buy_slippage_{s:g}" for s in DEPTH_TRADE_SIZES]
+)
+
+# Cross-pair LEM index series (one row per cycle, see lem_index.py).
+# pairs / total_market_cap_usd / sum_mc_lem / sketch are the mergeable
+# partials; the remaining columns are derived from them. cycle_id is
+# shared by every shard of one scheduled run and keys the shard merge.
+INDEX_CSV_HEADER = (
+    [
+        "timestamp_utc",
+        "chain",
+        "pairs",
+        "total_market_cap_usd",
+        "sum_mc_lem",
+        "cap_weighted_lem",
+    ]
+    + [f"lem_p{p}" for p in LEM_INDEX_PERCENTILES]
+    + ["sketch", "cycle_id"]
+)
+
+# ΔLPₙ attribution side table (one row per pair per observation window,
+# see lp_attribution.py). *_quote columns are in quote-token units;
+# price_effect_usd is the part of lp_delta_usd not explained by flows.
+LP_ATTRIBUTION_CSV_HEADER = [
+    "window_start_utc",
+    "window_end_utc",
+    "pair_address",
+    "chain",
+    "quote_address",
+    "mints",
+    "burns",
+    "swaps",
+    "added_quote",
+    "removed_quote",
+    "traded_quote",
+    "lp_native_usd_start",
+    "lp_native_usd_end",
     "lp_delta_usd",
-    "lp_delta_pct",
-    "data_source",
-    "token_symbol",
-    "token_name",
+    "added_usd",
+    "removed_usd",
+    "traded_usd",
+    "price_effect_usd",
 ]
 
 
+# =========================
+# Observation Key
+# =========================
+
+def timestamp_epoch(timestamp: str) -> int | None:
+    """
+    Epoch seconds of an ISO-8601 timestamp (naive values are UTC), or
+    None if it cannot be parsed.
+    """
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def dedup_slot_seconds(interval: float | None = None) -> int:
+    """
+    Deduplication slot width for a pair observed every `interval` seconds.
+
+    DEDUP_SLOT_SECONDS, narrowed to the interval for pairs observed more
+    often, so that observations at least one interval apart never share
+    a slot.
+    """
+    if not interval or interval >= DEDUP_SLOT_SECONDS:
+        return DEDUP_SLOT_SECONDS
+    return max(1, int(interval))
+
+
+def observation_slot(timestamp: str, slot_seconds: int = DEDUP_SLOT_SECONDS) -> str:
+    """
+    Map an ISO-8601 timestamp onto its deduplication slot.
+
+    Timestamps are floored to `slot_seconds` so that a retried run
+    inside the same observation window resolves to the same key.
+    Unparseable timestamps are returned unchanged.
+    """
+    epoch = timestamp_epoch(timestamp)
+    if epoch is None:
+        return timestamp or ""
+    return str(epoch - epoch % slot_seconds)
+
+
+def observation_key(
+    chain: str | None,
+    pair_address: str,
+    timestamp: str,
+    data_source: str | None,
+    slot_seconds: int = DEDUP_SLOT_SECONDS,
+) -> tuple[str, str, str, str]:
+    """
+    Build the canonical observation key.
+
+    Returns:
+        (chain, pair_address, slot, data_source)
+    """
+    return (
+        (chain or CHAIN).lower(),
+        (pair_address or "").lower(),
+        observation_slot(timestamp, slot_seconds),
+        data_source or "",
+    )
+
+
+def row_observation_key(
+    row: dict,
+    slot_seconds: int = DEDUP_SLOT_SECONDS,
+) -> tuple[str, str, str, str]:
+    """
+    Build the canonical observation key from a CSV row (DictReader).
+    Legacy rows without chain or data_source columns are tolerated.
+    """
+    return observation_key(
+        row.get("chain"),
+        row.get("pair_address"),
+        row.get("timestamp_utc"),
+        row.get("data_source"),
+        slot_seconds,
+    )
+
+
+# Persistent key index: <log_file>.keys/ holds one append-only file of
+# little-endian int64 row timestamps per (chain, pair, data_source) plus
+# meta.json identifying the indexed prefix of the log
+KEY_INDEX_VERSION = 1
+
+
+class KeyIndex:
+    """
+    Persistent observation key index of one log file.
+
+    Timestamps are stored rather than slots, so each writer can check
+    its own slot width. The index is identified like the pair offset
+    index (indexed size plus header and tail hashes): rows appended by
+    any writer since the last update are indexed incrementally, and the
+    index is rebuilt only after the log was rewritten. Timestamps of a
+    key are loaded on first use, so a check costs O(1) file operations
+    regardless of the log size.
+    """
+
+    def __init__(self, log_file: str):
+        self.log_file = log_file
+        self.directory = log_file + ".keys"
+        self.meta = {}
+        self._verified_size = None
+        self._loaded: dict[tuple, list[int]] = {}
+        self._pending: dict[tuple, list[int]] = {}
+
+    @staticmethod
+    def key(chain: str | None, pair_address: str, data_source: str | None) -> tuple:
+        return (
+            (chain or CHAIN).lower(),
+            (pair_address or "").lower(),
+            data_source or "",
+        )
+
+    def _path(self, key: tuple) -> str:
+        name = hashlib.sha256("\0".join(key).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, name + ".i64")
+
+    def _timestamps(self, key: tuple) -> list[int]:
+        timestamps = self._loaded.get(key)
+        if timestamps is None:
+            values = array("q")
+            path = self._path(key)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    values.frombytes(f.read())
+                if sys.byteorder != "little":
+                    values.byteswap()
+            timestamps = self._loaded[key] = sorted(values)
+        return timestamps
+
+    def contains(
+        self,
+        chain: str | None,
+        pair_address: str,
+        timestamp: str,
+        data_source: str | None,
+        slot_seconds: int = DEDUP_SLOT_SECONDS,
+    ) -> bool:
+        """
+        True if a row of the same key already falls in the timestamp's
+        slot. Rows with unparseable timestamps are never duplicates.
+        """
+        epoch = timestamp_epoch(timestamp)
+        if epoch is None:
+            return False
+
+        start = epoch - epoch % slot_seconds
+        timestamps = self._timestamps(self.key(chain, pair_address, data_source))
+        i = bisect.bisect_left(timestamps, start)
+        return i < len(timestamps) and timestamps[i] < start + slot_seconds
+
+    def add(
+        self,
+        chain: str | None,
+        pair_address: str,
+        timestamp: str,
+        data_source: str | None,
+    ):
+        """
+        Index a row about to be appended; persisted by commit().
+        """
+        epoch = timestamp_epoch(timestamp)
+        if epoch is None:
+            return
+
+        key = self.key(chain, pair_address, data_source)
+        bisect.insort(self._timestamps(key), epoch)
+        self._pending.setdefault(key, []).append(epoch)
+
+    def commit(self):
+        """
+        Persist pending keys and mark the log's current size as indexed.
+        Call after the rows are written to the log.
+        """
+        if self._pending:
+            os.makedirs(self.directory, exist_ok=True)
+            for key, epochs in self._pending.items():
+                values = array("q", epochs)
+                if sys.byteorder != "little":
+                    values.byteswap()
+                with open(self._path(key), "ab") as f:
+                    values.tofile(f)
+            self._pending = {}
+
+        size = os.path.getsize(self.log_file)
+        with open(self.log_file, mode="rb") as f:
+            identity = _log_identity(f, size)
+        self.meta = {"version": KEY_INDEX_VERSION, "size": size, **identity}
+        save_records(self.meta, os.path.join(self.directory, "meta.json"))
+        self._verified_size = size
+
+    def sync(self):
+        """
+        Index rows appended since the last update (rebuilding the index
+        if the log was rewritten or truncated).
+        """
+        if not os.path.exists(self.log_file):
+            return
+
+        size = os.path.getsize(self.log_file)
+        if size == self._verified_size:
+            return
+
+        if not self.meta:
+            self.meta = load_records(os.path.join(self.directory, "meta.json"))
+
+        with open(self.log_file, mode="rb") as f:
+            position = self.meta.get("size", 0)
+            valid = (
+                self.meta.get("version") == KEY_INDEX_VERSION
+                and 0 < position <= size
+                and {k: self.meta.get(k) for k in ("header_sha256", "tail_sha256")}
+                == _log_identity(f, position)
+            )
+            if valid and position == size:
+                self._verified_size = size
+                return
+            if not valid:
+                shutil.rmtree(self.directory, ignore_errors=True)
+                self._loaded = {}
+                position = 0
+
+            f.seek(0)
+            header = next(csv.reader([_read_record(f).decode("utf-8")]), [])
+            columns = [
+                header.index(col) if col in header else None
+                for col in ("chain", "pair_address", "timestamp_utc", "data_source")
+            ]
+            f.seek(max(position, f.tell()))
+
+            while True:
+                record = _read_record(f)
+                if not record or not record.endswith(b"\n"):
+                    break  # EOF or partial trailing write
+                values = next(csv.reader([record.decode("utf-8")]), [])
+                if values:
+                    self.add(*(
+                        values[i] if i is not None and i < len(values) else ""
+                        for i in columns
+                    ))
+
+        self.commit()
+
+
+# Key index per log file, loaded lazily on first write
+_KEY_INDEX: dict[str, KeyIndex] = {}
+
+
+def load_key_index(log_file: str = LEM_LOG_FILE) -> KeyIndex:
+    """
+    Return the up-to-date key index of a log file.
+    """
+    index = _KEY_INDEX.get(log_file)
+    if index is None:
+        index = _KEY_INDEX[log_file] = KeyIndex(log_file)
+    index.sync()
+    return index
+
+
+def invalidate_key_index(log_file: str = LEM_LOG_FILE):
+    """
+    Drop the in-memory key index after a log file is rewritten; the
+    persisted index is re-validated against the log on next use.
+    """
+    _KEY_INDEX.pop(log_file, None)
+
+
 # =========================
 # Storage Initialization
 # =========================
 
-def ensure_storage():
+# Observation logs whose schema version was checked in this process
+_SCHEMA_CHECKED: set[str] = set()
+
+
+def ensure_storage(log_file: str = LEM_LOG_FILE, header: list[str] = CSV_HEADER):
     """
     Ensure data directory and CSV file exist.
     Creates them if missing.
+
+    An existing observation log of an older registered schema is
+    migrated first, since appending current-schema rows would corrupt it.
+
+    Raises:
+        ValueError if the log's header is not a registered schema
     """
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
+    directory = os.path.dirname(log_file) or DATA_DIR
+    if not os.path.exists(directory):
+        os.makedirs(directory)
 
-    if not os.path.exists(LEM_LOG_FILE):
-        with open(LEM_LOG_FILE, mode="w", newline="") as f:
+    if not os.path.exists(log_file) or os.path.getsize(log_file) == 0:
+        with open(log_file, mode="w", newline="") as f:
             writer = csv.writer(f)
-            writer.writerow(CSV_HEADER)
+            writer.writerow(header)
+    elif header == CSV_HEADER and log_file not in _SCHEMA_CHECKED:
+        version = read_schema_version(log_file)
+        if version is None:
+            raise ValueError(
+                f"Unrecognized header in {log_file}; register it in "
+                f"schema.SCHEMAS before appending"
+            )
+        if version != CURRENT_SCHEMA_VERSION:
+            stats = migrate_log(log_file)
+            print(
+                f"[INFO] Migrated {log_file} from v{stats['from_version']} "
+                f"to v{stats['to_version']}"
+            )
+        _SCHEMA_CHECKED.add(log_file)
 
 
 # =========================
@@ -80,10 +468,17 @@ def append_observation(
     token_symbol: str | None = None,
     token_name: str | None = None,
     timestamp_override: str | None = None,
-):
+    log_file: str | None = None,
+    slot_seconds: int = DEDUP_SLOT_SECONDS,
+) -> bool:
     """
     Append a single LEM observation row.
 
+    Rows whose observation key is already in the log's key index are
+    skipped, so retried runs and re-run backfills never duplicate data.
+    Overlaps between different data sources are resolved afterwards by
+    priority (merge_observations.py).
+
     Parameters:
     - data_source (required):
         Explicit provenance label, e.g.:
@@ -97,16 +492,32 @@ def append_observation(
         Human-readable annotations (non-canonical metadata)
 
     - timestamp_override (optional):
-        Used ONLY for historical backfills (Phase B)
+        Historical backfills (Phase B) and engine tick times
+
+    - log_file (optional):
+        Output file; defaults to the canonical LEM_LOG_FILE.
+        Sharded runs write their own segment (see sharding.py)
+
+    - slot_seconds (optional):
+        Deduplication slot width; pass dedup_slot_seconds(interval) for
+        pairs observed more often than DEDUP_SLOT_SECONDS
+
+    Returns:
+        bool: True if the row was written, False if it was a duplicate
     """
     if not data_source:
         raise ValueError("data_source must be provided")
 
-    ensure_storage()
+    log_file = log_file or LEM_LOG_FILE
+    ensure_storage(log_file)
 
     timestamp = timestamp_override or datetime.utcnow().isoformat()
 
-    with open(LEM_LOG_FILE, mode="a", newline="") as f:
+    index = load_key_index(log_file)
+    if index.contains(chain, pair_address, timestamp, data_source, slot_seconds):
+        return False
+
+    with open(log_file, mode="a", newline="") as f:
         writer = csv.writer(f)
         writer.writerow([
             timestamp,
@@ -123,4 +534,594 @@ def append_observation(
             data_source,
             token_symbol or "",
             token_name or "",
-        ])
\ No newline at end of file
+        ])
+
+    index.add(chain, pair_address, timestamp, data_source)
+    index.commit()
+    return True
+
+
+def append_observation_rows(rows: list[dict], log_file: str):
+    """
+    Append a batch of observation rows in one write, without slot
+    deduplication (per-block logs hold many rows per slot).
+
+    Parameters:
+    - rows: dicts keyed by CSV_HEADER column names; missing values are
+      written empty
+    """
+    if not rows:
+        return
+
+    ensure_storage(log_file)
+
+    with open(log_file, mode="a", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerows(
+            ["" if row.get(col) is None else row[col] for col in CSV_HEADER]
+            for row in rows
+        )
+
+
+# =========================
+# Append Rolling Statistics
+# =========================
+
+def append_rolling_stats(
+    pair_address: str,
+    stats: dict,
+    chain: str | None = None,
+    timestamp_override: str | None = None,
+):
+    """
+    Append one row of rolling statistics to the side file.
+
+    Parameters:
+    - stats: flattened statistics keyed by ROLLING_CSV_HEADER column names
+      (see rolling.PairState.snapshot); missing values are written empty
+    """
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR)
+
+    is_new = not os.path.exists(ROLLING_LOG_FILE)
+    timestamp = timestamp_override or datetime.utcnow().isoformat()
+
+    with open(ROLLING_LOG_FILE, mode="a", newline="") as f:
+        writer = csv.writer(f)
+        if is_new:
+            writer.writerow(ROLLING_CSV_HEADER)
+
+        row = {
+            "timestamp_utc": timestamp,
+            "pair_address": pair_address,
+            "chain": chain or "",
+            **stats,
+        }
+        writer.writerow([
+            "" if row.get(col) is None else row[col]
+            for col in ROLLING_CSV_HEADER
+        ])
+
+
+# =========================
+# Append Depth Curves
+# =========================
+
+def append_depth_rows(
+    pair_addresses: list[str],
+    native_reserves: list[float],
+    token_reserves: list[float],
+    depth: dict,
+    chain: str | None = None,
+    timestamp_override: str | None = None,
+    log_file: str | None = None,
+):
+    """
+    Append one depth-curve row per pair to the side table.
+
+    Parameters:
+    - depth: output of depth.compute_depth for the same pair order
+    - log_file (optional): defaults to DEPTH_LOG_FILE
+    """
+    if not pair_addresses:
+        return
+
+    log_file = log_file or DEPTH_LOG_FILE
+    directory = os.path.dirname(log_file) or DATA_DIR
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    is_new = not os.path.exists(log_file)
+    timestamp = timestamp_override or datetime.utcnow().isoformat()
+
+    with open(log_file, mode="a", newline="") as f:
+        writer = csv.writer(f)
+        if is_new:
+            writer.writerow(DEPTH_CSV_HEADER)
+
+        for i, pair_address in enumerate(pair_addresses):
+            writer.writerow(
+                [
+                    timestamp,
+                    pair_address,
+                    chain or "",
+                    native_reserves[i],
+                    token_reserves[i],
+                ]
+                + [f"{x:.6g}" for x in depth["buy_native"][i]]
+                + [f"{x:.6g}" for x in depth["sell_native"][i]]
+                + [f"{x:.6g}" for x in depth["buy_impact"][i]]
+                + [f"{x:.6g}" for x in depth["buy_slippage"][i]]
+            )
+
+
+# =========================
+# Append LEM Index
+# =========================
+
+def append_index_row(
+    row: dict,
+    chain: str | None = None,
+    timestamp_override: str | None = None,
+    log_file: str | None = None,
+    cycle_id: str | None = None,
+):
+    """
+    Append one cross-pair index row.
+
+    Rows follow the header of an existing file, so an index created
+    before a column was added keeps its layout (the new column is
+    dropped) instead of being misaligned.
+
+    Parameters:
+    - row: values keyed by INDEX_CSV_HEADER column names
+    - log_file (optional): defaults to LEM_INDEX_FILE
+    - cycle_id (optional): run identifier shared by all shards
+    """
+    log_file = log_file or LEM_INDEX_FILE
+    directory = os.path.dirname(log_file) or DATA_DIR
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    is_new = not os.path.exists(log_file)
+    row = {
+        **row,
+        "timestamp_utc": timestamp_override or datetime.utcnow().isoformat(),
+        "chain": chain or "",
+        "cycle_id": cycle_id or "",
+    }
+
+    header = INDEX_CSV_HEADER
+    if not is_new:
+        with open(log_file, mode="r", newline="") as f:
+            header = next(csv.reader(f), None) or INDEX_CSV_HEADER
+
+    with open(log_file, mode="a", newline="") as f:
+        writer = csv.writer(f)
+        if is_new:
+            writer.writerow(header)
+        writer.writerow([
+            "" if row.get(col) is None else row[col]
+            for col in header
+        ])
+
+
+# =========================
+# Append ΔLPₙ Attribution
+# =========================
+
+def append_attribution_rows(rows: list[dict], log_file: str | None = None) -> int:
+    """
+    Append per-window ΔLPₙ attribution rows, skipping windows already in
+    the table (overlapping backfills are safe to re-run).
+
+    Parameters:
+    - rows: dicts keyed by LP_ATTRIBUTION_CSV_HEADER column names
+    - log_file (optional): defaults to LP_ATTRIBUTION_FILE
+
+    Returns:
+        number of rows written
+    """
+    log_file = log_file or LP_ATTRIBUTION_FILE
+    directory = os.path.dirname(log_file) or DATA_DIR
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    is_new = not os.path.exists(log_file)
+    seen = set()
+    if not is_new:
+        with open(log_file, mode="r", newline="") as f:
+            for row in csv.DictReader(f):
+                seen.add((row["chain"], row["pair_address"].lower(), row["window_end_utc"]))
+
+    fresh = []
+    for row in rows:
+        key = (row.get("chain") or "", row["pair_address"].lower(), row["window_end_utc"])
+        if key not in seen:
+            seen.add(key)
+            fresh.append(row)
+
+    with open(log_file, mode="a", newline="") as f:
+        writer = csv.writer(f)
+        if is_new:
+            writer.writerow(LP_ATTRIBUTION_CSV_HEADER)
+        writer.writerows(
+            ["" if row.get(col) is None else row[col] for col in LP_ATTRIBUTION_CSV_HEADER]
+            for row in fresh
+        )
+
+    return len(fresh)
+
+
+# =========================
+# Per-Pair JSON Records
+# =========================
+
+def load_records(path: str) -> dict:
+    """
+    Load a JSON object of per-pair records ({} if the file is missing).
+    """
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_records(records: dict, path: str):
+    """
+    Atomically write a JSON object of per-pair records.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(records, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def merge_records(paths: list[str], path: str) -> dict:
+    """
+    Merge per-pair record files (e.g. from sharded runs) into `path`.
+    For each pair the record with the latest "updated" value wins.
+    """
+    records = load_records(path)
+
+    for shard_path in paths:
+        for pair, record in load_records(shard_path).items():
+            current = records.get(pair)
+            if current is None or record.get("updated", 0) >= current.get("updated", 0):
+                records[pair] = record
+
+    save_records(records, path)
+    return records
+
+
+# =========================
+# Reading Observations
+# =========================
+
+# Columns returned as strings; all others are parsed as float (or None)
+TEXT_COLUMNS = {
+    "timestamp_utc",
+    "pair_address",
+    "chain",
+    "data_source",
+    "token_symbol",
+    "token_name",
+}
+
+
+def parse_value(column: str, value: str):
+    """
+    Convert one CSV field: text columns as-is, others to float or None.
+    """
+    if column in TEXT_COLUMNS:
+        return value
+    if value in ("", "None", "nan"):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+# Per-pair offset index: <log_file>.idx/ holds one append-only file of
+# little-endian uint64 row offsets per pair plus meta.json
+PAIR_INDEX_VERSION = 2
+
+# Bytes before the indexed size whose hash detects a rewritten log
+INDEX_TAIL_CHECK_BYTES = 256
+
+_PAIR_FILE_PATTERN = re.compile(r"0x[0-9a-f]{40}")
+
+
+def _pair_index_dir(log_file: str) -> str:
+    return log_file + ".idx"
+
+
+def _pair_offsets_file(index_dir: str, pair: str) -> str:
+    name = pair if _PAIR_FILE_PATTERN.fullmatch(pair) else (
+        "h" + hashlib.sha256(pair.encode("utf-8")).hexdigest()[:32]
+    )
+    return os.path.join(index_dir, name + ".u64")
+
+
+def _read_record(f) -> bytes:
+    """
+    Read one CSV record from a binary file, joining physical lines while a
+    quoted field is still open.
+    """
+    line = f.readline()
+    while line and line.count(b'"') % 2 == 1:
+        more = f.readline()
+        if not more:
+            break
+        line += more
+    return line
+
+
+def _log_identity(f, size: int) -> dict:
+    """
+    Header and tail-before-`size` hashes of an open log.
+    """
+    f.seek(0)
+    header = _read_record(f)
+    tail_start = max(len(header), size - INDEX_TAIL_CHECK_BYTES)
+    f.seek(tail_start)
+    tail = f.read(size - tail_start)
+    return {
+        "header_sha256": hashlib.sha256(header).hexdigest(),
+        "tail_sha256": hashlib.sha256(tail).hexdigest(),
+    }
+
+
+def update_pair_index(log_file: str = LEM_LOG_FILE) -> dict:
+    """
+    Bring the per-pair byte-offset index of a log up to date.
+
+    Offsets of rows appended since the last update are appended to the
+    per-pair files; nothing else is read or rewritten. The index is
+    identified by the indexed size plus hashes of the header and of the
+    bytes just before that size (not by inode, which changes on every
+    fresh checkout), and is rebuilt only if the log was rewritten or
+    truncated.
+
+    Returns:
+        meta: {"version", "size", "header_sha256", "tail_sha256"}
+    """
+    if not os.path.exists(log_file):
+        return {"version": PAIR_INDEX_VERSION, "size": 0}
+
+    index_dir = _pair_index_dir(log_file)
+    meta_file = os.path.join(index_dir, "meta.json")
+    meta = load_records(meta_file)
+    st_size = os.path.getsize(log_file)
+
+    with open(log_file, mode="rb") as f:
+        position = meta.get("size", 0)
+        valid = (
+            meta.get("version") == PAIR_INDEX_VERSION
+            and 0 < position <= st_size
+            and {k: meta.get(k) for k in ("header_sha256", "tail_sha256")}
+            == _log_identity(f, position)
+        )
+        if valid and position == st_size:
+            return meta
+        if not valid:
+            shutil.rmtree(index_dir, ignore_errors=True)
+            position = 0
+
+        f.seek(0)
+        header = next(csv.reader([_read_record(f).decode("utf-8")]), [])
+        if "pair_address" not in header:
+            return {"version": PAIR_INDEX_VERSION, "size": 0}
+        pair_col = header.index("pair_address")
+
+        position = max(position, f.tell())
+        f.seek(position)
+
+        new_offsets: dict[str, array] = {}
+        while True:
+            record = _read_record(f)
+            if not record or not record.endswith(b"\n"):
+                break  # EOF or partial trailing write
+            values = next(csv.reader([record.decode("utf-8")]), [])
+            if len(values) > pair_col:
+                pair = values[pair_col].lower()
+                offsets = new_offsets.get(pair)
+                if offsets is None:
+                    offsets = new_offsets[pair] = array("Q")
+                offsets.append(position)
+            position += len(record)
+
+        os.makedirs(index_dir, exist_ok=True)
+        for pair, offsets in new_offsets.items():
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            with open(_pair_offsets_file(index_dir, pair), "ab") as out:
+                offsets.tofile(out)
+
+        meta = {"version": PAIR_INDEX_VERSION, "size": position, **_log_identity(f, position)}
+
+    save_records(meta, meta_file)
+    return meta
+
+
+def pair_offsets(log_file: str, pair: str, size: int) -> list[int]:
+    """
+    Byte offsets of one pair's rows below `size`, in file order.
+
+    Offsets at or beyond `size` (left by an update that was interrupted
+    before its meta.json was written) are ignored.
+    """
+    path = _pair_offsets_file(_pair_index_dir(log_file), pair.lower())
+    if not os.path.exists(path):
+        return []
+
+    offsets = array("Q")
+    with open(path, "rb") as f:
+        offsets.frombytes(f.read())
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    return sorted({off for off in offsets if off < size})
+
+
+def pair_row_signatures(log_file: str = LEM_LOG_FILE) -> dict[str, tuple[int, int]]:
+    """
+    Per-pair (indexed row count, offset of the last indexed row), read
+    from the offset index after bringing it up to date.
+
+    One offset is read per pair and no log rows are parsed, so callers
+    can find pairs with new rows cheaply. Only pairs indexed under their
+    address are listed.
+    """
+    if not update_pair_index(log_file)["size"]:
+        return {}
+
+    index_dir = _pair_index_dir(log_file)
+    signatures = {}
+    for name in os.listdir(index_dir):
+        pair, ext = os.path.splitext(name)
+        if ext != ".u64" or not _PAIR_FILE_PATTERN.fullmatch(pair):
+            continue
+
+        path = os.path.join(index_dir, name)
+        count = os.path.getsize(path) // 8
+        if count == 0:
+            continue
+        with open(path, "rb") as f:
+            f.seek((count - 1) * 8)
+            signatures[pair] = (count, int.from_bytes(f.read(8), "little"))
+
+    return signatures
+
+
+def iter_observations(
+    columns: list[str] | None = None,
+    pairs: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    data_sources: list[str] | None = None,
+    chunk_size: int = 10000,
+    log_file: str = LEM_LOG_FILE,
+):
+    """
+    Stream observations as typed, column-oriented chunks.
+
+    Filters are applied row by row before any value conversion, and only
+    projected columns are converted. When `pairs` is given, the per-pair
+    offset index is used to seek directly to matching rows, so cost
+    scales with the result rather than with the log.
+
+    Args:
+        columns: columns to return (defaults to the full current schema)
+        pairs: pair addresses to include (case-insensitive)
+        start / end: inclusive ISO-8601 timestamp bounds
+        data_sources: data_source labels to include
+        chunk_size: rows per yielded chunk
+        log_file: log to read (any registered schema version)
+
+    Yields:
+        dict[str, list]: one list of typed values per requested column
+    """
+    if not os.path.exists(log_file):
+        return
+
+    columns = list(columns or CSV_HEADER)
+    pair_set = {p.lower() for p in pairs} if pairs else None
+    source_set = set(data_sources) if data_sources else None
+
+    with open(log_file, mode="rb") as f:
+        header = next(csv.reader([_read_record(f).decode("utf-8")]), [])
+        body_start = f.tell()
+        positions = {col: i for i, col in enumerate(header)}
+
+        ts_col = positions.get("timestamp_utc")
+        pair_col = positions.get("pair_address")
+        source_col = positions.get("data_source")
+        projection = [(col, positions.get(col)) for col in columns]
+
+        def records():
+            if pair_set is not None:
+                size = update_pair_index(log_file)["size"]
+                offsets = sorted(
+                    off for p in pair_set for off in pair_offsets(log_file, p, size)
+                )
+                for off in offsets:
+                    f.seek(off)
+                    yield _read_record(f)
+            else:
+                f.seek(body_start)
+                for record in iter(lambda: _read_record(f), b""):
+                    yield record
+
+        chunk = {col: [] for col in columns}
+        size = 0
+
+        for record in records():
+            values = next(csv.reader([record.decode("utf-8")]), None)
+            if not values:
+                continue
+
+            def get(i):
+                return values[i] if i is not None and i < len(values) else ""
+
+            if pair_set is not None and get(pair_col).lower() not in pair_set:
+                continue
+            if source_set is not None and get(source_col) not in source_set:
+                continue
+            ts = get(ts_col)
+            if (start and ts < start) or (end and ts > end):
+                continue
+
+            for col, i in projection:
+                chunk[col].append(parse_value(col, get(i)))
+            size += 1
+
+            if size >= chunk_size:
+                yield chunk
+                chunk = {col: [] for col in columns}
+                size = 0
+
+        if size:
+            yield chunk
+
+
+def read_observations(
+    columns: list[str] | None = None,
+    pairs: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    data_sources: list[str] | None = None,
+    log_file: str = LEM_LOG_FILE,
+):
+    """
+    Read filtered observations into a pandas DataFrame.
+
+    Same arguments as iter_observations. timestamp_utc (if projected) is
+    parsed to datetime; invalid timestamps become NaT.
+    """
+    import pandas as pd
+
+    columns = list(columns or CSV_HEADER)
+    frames = [
+        pd.DataFrame(chunk, columns=columns)
+        for chunk in iter_observations(
+            columns, pairs, start, end, data_sources, log_file=log_file
+        )
+    ]
+    df = (
+        pd.concat(frames, ignore_index=True) if frames
+        else pd.DataFrame(columns=columns)
+    )
+
+    if "timestamp_utc" in df.columns:
+        df["timestamp_utc"] = pd.to_datetime(
+            df["timestamp_utc"], errors="coerce", format="ISO8601"
+        )
+
+    return df
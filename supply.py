@@ -0,0 +1,321 @@
+"""
+LEM Phase D — Event-Driven Supply Tracking
+------------------------------------------
+Keeps token supply out of the per-cycle hot path.
+
+Supply only changes on mint (Transfer from the zero address) or burn
+(Transfer to the zero address). Cached supply per token is advanced by
+replaying those logs, fetched for all tracked tokens at once in batched
+block ranges. A direct totalSupply() read is used for new tokens, when
+the cache is too far behind, when log fetching fails, and on a fixed
+verification cadence.
+
+Circulating supply subtracts the balances of excluded holders (burn /
+dead addresses, locks, team wallets). Those balances are read for all
+tokens in one batched call per cycle, and balances that stop changing
+are only re-checked occasionally.
+
+Responsibilities:
+- Load / save the supply cache
+- Replay mint / burn logs across all tracked tokens
+- Track excluded-holder balances
+- Serve normalized total or circulating supply per token
+
+No calculations beyond decimal normalization.
+"""
+
+import time
+
+from abi import TRANSFER_TOPIC, ZERO_ADDRESS_TOPIC
+from chain import (
+    get_block_number,
+    get_logs,
+    get_raw_total_supply,
+    get_token_decimals,
+    get_token_balances,
+)
+from config import (
+    SUPPLY_CACHE_FILE,
+    SUPPLY_LOG_BLOCK_RANGE,
+    SUPPLY_MAX_CATCHUP_BLOCKS,
+    SUPPLY_VERIFY_INTERVAL,
+    SUPPLY_LOG_ADDRESS_BATCH,
+    SUPPLY_MODE,
+    SUPPLY_EXCLUDED_HOLDERS,
+    SUPPLY_EXCLUDE_PAIR_RESERVE,
+    EXCLUSION_STATIC_AFTER,
+    EXCLUSION_STATIC_RECHECK,
+)
+from storage import load_records, save_records
+
+
+# =========================
+# Persistence
+# =========================
+
+def load_supply_cache(path: str = SUPPLY_CACHE_FILE) -> dict:
+    """
+    Load cached supply records keyed by lowercased token address.
+    """
+    return load_records(path)
+
+
+def save_supply_cache(cache: dict, path: str = SUPPLY_CACHE_FILE):
+    """
+    Atomically write cached supply records.
+    """
+    save_records(cache, path)
+
+
+# =========================
+# Direct Reads
+# =========================
+
+def refresh_supply(cache: dict, token_address: str, head: int, now: float | None = None):
+    """
+    Read totalSupply() at `head` and reset the token's log cursor to it.
+    Reading at the cursor block (not "latest") keeps mints / burns after
+    `head` out of the read, so log replay never applies them twice.
+    Decimals are read only once per token.
+    """
+    now = time.time() if now is None else now
+    key = token_address.lower()
+    record = cache.get(key) or {}
+
+    decimals = record.get("decimals")
+    if decimals is None:
+        decimals = get_token_decimals(token_address)
+
+    raw_supply = get_raw_total_supply(token_address, head)
+
+    if "raw_supply" in record and int(record["raw_supply"]) != raw_supply:
+        print(f"[INFO] Supply drift corrected for {token_address}")
+
+    cache[key] = {
+        "raw_supply": str(raw_supply),
+        "decimals": decimals,
+        "last_block": head,
+        "verified_at": now,
+        "updated": now,
+        "excluded": record.get("excluded", {}),
+    }
+
+
+# =========================
+# Log Replay
+# =========================
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _replay_logs(cache: dict, tokens: list[str], from_block: int, head: int):
+    """
+    Apply mint / burn Transfer logs in (from_block, head] to cached supply.
+    Logs at or below a token's own cursor are ignored.
+    """
+    deltas: dict[str, int] = {}
+
+    for start in range(from_block, head + 1, SUPPLY_LOG_BLOCK_RANGE):
+        end = min(start + SUPPLY_LOG_BLOCK_RANGE - 1, head)
+
+        for batch in _chunks(tokens, SUPPLY_LOG_ADDRESS_BATCH):
+            mints = get_logs(batch, [TRANSFER_TOPIC, ZERO_ADDRESS_TOPIC], start, end)
+            burns = get_logs(batch, [TRANSFER_TOPIC, None, ZERO_ADDRESS_TOPIC], start, end)
+
+            for sign, logs in ((1, mints), (-1, burns)):
+                for log in logs:
+                    # Skip malformed / non-ERC20 Transfer logs that lack
+                    # both indexed addresses
+                    if len(log["topics"]) < 3:
+                        continue
+                    token = log["address"]
+                    if log["block_number"] <= cache[token]["last_block"]:
+                        continue
+                    value = int(log["data"], 16) if log["data"] != "0x" else 0
+                    deltas[token] = deltas.get(token, 0) + sign * value
+
+    now = time.time()
+    for token in tokens:
+        record = cache[token]
+        if token in deltas:
+            record["raw_supply"] = str(int(record["raw_supply"]) + deltas[token])
+        record["last_block"] = head
+        record["updated"] = now
+
+
+def sync_supply(cache: dict, token_addresses: list[str], now: float | None = None):
+    """
+    Bring cached supply for `token_addresses` up to the latest block.
+
+    Tokens that are new, too far behind, or due for verification are read
+    directly; all others are advanced together from batched logs. If log
+    fetching fails, the affected tokens fall back to direct reads.
+    """
+    if not token_addresses:
+        return
+
+    now = time.time() if now is None else now
+    head = get_block_number()
+
+    replay = []
+    for token_address in dict.fromkeys(a.lower() for a in token_addresses):
+        record = cache.get(token_address)
+        if (
+            record is None
+            or head - record["last_block"] > SUPPLY_MAX_CATCHUP_BLOCKS
+            or now - record.get("verified_at", 0) >= SUPPLY_VERIFY_INTERVAL
+        ):
+            try:
+                refresh_supply(cache, token_address, head, now)
+            except Exception as e:
+                print(f"[WARN] Supply read failed for {token_address}: {e}")
+        elif record["last_block"] < head:
+            replay.append(token_address)
+
+    if not replay:
+        return
+
+    from_block = min(cache[t]["last_block"] for t in replay) + 1
+    try:
+        _replay_logs(cache, replay, from_block, head)
+    except Exception as e:
+        print(f"[WARN] Supply log replay failed, reading directly: {e}")
+        for token_address in replay:
+            try:
+                refresh_supply(cache, token_address, head, now)
+            except Exception as e:
+                print(f"[WARN] Supply read failed for {token_address}: {e}")
+
+
+def get_cached_supply(cache: dict, token_address: str) -> float:
+    """
+    Normalized supply for a token, reading it directly if not yet cached.
+    """
+    key = token_address.lower()
+    if key not in cache:
+        refresh_supply(cache, token_address, get_block_number())
+
+    record = cache[key]
+    return int(record["raw_supply"]) / (10 ** record["decimals"])
+
+
+
+# =========================
+# Circulating Supply
+# =========================
+
+_EXCLUDED_HOLDERS = {
+    token.lower(): [h.lower() for h in holders]
+    for token, holders in SUPPLY_EXCLUDED_HOLDERS.items()
+}
+
+
+def excluded_holders(token_address: str) -> list[str]:
+    """
+    Lowercased holders excluded from a token's circulating supply.
+    """
+    return list(dict.fromkeys(
+        _EXCLUDED_HOLDERS.get("*", []) + _EXCLUDED_HOLDERS.get(token_address.lower(), [])
+    ))
+
+
+def _exclusion_due(entry: dict | None, now: float) -> bool:
+    if entry is None or entry["stable_reads"] < EXCLUSION_STATIC_AFTER:
+        return True
+    return now - entry["checked_at"] >= EXCLUSION_STATIC_RECHECK
+
+
+def sync_exclusions(cache: dict, token_addresses: list[str], now: float | None = None):
+    """
+    Refresh excluded-holder balances for `token_addresses` in one batched
+    read. Balances read unchanged EXCLUSION_STATIC_AFTER times in a row
+    are treated as static and re-read every EXCLUSION_STATIC_RECHECK
+    seconds. Tokens not yet in the cache are ignored.
+    """
+    if SUPPLY_MODE != "circulating":
+        return
+
+    now = time.time() if now is None else now
+
+    queries = []
+    for token_address in dict.fromkeys(a.lower() for a in token_addresses):
+        record = cache.get(token_address)
+        if record is None:
+            continue
+        excluded = record.setdefault("excluded", {})
+        for holder in excluded_holders(token_address):
+            if _exclusion_due(excluded.get(holder), now):
+                queries.append((token_address, holder))
+
+    if not queries:
+        return
+
+    for (token_address, holder), balance in zip(queries, get_token_balances(queries)):
+        if balance is None:
+            print(f"[WARN] balanceOf({holder}) failed for {token_address}")
+            continue
+
+        excluded = cache[token_address]["excluded"]
+        entry = excluded.get(holder)
+        if entry is not None and int(entry["raw_balance"]) == balance:
+            entry["stable_reads"] += 1
+        else:
+            entry = {"raw_balance": str(balance), "stable_reads": 0}
+            excluded[holder] = entry
+        entry["checked_at"] = now
+
+
+def get_circulating_supply(
+    cache: dict,
+    token_address: str,
+    pair_token_reserve: float | None = None,
+) -> float:
+    """
+    Normalized supply used for market cap under SUPPLY_MODE.
+
+    In "circulating" mode, cached excluded-holder balances (and, with
+    SUPPLY_EXCLUDE_PAIR_RESERVE, the pair's own token reserve) are
+    subtracted from total supply. Balances missing for a newly seen
+    token are read immediately.
+    """
+    total_supply = get_cached_supply(cache, token_address)
+    if SUPPLY_MODE != "circulating":
+        return total_supply
+
+    key = token_address.lower()
+    record = cache[key]
+    holders = excluded_holders(key)
+
+    excluded = record.get("excluded", {})
+    if any(h not in excluded for h in holders):
+        try:
+            sync_exclusions(cache, [key])
+        except Exception as e:
+            print(f"[WARN] Excluded balance read failed for {token_address}: {e}")
+        excluded = record.get("excluded", {})
+
+    raw_excluded = sum(int(excluded[h]["raw_balance"]) for h in holders if h in excluded)
+    circulating = total_supply - raw_excluded / (10 ** record["decimals"])
+
+    if SUPPLY_EXCLUDE_PAIR_RESERVE and pair_token_reserve is not None:
+        circulating -= pair_token_reserve
+
+    return max(circulating, 0.0)
+
+
+def read_excluded_raw_balance(token_address: str) -> int:
+    """
+    Direct (uncached) sum of excluded-holder balances for one token, in a
+    single batched read. Returns 0 in "total" mode.
+    """
+    if SUPPLY_MODE != "circulating":
+        return 0
+
+    holders = excluded_holders(token_address)
+    if not holders:
+        return 0
+
+    balances = get_token_balances([(token_address, h) for h in holders])
+    return sum(b for b in balances if b is not None)
@@ -0,0 +1,78 @@
+import csv
+
+import pytest
+
+import storage
+from schema import SCHEMAS, CURRENT_SCHEMA_VERSION, migrate_log, read_schema_version
+
+
+V1_0_ROW = ["2024-01-01T00:00:00", "0xpair", "600", "10", "6000", "0.5", "1000000", "166.6", "", ""]
+V1_2_ROW = V1_0_ROW + ["reconstructed_gecko"]
+
+
+def write_log(path, header, rows):
+    with open(path, mode="w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def read_log(path):
+    with open(path, mode="r", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_pre_1_3_headers_are_prefixes_of_current():
+    current = SCHEMAS[CURRENT_SCHEMA_VERSION]
+    assert SCHEMAS["1.2"] == [c for c in current if c not in ("chain", "token_symbol", "token_name")]
+    assert SCHEMAS["1.0"] == [c for c in SCHEMAS["1.2"] if c != "data_source"]
+
+
+@pytest.mark.parametrize("version, row", [("1.0", V1_0_ROW), ("1.2", V1_2_ROW)])
+def test_migrate_legacy_log(tmp_path, version, row):
+    path = str(tmp_path / "lem_observations.csv")
+    write_log(path, SCHEMAS[version], [row, row])
+    assert read_schema_version(path) == version
+
+    stats = migrate_log(path)
+
+    assert stats == {
+        "from_version": version,
+        "to_version": CURRENT_SCHEMA_VERSION,
+        "rows": 2,
+        "rewritten": True,
+    }
+    header, *rows = read_log(path)
+    assert header == SCHEMAS[CURRENT_SCHEMA_VERSION]
+    assert len(rows) == 2
+
+    migrated = dict(zip(header, rows[0]))
+    assert migrated["pair_address"] == "0xpair"
+    assert migrated["lem"] == "166.6"
+    assert migrated["chain"] == ""
+    assert migrated["data_source"] == (row[10] if len(row) > 10 else "")
+
+
+def test_ensure_storage_migrates_legacy_log_before_append(tmp_path):
+    path = str(tmp_path / "lem_observations.csv")
+    write_log(path, SCHEMAS["1.2"], [V1_2_ROW])
+
+    assert storage.append_observation(
+        "0xpair", 600, 10, 6000, 0.5, 1000000, 166.6, None, None,
+        "onchain_live", chain="bsc",
+        timestamp_override="2024-01-02T00:00:00", log_file=path,
+    )
+
+    header, *rows = read_log(path)
+    assert header == SCHEMAS[CURRENT_SCHEMA_VERSION]
+    assert [dict(zip(header, r))["data_source"] for r in rows] == [
+        "reconstructed_gecko", "onchain_live",
+    ]
+
+
+def test_ensure_storage_rejects_unknown_header(tmp_path):
+    path = str(tmp_path / "lem_observations.csv")
+    write_log(path, ["timestamp_utc", "something_else"], [["x", "y"]])
+
+    with pytest.raises(ValueError):
+        storage.ensure_storage(path)